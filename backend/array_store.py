@@ -0,0 +1,126 @@
+"""Directories of ``.npy`` arrays plus a ``manifest.json``.
+
+The crime cube, the crime index and the price surface are all stored this
+way and memory-mapped by every API worker. A store is written into a
+sibling staging directory and swapped in as a whole, so a reader sees the
+old store or the new one, never new arrays next to an old manifest.
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Tuple, TypeVar, Union
+
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+T = TypeVar("T")
+
+READ_ATTEMPTS = 5
+READ_RETRY_SECONDS = 0.05
+
+
+def read_manifest(directory: Union[str, Path]) -> Dict[str, Any]:
+    with (Path(directory) / "manifest.json").open(encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_manifest(directory: Path, manifest: Dict[str, Any]) -> None:
+    fd, tmp = tempfile.mkstemp(prefix=".manifest-", dir=directory)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, directory / "manifest.json")
+
+
+def save_array(path: Path, array: np.ndarray) -> None:
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.stem}-", dir=path.parent)
+    with os.fdopen(fd, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp, path)
+
+
+def link_or_copy(source: Path, target: Path) -> None:
+    """Carry an unchanged file into a staging directory without copying
+    its bytes where the filesystem allows it."""
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+@contextmanager
+def staged_directory(target: Union[str, Path]) -> Iterator[Path]:
+    """A fresh directory that replaces ``target`` when the block succeeds.
+
+    If the block raises, ``target`` is left untouched. The swap is two
+    renames (old store aside, new one in), so ``target`` can be missing
+    for an instant; ``read_store`` retries that. If another writer swaps
+    its store in at the same moment, theirs is kept.
+    """
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(
+        tempfile.mkdtemp(prefix=f".{target.name}-", dir=target.parent)
+    )
+    try:
+        yield staging
+        stale = None
+        if target.exists():
+            stale = target.with_name(f".{target.name}-stale-{os.getpid()}")
+            shutil.rmtree(stale, ignore_errors=True)
+            os.replace(target, stale)
+        try:
+            os.replace(staging, target)
+        except OSError:
+            if not (target / "manifest.json").exists():
+                raise
+        if stale is not None:
+            shutil.rmtree(stale, ignore_errors=True)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def _version(directory: Path) -> Any:
+    try:
+        return read_manifest(directory).get("version")
+    except FileNotFoundError:
+        return None
+
+
+def read_store(
+    directory: Union[str, Path], load: Callable[[Dict[str, Any]], T]
+) -> Tuple[Dict[str, Any], T]:
+    """``load(manifest)`` against a manifest that did not change meanwhile.
+
+    A store swapped in between reading the manifest and opening the
+    arrays would pair the two wrongly (``np.load`` even reopens a file by
+    name to memory-map it), so the manifest is read again afterwards and
+    the load retried if the version moved on. Errors from ``load`` are
+    only raised when the store did not change under it.
+    """
+    directory = Path(directory)
+    for attempt in range(READ_ATTEMPTS):
+        last = attempt == READ_ATTEMPTS - 1
+        try:
+            manifest = read_manifest(directory)
+        except FileNotFoundError:
+            if last:
+                raise
+            time.sleep(READ_RETRY_SECONDS)
+            continue
+        try:
+            loaded = load(manifest)
+        except (OSError, ValueError):
+            if last or _version(directory) == manifest.get("version"):
+                raise
+            time.sleep(READ_RETRY_SECONDS)
+            continue
+        if _version(directory) == manifest.get("version"):
+            return manifest, loaded
+        time.sleep(READ_RETRY_SECONDS)
+    raise RuntimeError(f"{directory} kept changing while it was read")
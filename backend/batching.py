@@ -0,0 +1,157 @@
+"""Request coalescing in front of ``model.predict``.
+
+Concurrent single-row requests are queued, grouped into batches that close
+after ``max_wait_ms`` or once ``max_batch_size`` rows are waiting, and scored
+with one call to the wrapped prediction function. Each caller awaits only
+its own row's result. A row may carry a ``context`` (the model artifacts
+the request started with); rows are only scored together with rows of the
+same context, so a batch straddling a model swap still scores every row
+with the model its request saw.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import asyncio
+import time
+
+import numpy as np
+
+from metrics import Histogram
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+QUEUE_WAIT_BUCKETS = (
+    0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.25, 0.5, 1.0
+)
+
+_Pending = Tuple[Dict[str, Any], Any, "asyncio.Future[float]", float]
+
+
+class MicroBatcher:
+    """Collect rows for a short window and predict them together.
+
+    Args:
+        predict_fn: Callable taking a list of feature dicts and returning
+            one prediction per row; rows submitted with a ``context`` are
+            passed as ``predict_fn(rows, context)``. It runs in the default
+            executor so the event loop keeps accepting requests while a
+            batch is scored.
+        max_batch_size: Upper bound on rows per ``predict_fn`` call.
+        max_wait_ms: How long the first row in a batch may wait for
+            company before the batch is flushed.
+    """
+
+    def __init__(
+        self,
+        predict_fn: Callable[..., Sequence[float]],
+        *,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 2.0,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms must be non-negative")
+        self._predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: Optional["asyncio.Queue[_Pending]"] = None
+        self._worker: Optional["asyncio.Task[None]"] = None
+        self.batch_size_hist = Histogram(
+            "price_batcher_batch_size",
+            BATCH_SIZE_BUCKETS,
+            "Rows per coalesced model.predict call.",
+        )
+        self.queue_wait_hist = Histogram(
+            "price_batcher_queue_wait_seconds",
+            QUEUE_WAIT_BUCKETS,
+            "Time a request waited in the queue before its batch was scored.",
+        )
+
+    def _ensure_started(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            loop = asyncio.get_running_loop()
+            self._worker = loop.create_task(self._run())
+
+    async def submit(self, row: Dict[str, Any], context: Any = None) -> float:
+        """Queue one feature row and wait for its prediction."""
+        self._ensure_started()
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[float]" = loop.create_future()
+        await self._queue.put((row, context, future, time.perf_counter()))
+        return await future
+
+    async def close(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def _collect(self) -> List[_Pending]:
+        queue = self._queue
+        batch = [await queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            try:
+                batch.append(queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            started = time.perf_counter()
+            self.batch_size_hist.observe(len(batch))
+            for _, _, _, enqueued in batch:
+                self.queue_wait_hist.observe(started - enqueued)
+
+            # Normally one group; two while a model swap is in flight.
+            groups: Dict[int, List[_Pending]] = {}
+            for pending in batch:
+                groups.setdefault(id(pending[1]), []).append(pending)
+            for group in groups.values():
+                await self._score(loop, group)
+
+    async def _score(
+        self, loop: asyncio.AbstractEventLoop, group: List[_Pending]
+    ) -> None:
+        rows = [row for row, _, _, _ in group]
+        context = group[0][1]
+        args = (rows,) if context is None else (rows, context)
+        try:
+            preds = await loop.run_in_executor(None, self._predict_fn, *args)
+        except Exception as exc:
+            for _, _, future, _ in group:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        preds = np.asarray(preds).reshape(-1)
+        for (_, _, future, _), pred in zip(group, preds):
+            if not future.done():
+                future.set_result(float(pred))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "queue_depth": (
+                self._queue.qsize() if self._queue is not None else 0
+            ),
+            "batch_size": self.batch_size_hist.snapshot(),
+            "queue_wait_seconds": self.queue_wait_hist.snapshot(),
+        }
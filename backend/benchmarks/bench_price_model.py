@@ -0,0 +1,158 @@
+"""``PriceRegressionModel`` fit and predict throughput and peak memory.
+
+Each case is timed without tracing as the best of ``repeats`` rounds. A
+round repeats short cases until it lasts ``MIN_ROUND_SECONDS``, as
+``timeit`` does, and rounds go through every case in turn, so a slow
+stretch on the machine costs each case one round rather than one case all
+of them. Each case then runs once more (one epoch for ``fit``) under
+``tracemalloc`` for its peak allocation; NumPy reports its
+buffers to ``tracemalloc``, so the peak includes the expanded design
+matrix. ``fit_many`` cases train ``N_CONFIGS`` learning rates at once and
+report config-epochs per second, comparable to ``epochs_per_sec`` of one
+``fit``.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import time
+import tracemalloc
+
+import numpy as np
+
+from Price import PriceRegressionModel
+from synthetic import price_dataset
+
+N_CONFIGS = 20
+MIN_ROUND_SECONDS = 0.1
+
+# (name, metric, units per call, timed call, traced call)
+_Case = Tuple[str, str, float, Callable[[], Any], Callable[[], Any]]
+
+
+def peak_mb(func: Callable[[], Any]) -> float:
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / 2**20, 2)
+
+
+def calls_per_round(func: Callable[[], Any]) -> int:
+    """How many calls of ``func`` last at least ``MIN_ROUND_SECONDS``."""
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        if time.perf_counter() - started >= MIN_ROUND_SECONDS:
+            return number
+        number *= 2
+
+
+def best_seconds(
+    funcs: Sequence[Callable[[], Any]], repeats: int
+) -> List[float]:
+    """Fastest per-call time of each of ``funcs`` over ``repeats`` rounds."""
+    numbers = [calls_per_round(func) for func in funcs]
+    best = [float("inf")] * len(funcs)
+    for _ in range(repeats):
+        for i, (func, number) in enumerate(zip(funcs, numbers)):
+            started = time.perf_counter()
+            for _ in range(number):
+                func()
+            best[i] = min(best[i], (time.perf_counter() - started) / number)
+    return best
+
+
+def run(
+    degrees: Sequence[int],
+    batch_sizes: Sequence[int],
+    row_counts: Sequence[int],
+    epochs: int,
+    repeats: int = 5,
+) -> Dict[str, Dict[str, float]]:
+    cases: List[_Case] = []
+    for n_rows in row_counts:
+        X, y = price_dataset(n_rows)
+        for degree in degrees:
+            for batch_size in batch_sizes:
+                def fit(
+                    n_epochs: int = epochs,
+                    degree: int = degree,
+                    batch_size: int = batch_size,
+                    X: Any = X,
+                    y: Any = y,
+                ) -> PriceRegressionModel:
+                    return PriceRegressionModel().fit(
+                        X,
+                        y,
+                        degree=degree,
+                        learning_rate=1e-3,
+                        num_iterations=n_epochs,
+                        mini_batch_size=batch_size,
+                        random_seed=0,
+                    )
+
+                cases.append((
+                    f"model.fit.d{degree}.b{batch_size}.n{n_rows}",
+                    "epochs_per_sec",
+                    epochs,
+                    fit,
+                    lambda fit=fit: fit(1),
+                ))
+
+            configs = [
+                {"learning_rate": rate}
+                for rate in np.geomspace(1e-4, 1e-2, N_CONFIGS)
+            ]
+
+            def fit_many(
+                n_epochs: int = epochs,
+                degree: int = degree,
+                X: Any = X,
+                y: Any = y,
+            ) -> None:
+                PriceRegressionModel.fit_many(
+                    X,
+                    y,
+                    configs,
+                    degree=degree,
+                    num_iterations=n_epochs,
+                    mini_batch_size=batch_sizes[0],
+                    random_seed=0,
+                )
+
+            cases.append((
+                f"model.fit_many.k{N_CONFIGS}.d{degree}"
+                f".b{batch_sizes[0]}.n{n_rows}",
+                "config_epochs_per_sec",
+                N_CONFIGS * epochs,
+                fit_many,
+                lambda fit_many=fit_many: fit_many(1),
+            ))
+
+            model = fit()
+
+            def predict(model: Any = model, X: Any = X) -> None:
+                model.predict(X)
+
+            cases.append((
+                f"model.predict.d{degree}.n{n_rows}",
+                "rows_per_sec",
+                n_rows,
+                predict,
+                predict,
+            ))
+
+    seconds = best_seconds([case[3] for case in cases], repeats)
+    results: Dict[str, Dict[str, float]] = {}
+    for (name, metric, units, _, traced), elapsed in zip(cases, seconds):
+        digits = 1 if metric == "rows_per_sec" else 3
+        results[name] = {
+            metric: round(units / elapsed, digits),
+            "peak_mb": peak_mb(traced),
+        }
+    return results
@@ -0,0 +1,143 @@
+"""``/predict_price`` latency and throughput through an in-process ASGI call.
+
+Requests go straight into ``main.app`` as ASGI messages -- no socket, no
+HTTP client -- so the numbers cover pydantic validation, routing, the
+threadpool hop and model inference, and nothing else. ``main`` must be
+imported only after ``configure`` has pointed it at synthetic artifacts.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import asyncio
+import json
+import os
+import time
+
+import numpy as np
+
+from synthetic import price_requests, write_serving_artifacts
+
+
+def configure(work_dir: Path, n_estimators: int) -> Any:
+    """Write synthetic artifacts, point ``main`` at them and load it."""
+    model_dir = write_serving_artifacts(
+        work_dir / "model", n_estimators=n_estimators
+    )
+    os.environ.update(
+        PRICE_MODEL_DIR=str(model_dir),
+        PRICE_BACKGROUND_LOAD="0",
+        PRICE_SURFACE_DIR=str(work_dir / "price_surface"),
+    )
+    import main
+
+    main.load_artifacts()
+    return main
+
+
+async def asgi_post(app: Any, path: str, payload: Dict[str, Any]) -> Tuple[int, bytes]:
+    body = json.dumps(payload).encode()
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"host", b"bench"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+        "client": ("127.0.0.1", 0),
+        "server": ("bench", 80),
+    }
+    sent = False
+
+    async def receive() -> Dict[str, Any]:
+        nonlocal sent
+        if sent:
+            return {"type": "http.disconnect"}
+        sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    status = 0
+    chunks: List[bytes] = []
+
+    async def send(message: Dict[str, Any]) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, b"".join(chunks)
+
+
+def latency_stats(latencies: Sequence[float], wall_seconds: float) -> Dict[str, float]:
+    values = np.asarray(latencies) * 1e3
+    return {
+        "p50_ms": round(float(np.percentile(values, 50)), 3),
+        "p95_ms": round(float(np.percentile(values, 95)), 3),
+        "p99_ms": round(float(np.percentile(values, 99)), 3),
+        "rps": round(len(values) / wall_seconds, 1),
+    }
+
+
+async def _drive(
+    app: Any,
+    payloads: Sequence[Dict[str, Any]],
+    concurrency: int,
+) -> Dict[str, float]:
+    latencies: List[float] = []
+    queue = iter(payloads)
+
+    async def worker() -> None:
+        for payload in queue:
+            started = time.perf_counter()
+            status, body = await asgi_post(app, "/predict_price", payload)
+            latencies.append(time.perf_counter() - started)
+            if status != 200:
+                raise RuntimeError(f"/predict_price answered {status}: {body!r}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latency_stats(latencies, time.perf_counter() - started)
+
+
+def run(
+    main: Any,
+    n_requests: int,
+    concurrency: int,
+    warmup: int = 50,
+) -> Dict[str, Dict[str, float]]:
+    """Sequential, concurrent and cache-hit scenarios."""
+    app = main.app
+    payloads = price_requests(n_requests + warmup, seed=1)
+    cache = main.prediction_cache
+    results: Dict[str, Dict[str, float]] = {}
+
+    def scenario(name: str, body: Callable[[], Any]) -> None:
+        results[f"serving.predict_price.{name}"] = asyncio.run(body())
+
+    # Unique rows with the cache off: every request reaches the model.
+    main.prediction_cache = None
+    try:
+        asyncio.run(_drive(app, payloads[:warmup], 1))
+        scenario("sequential", lambda: _drive(app, payloads[warmup:], 1))
+        scenario(
+            f"concurrent{concurrency}",
+            lambda: _drive(app, payloads[warmup:], concurrency),
+        )
+    finally:
+        main.prediction_cache = cache
+    if cache is not None:
+        cache.clear()
+        repeated = [payloads[0]] * n_requests
+        scenario("cached", lambda: _drive(app, repeated, 1))
+    return results
@@ -0,0 +1,184 @@
+"""Offline benchmark suite for the price API and ``PriceRegressionModel``.
+
+Runs on synthetic data only (see ``synthetic.py``) and writes one JSON
+document of ``{case: {metric: value}}`` results plus the environment it ran
+in. ``--compare`` checks the new results against a stored baseline and
+exits non-zero when any metric regressed by more than ``--threshold``.
+
+Usage, from ``backend/``::
+
+    python benchmarks/run.py --output benchmarks/results/latest.json
+    python benchmarks/run.py --quick --compare benchmarks/results/baseline.json
+
+Metric names carry their direction: ``rps`` and ``*_per_sec`` are better
+when higher, ``*_ms`` and ``*_mb`` when lower.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+
+BENCH_DIR = Path(__file__).resolve().parent
+BACKEND_DIR = BENCH_DIR.parent
+for path in (BENCH_DIR, BACKEND_DIR, BACKEND_DIR / "scripts"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import numpy as np  # noqa: E402
+
+import bench_price_model  # noqa: E402
+import bench_serving  # noqa: E402
+
+RESULTS_DIR = BENCH_DIR / "results"
+DEFAULT_THRESHOLD = 0.15
+
+FULL = {
+    "requests": 2_000,
+    "concurrency": 16,
+    "trees": 100,
+    "degrees": [1, 2, 3],
+    "batch_sizes": [32, 256],
+    "rows": [2_000, 10_000],
+    "epochs": 3,
+    "repeats": 5,
+}
+QUICK = {
+    "requests": 300,
+    "concurrency": 8,
+    "trees": 20,
+    "degrees": [1, 2, 3],
+    "batch_sizes": [64],
+    "rows": [2_000],
+    "epochs": 2,
+    "repeats": 5,
+}
+
+
+def higher_is_better(metric: str) -> bool:
+    return metric == "rps" or metric.endswith("_per_sec")
+
+
+def compare(
+    current: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> List[Dict[str, Any]]:
+    """One row per metric present in both runs; ``regressed`` flags those
+    that got worse by more than ``threshold`` (relative)."""
+    rows = []
+    for case in sorted(current.keys() & baseline.keys()):
+        for metric in sorted(current[case].keys() & baseline[case].keys()):
+            new, old = current[case][metric], baseline[case][metric]
+            if not old:
+                continue
+            change = (new - old) / abs(old)
+            worse = -change if higher_is_better(metric) else change
+            rows.append(
+                {
+                    "case": case,
+                    "metric": metric,
+                    "baseline": old,
+                    "current": new,
+                    "change": round(change, 4),
+                    "regressed": worse > threshold,
+                }
+            )
+    return rows
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--suite",
+        choices=["all", "serving", "model"],
+        default="all",
+    )
+    parser.add_argument(
+        "--quick", action="store_true", help="smaller sizes for a smoke run"
+    )
+    parser.add_argument(
+        "--output", type=Path, default=RESULTS_DIR / "latest.json"
+    )
+    parser.add_argument("--compare", type=Path, help="baseline results JSON")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="relative change that counts as a regression (default: 0.15)",
+    )
+    args = parser.parse_args(argv)
+    config = dict(QUICK if args.quick else FULL)
+
+    results: Dict[str, Dict[str, float]] = {}
+    if args.suite in ("all", "serving"):
+        with tempfile.TemporaryDirectory(prefix="price-bench-") as work_dir:
+            main_module = bench_serving.configure(
+                Path(work_dir), config["trees"]
+            )
+            results.update(
+                bench_serving.run(
+                    main_module, config["requests"], config["concurrency"]
+                )
+            )
+    if args.suite in ("all", "model"):
+        results.update(
+            bench_price_model.run(
+                config["degrees"],
+                config["batch_sizes"],
+                config["rows"],
+                config["epochs"],
+                config["repeats"],
+            )
+        )
+
+    document = {
+        "environment": environment(),
+        "config": config,
+        "results": results,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(document, indent=2))
+
+    width = max(len(case) for case in results) if results else 0
+    for case, metrics in results.items():
+        shown = "  ".join(f"{k}={v}" for k, v in metrics.items())
+        print(f"{case:<{width}}  {shown}")
+    print(f"Wrote {args.output}")
+
+    if args.compare is None:
+        return 0
+    baseline = json.loads(args.compare.read_text())["results"]
+    rows = compare(results, baseline, args.threshold)
+    regressions = [row for row in rows if row["regressed"]]
+    for row in regressions:
+        print(
+            f"REGRESSION {row['case']} {row['metric']}: "
+            f"{row['baseline']} -> {row['current']} "
+            f"({row['change']:+.1%})"
+        )
+    print(
+        f"{len(rows)} metrics compared against {args.compare}, "
+        f"{len(regressions)} regressed beyond {args.threshold:.0%}"
+    )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""Synthetic data and artifacts for the offline benchmarks.
+
+Nothing here reads the real datasets or the downloaded ``.pkl`` files, so
+the suite runs on a fresh checkout. Shapes and ranges follow the real data:
+20 standardized features for ``PriceRegressionModel`` (the cleaned price
+dataset the notebooks train on) and the 12 ``PriceRequest`` fields, with a
+``StandardScaler`` over the same numeric columns, for the API.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List, Tuple, Union
+
+import numpy as np
+
+N_MODEL_FEATURES = 20
+ZIPCODES = (
+    2108, 2109, 2110, 2111, 2113, 2114, 2115, 2116, 2118, 2119, 2120,
+    2121, 2122, 2124, 2125, 2126, 2127, 2128, 2129, 2130, 2131, 2132,
+    2134, 2135, 2136, 2199, 2210, 2215,
+)
+NUMERIC_COLUMNS = [
+    "GROSS_AREA",
+    "LIVING_AREA",
+    "BED_RMS",
+    "FULL_BTH",
+    "HLF_BTH",
+    "NUM_PARKING",
+    "KITCHENS",
+    "FIREPLACES",
+]
+REQUEST_COLUMNS = [
+    "ZIPCODE",
+    *NUMERIC_COLUMNS,
+    "KITCHEN_TYPE",
+    "HEAT_TYPE",
+    "AC_TYPE",
+]
+
+
+def price_dataset(
+    n_rows: int, n_features: int = N_MODEL_FEATURES, seed: int = 0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Standardized features and a TOTAL_VALUE-like target in dollars."""
+    rng = np.random.default_rng(seed)
+    X = rng.standard_normal((n_rows, n_features))
+    weights = rng.normal(0, 60_000, n_features)
+    y = (
+        650_000
+        + X @ weights
+        + 25_000 * X[:, 0] * X[:, 1]
+        + rng.normal(0, 40_000, n_rows)
+    )
+    return X, y
+
+
+def price_requests(n_rows: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """``PriceRequest`` payloads drawn from the price form's ranges."""
+    rng = np.random.default_rng(seed)
+    living = rng.integers(600, 4_000, n_rows)
+    columns = {
+        "ZIPCODE": rng.choice(ZIPCODES, n_rows),
+        "GROSS_AREA": np.round(living * rng.uniform(1.1, 1.6, n_rows)),
+        "LIVING_AREA": living.astype(float),
+        "BED_RMS": rng.integers(1, 7, n_rows),
+        "FULL_BTH": rng.integers(1, 5, n_rows),
+        "HLF_BTH": rng.integers(0, 3, n_rows),
+        "NUM_PARKING": rng.integers(0, 4, n_rows),
+        "KITCHENS": rng.integers(1, 4, n_rows),
+        "FIREPLACES": rng.integers(0, 3, n_rows),
+        "KITCHEN_TYPE": rng.integers(-3, 6, n_rows),
+        "HEAT_TYPE": rng.integers(-3, 4, n_rows),
+        "AC_TYPE": rng.integers(-1, 3, n_rows),
+    }
+    return [
+        {name: values[i].item() for name, values in columns.items()}
+        for i in range(n_rows)
+    ]
+
+
+def write_serving_artifacts(
+    directory: Union[str, Path],
+    n_rows: int = 20_000,
+    n_estimators: int = 100,
+    seed: int = 0,
+) -> Path:
+    """Fit a forest and scaler on synthetic rows and save them as ``main.py``
+    expects to find them in ``PRICE_MODEL_DIR``."""
+    import joblib
+    import pandas as pd
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.preprocessing import StandardScaler
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    frame = pd.DataFrame(price_requests(n_rows, seed), columns=REQUEST_COLUMNS)
+    rng = np.random.default_rng(seed)
+    y = (
+        250 * frame["LIVING_AREA"]
+        + 40_000 * frame["FULL_BTH"]
+        + 15_000 * (frame["ZIPCODE"] % 37)
+        + rng.normal(0, 50_000, n_rows)
+    )
+    scaler = StandardScaler().fit(frame[NUMERIC_COLUMNS])
+    frame[NUMERIC_COLUMNS] = scaler.transform(frame[NUMERIC_COLUMNS])
+    forest = RandomForestRegressor(
+        n_estimators=n_estimators,
+        min_samples_leaf=2,
+        n_jobs=-1,
+        random_state=seed,
+    ).fit(frame, y)
+    forest.n_jobs = None
+    joblib.dump(forest, directory / "best_price_model.pkl")
+    joblib.dump(scaler, directory / "scaler_price_features.pkl")
+    joblib.dump(list(NUMERIC_COLUMNS), directory / "scaler_numeric_columns.pkl")
+    return directory
@@ -0,0 +1,333 @@
+"""Score CSV or NDJSON parcel files through the price model in chunks.
+
+Input is read ``chunk_rows`` records at a time, each chunk is scaled and
+scored with one ``predict`` call, and the scored chunk is written out
+before the next one is read, so memory stays flat however long the file
+is. Every input column is passed through and ``predicted_price`` is
+appended; rows with a missing or non-numeric feature (or a fractional
+value in an integer feature), and lines that do not parse at all, get an
+empty prediction instead of failing the whole run. Records are one per
+line, so CSV fields must not contain quoted newlines.
+
+With ``workers > 1`` chunks are scored on a thread pool: the forest,
+compiled forest and ``PriceRegressionModel`` all release the GIL in
+``predict``, and threads share the loaded model instead of copying it
+into every process. Output order always matches input order.
+
+Usage, from ``backend/``::
+
+    python bulk_scoring.py datasets/price_datasets/complete_price_data_for_model.csv \\
+        --output scored.ndjson --workers 4
+    python bulk_scoring.py - --input-format ndjson < parcels.ndjson > scored.ndjson
+
+The API accepts the same formats as a streamed upload on
+``POST /predict_price/stream``.
+"""
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from typing import (
+    Any, BinaryIO, Callable, Collection, Dict, Iterable, Iterator, List,
+    Optional, Sequence, Union,
+)
+
+import csv
+import json
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+FORMATS = ("csv", "ndjson")
+SUFFIX_FORMATS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+CHUNK_ROWS = 10_000
+READ_BYTES = 1 << 20
+PREDICTION_COLUMN = "predicted_price"
+
+
+def format_for(path: Union[str, Path], default: str = "csv") -> str:
+    """``csv`` or ``ndjson`` from a file suffix; ``default`` for ``-``."""
+    return SUFFIX_FORMATS.get(Path(path).suffix.lower(), default)
+
+
+def missing_columns(
+    columns: Iterable[str], feature_columns: Sequence[str]
+) -> List[str]:
+    present = set(columns)
+    return [name for name in feature_columns if name not in present]
+
+
+class ChunkParser:
+    """Cut an arriving byte stream into chunks of ``chunk_rows`` records.
+
+    For uploads that come in as arbitrary network-sized pieces: complete
+    lines are buffered until a chunk is full, and only a partial last
+    line is carried over. CSV records must therefore not contain quoted
+    newlines; the first CSV line is the header. Chunks are returned as
+    bytes and turned into frames by ``parse``, which can run off the
+    thread that reads the stream.
+    """
+
+    def __init__(self, fmt: str, chunk_rows: int = CHUNK_ROWS) -> None:
+        if fmt not in FORMATS:
+            raise ValueError(
+                f"Unknown format {fmt!r}; expected one of {FORMATS}"
+            )
+        self.fmt = fmt
+        self.chunk_rows = chunk_rows
+        self.header: Optional[bytes] = None
+        self._partial = b""
+        self._lines: List[bytes] = []
+
+    @property
+    def columns(self) -> Optional[List[str]]:
+        """CSV column names once the header has arrived."""
+        if self.header is None:
+            return None
+        return list(pd.read_csv(BytesIO(self.header), nrows=0).columns)
+
+    def feed(self, data: bytes) -> List[bytes]:
+        """Buffer ``data`` and return every chunk it completed."""
+        lines = (self._partial + data).split(b"\n")
+        self._partial = lines.pop()
+        if self.fmt == "csv" and self.header is None and lines:
+            self.header = lines.pop(0) + b"\n"
+        self._lines.extend(line for line in lines if line.strip())
+        chunks = []
+        while len(self._lines) >= self.chunk_rows:
+            chunks.append(self._join(self._lines[:self.chunk_rows]))
+            del self._lines[:self.chunk_rows]
+        return chunks
+
+    def close(self) -> List[bytes]:
+        """The last, possibly short, chunk (including an unterminated
+        final line)."""
+        chunks = self.feed(b"\n") if self._partial.strip() else []
+        if self._lines:
+            chunks.append(self._join(self._lines))
+            self._lines = []
+        return chunks
+
+    def read(
+        self, stream: BinaryIO, block_size: int = READ_BYTES
+    ) -> Iterator[bytes]:
+        """Every chunk of a binary file object, read ``block_size`` bytes
+        at a time."""
+        while True:
+            data = stream.read(block_size)
+            if not data:
+                break
+            yield from self.feed(data)
+        yield from self.close()
+
+    def _join(self, lines: List[bytes]) -> bytes:
+        return (self.header or b"") + b"\n".join(lines) + b"\n"
+
+    def parse(self, chunk: bytes) -> pd.DataFrame:
+        """One chunk as a frame, one row per record line.
+
+        A line that does not parse (broken JSON, a CSV row with the wrong
+        number of fields) becomes a row with every column missing, so it
+        scores as invalid and the rest of the chunk is kept.
+        """
+        lines = chunk.splitlines()
+        try:
+            if self.fmt == "csv":
+                frame = pd.read_csv(BytesIO(chunk))
+                records = len(lines) - 1
+            else:
+                frame = pd.read_json(BytesIO(chunk), lines=True, dtype=False)
+                records = len(lines)
+        except ValueError:
+            return self._parse_lines(lines)
+        # An unbalanced quote parses "fine" by swallowing later lines.
+        if len(frame) != records:
+            return self._parse_lines(lines)
+        return frame
+
+    def _parse_lines(self, lines: List[bytes]) -> pd.DataFrame:
+        if self.fmt == "ndjson":
+            return pd.DataFrame.from_records(
+                [_json_record(line) for line in lines]
+            )
+        header, rows = lines[0], lines[1:]
+        columns = next(csv.reader([header.decode("utf-8", "replace")]), [])
+        good = [
+            i for i, line in enumerate(rows)
+            if 0 <= _csv_width(line) <= len(columns)
+        ]
+        try:
+            frame = pd.read_csv(
+                BytesIO(b"\n".join([header, *(rows[i] for i in good)]))
+            )
+        except ValueError:
+            frame, good = pd.DataFrame(columns=columns), []
+        frame.index = good
+        return frame.reindex(range(len(rows)))
+
+
+def _json_record(line: bytes) -> Dict[str, Any]:
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return {}
+    return record if isinstance(record, dict) else {}
+
+
+def _csv_width(line: bytes) -> int:
+    """Field count of one CSV line; -1 if it leaves a quote open."""
+    if line.count(b'"') % 2:
+        return -1
+    fields = next(csv.reader([line.decode("utf-8", "replace")]), [])
+    return len(fields)
+
+
+def score_frame(
+    frame: pd.DataFrame,
+    predict: Callable[[pd.DataFrame], np.ndarray],
+    feature_columns: Sequence[str],
+    integer_columns: Collection[str] = (),
+) -> pd.DataFrame:
+    """``frame`` with ``predicted_price`` appended (NaN for invalid rows).
+
+    ``predict`` receives a fresh, unscaled feature frame it may modify.
+    """
+    features = frame.reindex(columns=list(feature_columns)).apply(
+        pd.to_numeric, errors="coerce"
+    )
+    valid = features.notna().all(axis=1).to_numpy(copy=True)
+    for name in integer_columns:
+        values = features[name].to_numpy(dtype=np.float64)
+        valid &= np.isnan(values) | (values == np.round(values))
+    prices = np.full(len(frame), np.nan)
+    if valid.all():
+        prices[:] = predict(features)
+    elif valid.any():
+        prices[valid] = predict(features[valid])
+    frame[PREDICTION_COLUMN] = prices
+    return frame
+
+
+def score_chunks(
+    chunks: Iterable[Any],
+    score: Callable[[Any], pd.DataFrame],
+    workers: int = 1,
+) -> Iterator[pd.DataFrame]:
+    """Apply ``score`` to each chunk, yielding results in input order.
+
+    With ``workers > 1`` at most ``2 * workers`` chunks are in flight, so
+    a fast reader cannot queue up the whole file ahead of the model.
+    """
+    if workers <= 1:
+        for chunk in chunks:
+            yield score(chunk)
+        return
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="price-bulk"
+    ) as pool:
+        pending: deque = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(score, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def encode(frame: pd.DataFrame, fmt: str, header: bool = False) -> str:
+    """One scored chunk as CSV lines (optionally with header) or NDJSON."""
+    if fmt == "csv":
+        return frame.to_csv(index=False, header=header)
+    if frame.empty:
+        return ""
+    return frame.to_json(orient="records", lines=True).rstrip("\n") + "\n"
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", help="CSV or NDJSON file, or - for stdin")
+    parser.add_argument(
+        "--output", default="-", help="output file (default: stdout)"
+    )
+    parser.add_argument("--input-format", choices=FORMATS)
+    parser.add_argument("--output-format", choices=FORMATS)
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument(
+        "--keep",
+        nargs="+",
+        metavar="COLUMN",
+        help="only write these input columns next to the prediction",
+    )
+    args = parser.parse_args(argv)
+    input_format = args.input_format or format_for(args.input)
+    output_format = args.output_format or format_for(
+        args.output, input_format
+    )
+
+    import main as api
+
+    loaded = api.load_artifacts()
+
+    chunker = ChunkParser(input_format, args.chunk_rows)
+
+    def score(chunk: bytes) -> pd.DataFrame:
+        scored = score_frame(
+            chunker.parse(chunk),
+            lambda features: api._predict_frame(features, loaded),
+            api.FEATURE_COLUMNS,
+            api.INTEGER_FEATURES,
+        )
+        if args.keep:
+            scored = scored.reindex(columns=[*args.keep, PREDICTION_COLUMN])
+        return scored
+
+    def checked(chunks: Iterator[bytes]) -> Iterator[bytes]:
+        for i, chunk in enumerate(chunks):
+            if i == 0 and chunker.columns is not None:
+                missing = missing_columns(
+                    chunker.columns, api.FEATURE_COLUMNS
+                )
+                if missing:
+                    parser.error(f"{args.input} has no column(s) {missing}")
+            yield chunk
+
+    source = (
+        sys.stdin.buffer if args.input == "-" else open(args.input, "rb")
+    )
+    out = (
+        sys.stdout
+        if args.output == "-"
+        else open(args.output, "w", encoding="utf-8", newline="")
+    )
+    started = time.perf_counter()
+    rows = invalid = 0
+    try:
+        chunks = checked(chunker.read(source))
+        for scored in score_chunks(chunks, score, args.workers):
+            out.write(encode(scored, output_format, header=rows == 0))
+            rows += len(scored)
+            invalid += int(scored[PREDICTION_COLUMN].isna().sum())
+    finally:
+        if source is not sys.stdin.buffer:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - started
+    print(
+        f"Scored {rows} rows ({invalid} invalid) with {loaded.bundle} "
+        f"({loaded.version}) in {elapsed:.1f}s, "
+        f"{rows / max(elapsed, 1e-9):,.0f} rows/s",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,474 @@
+"""Precomputed crime counts over district x month x weekday x hour x group.
+
+``build_cube`` reads the yearly ``*-crime-boston.csv`` files once and stores
+one dense count array per source file, with axes::
+
+    (district, year_month, day_of_week, hour, offense_group)
+
+Each array only spans the months its file covers and uses the smallest
+unsigned dtype that holds its largest cell. District and offense group
+labels live in the shared manifest and are append-only, so an array built
+before a new label appeared is simply shorter along that axis and never has
+to be rewritten. Re-running the build only reads files that are new or whose
+size/mtime changed, which is what makes adding a year cheap.
+
+``CrimeCube.load`` memory-maps the arrays and ``CrimeCube.aggregate`` sums a
+filtered slice over the axes that are not grouped on, which is what
+``GET /crime/cube`` serves in place of the notebook's ``pivot_table`` calls.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+
+from array_store import (
+    link_or_copy,
+    read_manifest,
+    read_store,
+    save_array,
+    staged_directory,
+    write_manifest,
+)
+
+STORE_FORMAT_VERSION = 1
+DIMENSIONS = (
+    "district",
+    "year_month",
+    "day_of_week",
+    "hour",
+    "offense_group",
+)
+DAY_NAMES = (
+    "Monday",
+    "Tuesday",
+    "Wednesday",
+    "Thursday",
+    "Friday",
+    "Saturday",
+    "Sunday",
+)
+UNKNOWN_LABEL = "Unknown"
+SOURCE_GLOB = "*crime-boston.csv"
+USE_COLUMNS = ("DISTRICT", "OCCURRED_ON_DATE", "HOUR", "OFFENSE_CODE_GROUP")
+CUBE_DIR = Path(__file__).resolve().parent / "artifacts" / "crime_cube"
+SOURCE_DIR = (
+    Path(__file__).resolve().parent / "datasets" / "crime_datasets"
+)
+
+Selection = Dict[str, np.ndarray]
+
+
+def month_index(label: str) -> int:
+    """``"2019-07"`` -> months since year 0."""
+    try:
+        year, month = (int(part) for part in label.split("-"))
+    except ValueError:
+        raise ValueError(f"Expected a YYYY-MM month, got {label!r}") from None
+    if not 1 <= month <= 12:
+        raise ValueError(f"Expected a YYYY-MM month, got {label!r}")
+    return year * 12 + month - 1
+
+
+def month_label(index: int) -> str:
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+def source_fingerprint(path: Path) -> Dict[str, Any]:
+    stat = path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def parse_dates(values: Any) -> Any:
+    """Parse OCCURRED_ON_DATE, dropping any UTC offset suffix.
+
+    Older files use ``2015-08-28 10:20:00`` and newer ones append ``+00``;
+    the wall-clock part is what the notebook charts, so it is kept as is.
+    """
+    text = values.astype("string").str.strip()
+    dates = pd.to_datetime(
+        text.str.slice(0, 19), format="ISO8601", errors="coerce"
+    )
+    retry = dates.isna() & text.notna()
+    if retry.any():
+        fallback = pd.to_datetime(
+            text[retry], format="mixed", errors="coerce"
+        )
+        if getattr(fallback.dt, "tz", None) is not None:
+            fallback = fallback.dt.tz_localize(None)
+        dates[retry] = fallback
+    return dates
+
+
+def clean_labels(values: Any) -> Any:
+    """Strip text labels and fold missing/blank ones into ``Unknown``."""
+    text = values.astype("string").str.strip()
+    return text.mask(text.isna() | (text == ""), UNKNOWN_LABEL)
+
+
+def encode_labels(values: Any, labels: List[str]) -> np.ndarray:
+    """Codes into ``labels``, appending any label not seen before."""
+    lookup = {label: code for code, label in enumerate(labels)}
+    uniques = values.unique()
+    for label in uniques:
+        if label not in lookup:
+            lookup[label] = len(labels)
+            labels.append(label)
+    mapping = {label: lookup[label] for label in uniques}
+    return values.map(mapping).to_numpy(dtype=np.int64)
+
+
+def _count_dtype(max_count: int) -> np.dtype:
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if max_count <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.uint64)
+
+
+def count_file(
+    csv_path: Union[str, Path],
+    districts: List[str],
+    offense_groups: List[str],
+) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """Dense counts for one incident CSV.
+
+    ``districts`` and ``offense_groups`` are extended in place with any new
+    labels. Returns the count array and its manifest entry (without the
+    source fingerprint).
+    """
+    header = pd.read_csv(csv_path, nrows=0).columns
+    frame = pd.read_csv(
+        csv_path,
+        usecols=[name for name in USE_COLUMNS if name in header],
+        dtype="string",
+    )
+    n_rows = len(frame)
+    if "OCCURRED_ON_DATE" not in frame:
+        raise ValueError(f"{csv_path} has no OCCURRED_ON_DATE column")
+
+    dates = parse_dates(frame["OCCURRED_ON_DATE"])
+    hours = dates.dt.hour
+    if "HOUR" in frame:
+        # Trust the HOUR column where it is usable, else the timestamp.
+        listed = pd.to_numeric(frame["HOUR"], errors="coerce")
+        hours = listed.where(listed.between(0, 23), hours)
+    keep = (dates.notna() & hours.notna()).to_numpy()
+    frame, dates, hours = frame[keep], dates[keep], hours[keep]
+
+    missing = pd.Series(UNKNOWN_LABEL, index=frame.index, dtype="string")
+    district = encode_labels(
+        clean_labels(frame["DISTRICT"])
+        if "DISTRICT" in frame
+        else missing,
+        districts,
+    )
+    group = encode_labels(
+        clean_labels(frame["OFFENSE_CODE_GROUP"])
+        if "OFFENSE_CODE_GROUP" in frame
+        else missing,
+        offense_groups,
+    )
+    months = (dates.dt.year * 12 + dates.dt.month - 1).to_numpy(np.int64)
+    month_start = int(months.min()) if months.size else 0
+    n_months = int(months.max()) - month_start + 1 if months.size else 0
+
+    shape = (len(districts), n_months, 7, 24, len(offense_groups))
+    flat = np.ravel_multi_index(
+        (
+            district,
+            months - month_start,
+            dates.dt.dayofweek.to_numpy(np.int64),
+            hours.to_numpy(np.int64),
+            group,
+        ),
+        shape,
+    )
+    counts = np.bincount(flat, minlength=int(np.prod(shape)))
+    max_count = int(counts.max()) if counts.size else 0
+    cube = counts.astype(_count_dtype(max_count)).reshape(shape)
+    entry = {
+        "month_start": month_start,
+        "shape": list(shape),
+        "dtype": cube.dtype.name,
+        "rows": int(keep.sum()),
+        "dropped_rows": int(n_rows - keep.sum()),
+    }
+    return cube, entry
+
+
+def _cube_version(entries: Dict[str, Any], *labels: List[str]) -> str:
+    digest = hashlib.sha1(json.dumps(labels).encode())
+    for name in sorted(entries):
+        source = entries[name]["source"]
+        token = f"{name}:{source['size']}:{source['mtime_ns']};"
+        digest.update(token.encode())
+    return digest.hexdigest()[:16]
+
+
+def build_cube(
+    source_dir: Union[str, Path] = SOURCE_DIR,
+    cube_dir: Union[str, Path] = CUBE_DIR,
+    pattern: str = SOURCE_GLOB,
+    force: bool = False,
+) -> List[str]:
+    """Bring the cube in ``cube_dir`` up to date with ``source_dir``.
+
+    Only files that are new or changed since the last build are counted;
+    entries for files that disappeared are dropped. The new store is
+    assembled in a staging directory (unchanged arrays are hard-linked
+    into it) and swapped in whole, so readers never see arrays that do
+    not match the manifest. Returns the names of the files that were
+    (re)counted.
+    """
+    source_dir, cube_dir = Path(source_dir), Path(cube_dir)
+    try:
+        manifest = read_manifest(cube_dir)
+    except FileNotFoundError:
+        manifest = {}
+    if force or manifest.get("format_version") != STORE_FORMAT_VERSION:
+        manifest = {}
+    districts: List[str] = list(manifest.get("districts", []))
+    offense_groups: List[str] = list(manifest.get("offense_groups", []))
+    old_entries: Dict[str, Any] = manifest.get("entries", {})
+
+    kept: Dict[str, Any] = {}
+    changed: List[Path] = []
+    for csv_path in sorted(source_dir.glob(pattern)):
+        previous = old_entries.get(csv_path.name)
+        if (
+            previous is not None
+            and previous["source"] == source_fingerprint(csv_path)
+            and (cube_dir / previous["file"]).exists()
+        ):
+            kept[csv_path.name] = previous
+        else:
+            changed.append(csv_path)
+    if not changed and kept.keys() == old_entries.keys() and manifest:
+        return []
+
+    entries: Dict[str, Any] = {}
+    with staged_directory(cube_dir) as staging:
+        for name, entry in kept.items():
+            link_or_copy(cube_dir / entry["file"], staging / entry["file"])
+            entries[name] = entry
+        for csv_path in changed:
+            source = source_fingerprint(csv_path)
+            cube, entry = count_file(csv_path, districts, offense_groups)
+            entry.update(file=f"{csv_path.stem}.npy", source=source)
+            save_array(staging / entry["file"], cube)
+            entries[csv_path.name] = entry
+        write_manifest(
+            staging,
+            {
+                "format_version": STORE_FORMAT_VERSION,
+                "version": _cube_version(
+                    entries, districts, offense_groups
+                ),
+                "dimensions": list(DIMENSIONS),
+                "districts": districts,
+                "offense_groups": offense_groups,
+                "entries": dict(sorted(entries.items())),
+            },
+        )
+    return [csv_path.name for csv_path in changed]
+
+
+def check_group_by(group_by: Sequence[str]) -> List[str]:
+    group_by = list(group_by)
+    for dimension in group_by:
+        if dimension not in DIMENSIONS:
+            raise ValueError(f"Unknown dimension {dimension!r}")
+    if len(set(group_by)) != len(group_by):
+        raise ValueError("group_by dimensions must be distinct")
+    return group_by
+
+
+class CrimeCube:
+    """Read side of a store written by :func:`build_cube`."""
+
+    def __init__(
+        self, manifest: Dict[str, Any], arrays: Sequence[np.ndarray]
+    ) -> None:
+        self.version: str = manifest["version"]
+        self.districts: List[str] = list(manifest["districts"])
+        self.offense_groups: List[str] = list(manifest["offense_groups"])
+        self.entries: List[Dict[str, Any]] = list(
+            manifest["entries"].values()
+        )
+        self.arrays = list(arrays)
+        starts = [entry["month_start"] for entry in self.entries]
+        stops = [
+            entry["month_start"] + entry["shape"][1] for entry in self.entries
+        ]
+        self.month_start = min(starts) if starts else 0
+        self.n_months = (max(stops) - self.month_start) if stops else 0
+
+    @classmethod
+    def load(
+        cls, cube_dir: Union[str, Path] = CUBE_DIR, mmap_mode: str = "r"
+    ) -> "CrimeCube":
+        cube_dir = Path(cube_dir)
+
+        def load_arrays(manifest: Dict[str, Any]) -> List[np.ndarray]:
+            if manifest.get("format_version") != STORE_FORMAT_VERSION:
+                raise ValueError(
+                    f"Unsupported crime cube format in {cube_dir}"
+                )
+            return [
+                np.load(cube_dir / entry["file"], mmap_mode=mmap_mode)
+                for entry in manifest["entries"].values()
+            ]
+
+        manifest, arrays = read_store(cube_dir, load_arrays)
+        return cls(manifest, arrays)
+
+    def labels(self, dimension: str) -> List[Any]:
+        if dimension == "district":
+            return list(self.districts)
+        if dimension == "year_month":
+            return [
+                month_label(self.month_start + i) for i in range(self.n_months)
+            ]
+        if dimension == "day_of_week":
+            return list(DAY_NAMES)
+        if dimension == "hour":
+            return list(range(24))
+        if dimension == "offense_group":
+            return list(self.offense_groups)
+        raise ValueError(f"Unknown dimension {dimension!r}")
+
+    @staticmethod
+    def _pick(
+        dimension: str, wanted: Optional[Sequence[str]], labels: List[str]
+    ) -> np.ndarray:
+        if wanted is None:
+            return np.arange(len(labels))
+        lookup = {label: code for code, label in enumerate(labels)}
+        unknown = [label for label in wanted if label not in lookup]
+        if unknown:
+            raise ValueError(f"Unknown {dimension} value(s): {unknown}")
+        return np.unique([lookup[label] for label in wanted])
+
+    @staticmethod
+    def _pick_range(
+        dimension: str, wanted: Optional[Sequence[int]], size: int
+    ) -> np.ndarray:
+        if wanted is None:
+            return np.arange(size)
+        picked = np.unique(np.asarray(wanted, dtype=np.int64))
+        if picked.size and (picked[0] < 0 or picked[-1] >= size):
+            raise ValueError(f"{dimension} values must be in [0, {size})")
+        return picked
+
+    def select(
+        self,
+        *,
+        district: Optional[Sequence[str]] = None,
+        offense_group: Optional[Sequence[str]] = None,
+        day_of_week: Optional[Sequence[int]] = None,
+        hour: Optional[Sequence[int]] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> Selection:
+        """Global label indices kept along each axis.
+
+        ``day_of_week`` uses Monday=0; ``start``/``end`` are inclusive
+        ``YYYY-MM`` bounds.
+        """
+        first = self.month_start
+        last = self.month_start + self.n_months - 1
+        if start is not None:
+            first = max(first, month_index(start))
+        if end is not None:
+            last = min(last, month_index(end))
+        return {
+            "district": self._pick("district", district, self.districts),
+            "year_month": np.arange(first, last + 1) - self.month_start,
+            "day_of_week": self._pick_range("day_of_week", day_of_week, 7),
+            "hour": self._pick_range("hour", hour, 24),
+            "offense_group": self._pick(
+                "offense_group", offense_group, self.offense_groups
+            ),
+        }
+
+    def aggregate(
+        self, group_by: Sequence[str], selection: Selection
+    ) -> Tuple[Dict[str, List[Any]], np.ndarray]:
+        """Counts for ``selection`` summed over every axis not in ``group_by``.
+
+        Returns the labels of each grouped axis and an int64 array whose
+        axes follow ``group_by``.
+        """
+        group_by = check_group_by(group_by)
+
+        grouped = [d for d in DIMENSIONS if d in group_by]
+        reduce_axes = tuple(
+            axis for axis, d in enumerate(DIMENSIONS) if d not in group_by
+        )
+        order = [grouped.index(d) for d in group_by]
+        result = np.zeros(
+            [selection[d].size for d in group_by], dtype=np.int64
+        )
+        for entry, array in zip(self.entries, self.arrays):
+            offset = entry["month_start"] - self.month_start
+            part = array
+            positions: Dict[str, np.ndarray] = {}
+            for axis, dimension in enumerate(DIMENSIONS):
+                wanted = selection[dimension]
+                local = wanted
+                if dimension == "year_month":
+                    local = wanted - offset
+                valid = (local >= 0) & (local < array.shape[axis])
+                if not valid.any():
+                    break
+                # Sorted, unique and covering the whole axis means arange:
+                # skip the copy np.take would make.
+                if not (valid.all() and local.size == array.shape[axis]):
+                    part = np.take(part, local[valid], axis=axis)
+                positions[dimension] = np.flatnonzero(valid)
+            else:
+                part = part.sum(axis=reduce_axes, dtype=np.int64)
+                part = np.transpose(part, order)
+                index = np.ix_(*(positions[d] for d in group_by))
+                result[index] += part
+
+        labels = {}
+        for dimension in group_by:
+            names = self.labels(dimension)
+            labels[dimension] = [names[i] for i in selection[dimension]]
+        return labels, result
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source-dir", type=Path, default=SOURCE_DIR)
+    parser.add_argument("--cube-dir", type=Path, default=CUBE_DIR)
+    parser.add_argument("--pattern", default=SOURCE_GLOB)
+    parser.add_argument(
+        "--force", action="store_true", help="recount every source file"
+    )
+    args = parser.parse_args(argv)
+
+    rebuilt = build_cube(
+        args.source_dir, args.cube_dir, args.pattern, force=args.force
+    )
+    manifest = read_manifest(args.cube_dir)
+    for name, entry in manifest["entries"].items():
+        state = "counted" if name in rebuilt else "up to date"
+        print(
+            f"- {name}: {entry['rows']} rows, "
+            f"{month_label(entry['month_start'])} + {entry['shape'][1]} "
+            f"months, {entry['dtype']} ({state})"
+        )
+    print(f"Cube version {manifest['version']} in {args.cube_dir}")
+
+
+if __name__ == "__main__":
+    main()
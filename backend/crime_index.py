@@ -0,0 +1,542 @@
+"""Spatial index over individual crime incidents for radius and k-NN queries.
+
+``build_index`` reads the yearly ``*-crime-boston.csv`` files, projects each
+incident's Lat/Long onto a local plane in metres (equirectangular around
+Boston, well under a metre of error across the city) and sorts the
+incidents by the uniform grid cell they fall in. The store is a handful of
+flat ``.npy`` columns plus a CSR pointer array over the cells::
+
+    x, y        float32 metres from the projection origin
+    minute      int32 minutes since 1970-01-01 (OCCURRED_ON_DATE)
+    group       uint16 code into the manifest's offense groups
+    cell_ptr    int64, incidents of cell c are [cell_ptr[c], cell_ptr[c + 1])
+
+Cells are numbered row-major, so the cells a query circle covers in one
+grid row are one contiguous slice of every column. A radius query reads a
+few such slices and filters them in one vectorized pass; a k-nearest query
+grows the radius until the k-th hit is provably the k-th nearest.
+``GET /crime/nearby`` and ``GET /crime/nearest`` serve from the
+memory-mapped store.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import hashlib
+import json
+import math
+import time
+
+import numpy as np
+import pandas as pd
+
+from array_store import (
+    read_manifest,
+    read_store,
+    save_array,
+    staged_directory,
+    write_manifest,
+)
+from crime_cube import (
+    SOURCE_DIR,
+    SOURCE_GLOB,
+    clean_labels,
+    encode_labels,
+    parse_dates,
+    source_fingerprint,
+)
+
+STORE_FORMAT_VERSION = 1
+INDEX_DIR = Path(__file__).resolve().parent / "artifacts" / "crime_index"
+USE_COLUMNS = ("Lat", "Long", "OCCURRED_ON_DATE", "OFFENSE_CODE_GROUP")
+COLUMNS = ("x", "y", "minute", "group")
+CELL_SIZE_M = 250.0
+EARTH_RADIUS_M = 6_371_008.8
+# Projection origin near the centre of Boston.
+ORIGIN_LAT = 42.32
+ORIGIN_LON = -71.08
+# Anything outside this box is a placeholder coordinate (the files use
+# -1/-1 and 0/0) or a geocoding error, not an incident in Boston.
+VALID_LAT = (41.5, 43.0)
+VALID_LON = (-72.0, -70.0)
+
+_METRES_PER_DEG_LAT = EARTH_RADIUS_M * math.pi / 180
+_METRES_PER_DEG_LON = _METRES_PER_DEG_LAT * math.cos(math.radians(ORIGIN_LAT))
+
+
+def project(lat: Any, lon: Any) -> Tuple[np.ndarray, np.ndarray]:
+    """Lat/Long degrees -> (x, y) metres east/north of the origin."""
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    x = (lon - ORIGIN_LON) * _METRES_PER_DEG_LON
+    y = (lat - ORIGIN_LAT) * _METRES_PER_DEG_LAT
+    return x, y
+
+
+def unproject(x: Any, y: Any) -> Tuple[np.ndarray, np.ndarray]:
+    """Inverse of :func:`project`; returns ``(lat, lon)``."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    return (
+        ORIGIN_LAT + y / _METRES_PER_DEG_LAT,
+        ORIGIN_LON + x / _METRES_PER_DEG_LON,
+    )
+
+
+def parse_minute(value: str, end: bool = False) -> int:
+    """``YYYY-MM-DD`` (or a full timestamp) -> minutes since 1970.
+
+    With ``end=True`` a bare date means the last minute of that day, so
+    ``start``/``end`` bounds are both inclusive.
+    """
+    try:
+        stamp = np.datetime64(value, "m")
+    except ValueError:
+        raise ValueError(
+            f"Expected a YYYY-MM-DD date or timestamp, got {value!r}"
+        ) from None
+    if end and len(value.strip()) == 10:
+        stamp = stamp + np.timedelta64(24 * 60 - 1, "m")
+    return int(stamp.astype(np.int64))
+
+
+def read_incidents(
+    csv_path: Union[str, Path], offense_groups: List[str]
+) -> Dict[str, np.ndarray]:
+    """Projected, timestamped incidents of one CSV; bad rows are dropped.
+
+    ``offense_groups`` is extended in place with any new labels.
+    """
+    header = pd.read_csv(csv_path, nrows=0).columns
+    frame = pd.read_csv(
+        csv_path,
+        usecols=[name for name in USE_COLUMNS if name in header],
+        dtype="string",
+    )
+    for required in ("Lat", "Long", "OCCURRED_ON_DATE"):
+        if required not in frame:
+            raise ValueError(f"{csv_path} has no {required} column")
+    lat = pd.to_numeric(frame["Lat"], errors="coerce").to_numpy(np.float64)
+    lon = pd.to_numeric(frame["Long"], errors="coerce").to_numpy(np.float64)
+    dates = parse_dates(frame["OCCURRED_ON_DATE"])
+    keep = (
+        dates.notna().to_numpy()
+        & (lat >= VALID_LAT[0]) & (lat <= VALID_LAT[1])
+        & (lon >= VALID_LON[0]) & (lon <= VALID_LON[1])
+    )
+    frame, dates = frame[keep], dates[keep]
+    x, y = project(lat[keep], lon[keep])
+    if "OFFENSE_CODE_GROUP" in frame:
+        labels = clean_labels(frame["OFFENSE_CODE_GROUP"])
+    else:
+        labels = clean_labels(
+            pd.Series(pd.NA, index=frame.index, dtype="string")
+        )
+    minute = (
+        dates.to_numpy("datetime64[m]").astype(np.int64).astype(np.int32)
+    )
+    return {
+        "x": x.astype(np.float32),
+        "y": y.astype(np.float32),
+        "minute": minute,
+        "group": encode_labels(labels, offense_groups).astype(np.uint16),
+    }
+
+
+def grid_sort(
+    columns: Dict[str, np.ndarray], cell_size: float = CELL_SIZE_M
+) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    """Order incidents by grid cell and build the cell pointer array."""
+    x, y = columns["x"], columns["y"]
+    if x.size:
+        x0, y0 = float(x.min()), float(y.min())
+        nx = int((float(x.max()) - x0) // cell_size) + 1
+        ny = int((float(y.max()) - y0) // cell_size) + 1
+    else:
+        x0 = y0 = 0.0
+        nx = ny = 1
+    col = ((x - x0) // cell_size).astype(np.int64)
+    row = ((y - y0) // cell_size).astype(np.int64)
+    cell = row * nx + col
+    order = np.argsort(cell, kind="stable")
+    cell_ptr = np.zeros(nx * ny + 1, dtype=np.int64)
+    np.cumsum(np.bincount(cell, minlength=nx * ny), out=cell_ptr[1:])
+    ordered = {name: values[order] for name, values in columns.items()}
+    ordered["cell_ptr"] = cell_ptr
+    grid = {"x0": x0, "y0": y0, "nx": nx, "ny": ny, "cell_size": cell_size}
+    return ordered, grid
+
+
+def build_index(
+    source_dir: Union[str, Path] = SOURCE_DIR,
+    index_dir: Union[str, Path] = INDEX_DIR,
+    pattern: str = SOURCE_GLOB,
+    cell_size: float = CELL_SIZE_M,
+    force: bool = False,
+) -> bool:
+    """Rebuild the store in ``index_dir`` if any source file changed.
+
+    Unlike the crime cube, the grid order interleaves every year, so any
+    change rebuilds the whole store. It is written to a staging directory
+    and swapped in whole, so readers never pair new arrays with the old
+    manifest. Returns whether it was rebuilt.
+    """
+    source_dir, index_dir = Path(source_dir), Path(index_dir)
+    sources = {
+        path.name: source_fingerprint(path)
+        for path in sorted(source_dir.glob(pattern))
+    }
+    try:
+        manifest = read_manifest(index_dir)
+    except FileNotFoundError:
+        manifest = {}
+    if (
+        not force
+        and manifest.get("format_version") == STORE_FORMAT_VERSION
+        and manifest.get("sources") == sources
+        and manifest.get("grid", {}).get("cell_size") == cell_size
+    ):
+        return False
+
+    offense_groups: List[str] = []
+    parts = [
+        read_incidents(source_dir / name, offense_groups) for name in sources
+    ]
+    columns = {
+        name: np.concatenate([part[name] for part in parts])
+        if parts
+        else np.empty(0, dtype=dtype)
+        for name, dtype in zip(
+            COLUMNS, (np.float32, np.float32, np.int32, np.uint16)
+        )
+    }
+    ordered, grid = grid_sort(columns, cell_size)
+    digest = hashlib.sha1(
+        json.dumps([sources, offense_groups, cell_size]).encode()
+    )
+    with staged_directory(index_dir) as staging:
+        for name, values in ordered.items():
+            save_array(staging / f"{name}.npy", values)
+        write_manifest(
+            staging,
+            {
+                "format_version": STORE_FORMAT_VERSION,
+                "version": digest.hexdigest()[:16],
+                "origin": [ORIGIN_LAT, ORIGIN_LON],
+                "grid": grid,
+                "rows": int(ordered["x"].size),
+                "offense_groups": offense_groups,
+                "sources": sources,
+            },
+        )
+    return True
+
+
+@dataclass
+class NearbyCounts:
+    total: int
+    counts: Dict[str, int]
+
+
+class CrimeIndex:
+    """Read side of a store written by :func:`build_index`."""
+
+    def __init__(
+        self, manifest: Dict[str, Any], arrays: Dict[str, np.ndarray]
+    ) -> None:
+        self.version: str = manifest["version"]
+        self.offense_groups: List[str] = list(manifest["offense_groups"])
+        grid = manifest["grid"]
+        self.x0, self.y0 = float(grid["x0"]), float(grid["y0"])
+        self.nx, self.ny = int(grid["nx"]), int(grid["ny"])
+        self.cell_size = float(grid["cell_size"])
+        self.x = arrays["x"]
+        self.y = arrays["y"]
+        self.minute = arrays["minute"]
+        self.group = arrays["group"]
+        self.cell_ptr = arrays["cell_ptr"]
+
+    @classmethod
+    def load(
+        cls, index_dir: Union[str, Path] = INDEX_DIR, mmap_mode: str = "r"
+    ) -> "CrimeIndex":
+        index_dir = Path(index_dir)
+
+        def load_arrays(manifest: Dict[str, Any]) -> Dict[str, np.ndarray]:
+            if manifest.get("format_version") != STORE_FORMAT_VERSION:
+                raise ValueError(
+                    f"Unsupported crime index format in {index_dir}"
+                )
+            return {
+                name: np.load(index_dir / f"{name}.npy", mmap_mode=mmap_mode)
+                for name in (*COLUMNS, "cell_ptr")
+            }
+
+        manifest, arrays = read_store(index_dir, load_arrays)
+        return cls(manifest, arrays)
+
+    @classmethod
+    def from_columns(
+        cls,
+        columns: Dict[str, np.ndarray],
+        offense_groups: Sequence[str],
+        cell_size: float = CELL_SIZE_M,
+    ) -> "CrimeIndex":
+        """In-memory index, e.g. over synthetic data for benchmarks."""
+        ordered, grid = grid_sort(columns, cell_size)
+        manifest = {
+            "version": "in-memory",
+            "offense_groups": list(offense_groups),
+            "grid": grid,
+        }
+        return cls(manifest, ordered)
+
+    def __len__(self) -> int:
+        return int(self.x.shape[0])
+
+    def _candidates(
+        self, x: float, y: float, radius: float
+    ) -> List[slice]:
+        """Slices of incidents in the cells the circle's bounding box hits."""
+        size = self.cell_size
+        c0 = max(int(math.floor((x - radius - self.x0) / size)), 0)
+        c1 = min(int(math.floor((x + radius - self.x0) / size)), self.nx - 1)
+        r0 = max(int(math.floor((y - radius - self.y0) / size)), 0)
+        r1 = min(int(math.floor((y + radius - self.y0) / size)), self.ny - 1)
+        if c0 > c1 or r0 > r1:
+            return []
+        ptr = self.cell_ptr
+        slices = []
+        for row in range(r0, r1 + 1):
+            lo = int(ptr[row * self.nx + c0])
+            hi = int(ptr[row * self.nx + c1 + 1])
+            if hi > lo:
+                slices.append(slice(lo, hi))
+        return slices
+
+    def _within(
+        self,
+        x: float,
+        y: float,
+        radius: float,
+        start: Optional[int],
+        end: Optional[int],
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Positions and squared distances of incidents inside the circle."""
+        slices = self._candidates(x, y, radius)
+        if not slices:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        index = np.concatenate(
+            [np.arange(s.start, s.stop) for s in slices]
+        )
+        dx = self.x[index] - x
+        dy = self.y[index] - y
+        dist2 = dx * dx + dy * dy
+        keep = dist2 <= radius * radius
+        if start is not None or end is not None:
+            minute = self.minute[index]
+            if start is not None:
+                keep &= minute >= start
+            if end is not None:
+                keep &= minute <= end
+        return index[keep], dist2[keep]
+
+    def count_within(
+        self,
+        lat: float,
+        lon: float,
+        radius_m: float,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> NearbyCounts:
+        """Incidents within ``radius_m`` of a point, by offense group.
+
+        ``start``/``end`` are inclusive bounds in minutes since 1970
+        (see :func:`parse_minute`).
+        """
+        if radius_m <= 0:
+            raise ValueError("radius_m must be positive")
+        x, y = project(lat, lon)
+        index, _ = self._within(float(x), float(y), radius_m, start, end)
+        per_group = np.bincount(
+            self.group[index], minlength=len(self.offense_groups)
+        )
+        counts = {
+            self.offense_groups[code]: int(per_group[code])
+            for code in np.flatnonzero(per_group)
+        }
+        return NearbyCounts(total=int(index.size), counts=counts)
+
+    def nearest(
+        self,
+        lat: float,
+        lon: float,
+        k: int,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        max_radius_m: float = 20_000.0,
+    ) -> List[Dict[str, Any]]:
+        """The ``k`` incidents closest to a point, nearest first."""
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        x, y = project(lat, lon)
+        x, y = float(x), float(y)
+        radius = self.cell_size
+        while True:
+            index, dist2 = self._within(x, y, radius, start, end)
+            # Everything inside the circle has been seen, so once it holds
+            # k hits they are the k nearest.
+            if index.size >= k or radius >= max_radius_m:
+                break
+            radius = min(radius * 2, max_radius_m)
+        if index.size > k:
+            pick = np.argpartition(dist2, k - 1)[:k]
+            index, dist2 = index[pick], dist2[pick]
+        order = np.argsort(dist2, kind="stable")
+        index, dist2 = index[order], dist2[order]
+        hit_lat, hit_lon = unproject(self.x[index], self.y[index])
+        occurred = self.minute[index].astype("datetime64[m]")
+        return [
+            {
+                "distance_m": round(float(math.sqrt(d2)), 1),
+                "lat": round(float(a), 6),
+                "lon": round(float(o), 6),
+                "occurred_on": str(when),
+                "offense_group": self.offense_groups[int(code)],
+            }
+            for d2, a, o, when, code in zip(
+                dist2, hit_lat, hit_lon, occurred, self.group[index]
+            )
+        ]
+
+
+def synthetic_columns(
+    n_rows: int, n_groups: int = 40, seed: int = 0
+) -> Dict[str, np.ndarray]:
+    """Incidents clustered around a few hot spots, roughly Boston-sized."""
+    rng = np.random.default_rng(seed)
+    centres = rng.uniform(-8_000, 8_000, size=(12, 2))
+    which = rng.integers(0, len(centres), n_rows)
+    spread = rng.uniform(500, 2_500, size=len(centres))[which]
+    xy = centres[which] + rng.normal(size=(n_rows, 2)) * spread[:, None]
+    first = parse_minute("2015-06-01")
+    last = parse_minute("2025-06-01")
+    return {
+        "x": xy[:, 0].astype(np.float32),
+        "y": xy[:, 1].astype(np.float32),
+        "minute": rng.integers(first, last, n_rows).astype(np.int32),
+        "group": (rng.zipf(1.6, n_rows).clip(max=n_groups) - 1).astype(
+            np.uint16
+        ),
+    }
+
+
+def benchmark(
+    sizes: Sequence[int],
+    n_queries: int = 2_000,
+    radius_m: float = 500.0,
+    k: int = 10,
+    seed: int = 0,
+) -> List[Dict[str, Any]]:
+    """Query latency of radius and k-NN lookups against dataset size."""
+    rng = np.random.default_rng(seed)
+    groups = [f"group-{i}" for i in range(40)]
+    window = (parse_minute("2019-01-01"), parse_minute("2019-12-31", end=True))
+    results = []
+    for n_rows in sizes:
+        started = time.perf_counter()
+        index = CrimeIndex.from_columns(
+            synthetic_columns(int(n_rows), len(groups), seed), groups
+        )
+        build_s = time.perf_counter() - started
+        px = rng.uniform(-8_000, 8_000, n_queries)
+        py = rng.uniform(-8_000, 8_000, n_queries)
+        lat, lon = unproject(px, py)
+        row: Dict[str, Any] = {"rows": int(n_rows), "build_s": round(build_s, 3)}
+        cases = {
+            "radius": lambda a, o: index.count_within(a, o, radius_m),
+            "radius_window": lambda a, o: index.count_within(
+                a, o, radius_m, *window
+            ),
+            "nearest": lambda a, o: index.nearest(a, o, k),
+        }
+        for name, query in cases.items():
+            latencies = np.empty(n_queries)
+            for i in range(n_queries):
+                tick = time.perf_counter()
+                query(float(lat[i]), float(lon[i]))
+                latencies[i] = time.perf_counter() - tick
+            row[name] = {
+                "p50_us": round(float(np.percentile(latencies, 50)) * 1e6, 1),
+                "p95_us": round(float(np.percentile(latencies, 95)) * 1e6, 1),
+                "p99_us": round(float(np.percentile(latencies, 99)) * 1e6, 1),
+                "qps": round(n_queries / float(latencies.sum()), 1),
+            }
+        results.append(row)
+    return results
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command")
+    build = commands.add_parser("build", help="build or refresh the store")
+    build.add_argument("--source-dir", type=Path, default=SOURCE_DIR)
+    build.add_argument("--index-dir", type=Path, default=INDEX_DIR)
+    build.add_argument("--pattern", default=SOURCE_GLOB)
+    build.add_argument("--cell-size", type=float, default=CELL_SIZE_M)
+    build.add_argument("--force", action="store_true")
+    bench = commands.add_parser(
+        "bench", help="query latency on synthetic data of growing size"
+    )
+    bench.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10_000, 100_000, 1_000_000, 3_000_000],
+    )
+    bench.add_argument("--queries", type=int, default=2_000)
+    bench.add_argument("--radius", type=float, default=500.0)
+    bench.add_argument("--k", type=int, default=10)
+    bench.add_argument("--json", type=Path, help="also write results here")
+    args = parser.parse_args(argv)
+
+    if args.command == "bench":
+        results = benchmark(args.sizes, args.queries, args.radius, args.k)
+        print(f"{'rows':>10} {'query':>14} {'p50 us':>9} {'p95 us':>9} "
+              f"{'p99 us':>9} {'qps':>9}")
+        for row in results:
+            for name in ("radius", "radius_window", "nearest"):
+                stats = row[name]
+                print(
+                    f"{row['rows']:>10} {name:>14} {stats['p50_us']:>9} "
+                    f"{stats['p95_us']:>9} {stats['p99_us']:>9} "
+                    f"{stats['qps']:>9}"
+                )
+        if args.json:
+            args.json.write_text(json.dumps(results, indent=2))
+        return
+
+    if args.command is None:
+        args = parser.parse_args(["build", *(argv or [])])
+    rebuilt = build_index(
+        args.source_dir,
+        args.index_dir,
+        args.pattern,
+        cell_size=args.cell_size,
+        force=args.force,
+    )
+    manifest = read_manifest(args.index_dir)
+    state = "rebuilt" if rebuilt else "up to date"
+    print(
+        f"Crime index {manifest['version']} ({state}): {manifest['rows']} "
+        f"incidents, {manifest['grid']['nx']}x{manifest['grid']['ny']} "
+        f"cells of {manifest['grid']['cell_size']:g} m in {args.index_dir}"
+    )
+
+
+if __name__ == "__main__":
+    main()
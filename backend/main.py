@@ -1,11 +1,321 @@
-from fastapi import FastAPI
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import (
+    JSONResponse, PlainTextResponse, Response, StreamingResponse
+)
+from pydantic import BaseModel, ValidationError, model_validator
+from starlette.requests import ClientDisconnect
+from typing import Any, Dict, List, Literal, Optional, Tuple
+import asyncio
 import joblib
+import logging
+import numpy as np
+import os
 import pandas as pd
+import contextlib
+import sys
+import threading
+import time
 from pathlib import Path
 
-app = FastAPI(title="Boston House Price API", version="1.0.0")
+from batching import MicroBatcher
+from bulk_scoring import (
+    MEDIA_TYPES, ChunkParser, encode, missing_columns, score_frame
+)
+from crime_cube import DIMENSIONS, CrimeCube, check_group_by
+from crime_index import CrimeIndex, parse_minute
+from forest_engine import CompiledForest, check_parity
+from metrics import MetricsRegistry, RequestTimer, Sample, Timer
+from model_registry import ArtifactBundle, ModelRegistry, ShadowMonitor
+from prediction_cache import PredictionCache, canonical_key
+from price_surface import BASE_HOUSE, PriceSurface, build_surface
+
+logger = logging.getLogger("uvicorn.error")
+
+# --- Paths ---
+BASE_DIR = Path(__file__).resolve().parent
+MODEL_DIR = Path(os.getenv("PRICE_MODEL_DIR", str(BASE_DIR / "notebooks")))
+
+# --- Settings ---
+MAX_BATCH_SIZE = int(os.getenv("PRICE_MAX_BATCH_SIZE", "50000"))
+MAX_SWEEP_POINTS = int(os.getenv("PRICE_MAX_SWEEP_POINTS", "10000"))
+BULK_CHUNK_ROWS = int(os.getenv("PRICE_BULK_CHUNK_ROWS", "5000"))
+BULK_WORKERS = int(os.getenv("PRICE_BULK_WORKERS", "1"))
+BATCHER_ENABLED = os.getenv("PRICE_BATCHER_ENABLED", "0") == "1"
+BATCHER_MAX_BATCH_SIZE = int(os.getenv("PRICE_BATCHER_MAX_BATCH_SIZE", "64"))
+BATCHER_MAX_WAIT_MS = float(os.getenv("PRICE_BATCHER_MAX_WAIT_MS", "2"))
+COMPILED_FOREST = os.getenv("PRICE_COMPILED_FOREST", "0") == "1"
+MODEL_STORE_DIR = os.getenv("PRICE_MODEL_STORE")
+REGRESSION_MODEL_PATH = os.getenv("PRICE_REGRESSION_MODEL")
+MODEL_REGISTRY_DIR = os.getenv("PRICE_MODEL_REGISTRY")
+REGISTRY_POLL_SECONDS = float(os.getenv("PRICE_REGISTRY_POLL_SECONDS", "30"))
+SHADOW_FRACTION = float(os.getenv("PRICE_SHADOW_FRACTION", "0"))
+WARM_ZIPCODE = 2118
+WARM_BATCH_SIZE = 64
+BACKGROUND_LOAD = os.getenv("PRICE_BACKGROUND_LOAD", "1") == "1"
+CACHE_SIZE = int(os.getenv("PRICE_CACHE_SIZE", "4096"))
+CACHE_TTL_SECONDS = float(os.getenv("PRICE_CACHE_TTL_SECONDS", "600"))
+METRICS_ENABLED = os.getenv("PRICE_METRICS_ENABLED", "1") == "1"
+CRIME_CUBE_DIR = Path(
+    os.getenv(
+        "PRICE_CRIME_CUBE_DIR", str(BASE_DIR / "artifacts" / "crime_cube")
+    )
+)
+CRIME_CUBE_MAX_CELLS = int(os.getenv("PRICE_CRIME_CUBE_MAX_CELLS", "100000"))
+CRIME_INDEX_DIR = Path(
+    os.getenv(
+        "PRICE_CRIME_INDEX_DIR", str(BASE_DIR / "artifacts" / "crime_index")
+    )
+)
+CRIME_MAX_RADIUS_M = float(os.getenv("PRICE_CRIME_MAX_RADIUS_M", "5000"))
+CRIME_MAX_NEAREST = int(os.getenv("PRICE_CRIME_MAX_NEAREST", "500"))
+PRICE_SURFACE_DIR = Path(
+    os.getenv(
+        "PRICE_SURFACE_DIR", str(BASE_DIR / "artifacts" / "price_surface")
+    )
+)
+
+# --- Load artifacts ---
+MODEL_PATH = MODEL_DIR / "best_price_model.pkl"
+SCALER_PATH = MODEL_DIR / "scaler_price_features.pkl"
+NUMERIC_COLS_PATH = MODEL_DIR / "scaler_numeric_columns.pkl"
+# Served when no registry is configured (or it holds no bundle yet).
+LEGACY_BUNDLE = ArtifactBundle(
+    name=MODEL_DIR.name,
+    model_path=(
+        Path(REGRESSION_MODEL_PATH) if REGRESSION_MODEL_PATH else MODEL_PATH
+    ),
+    scaler_path=SCALER_PATH,
+    numeric_cols_path=NUMERIC_COLS_PATH,
+    kind="price_regression" if REGRESSION_MODEL_PATH else "sklearn",
+)
+
+@dataclass(frozen=True)
+class LoadedArtifacts:
+    """Everything needed to score a request, swapped in as one reference."""
+    predictor: Any
+    scaler: Any
+    numeric_cols: List[str]
+    version: str
+    mode: str
+    bundle: str = ""
+    load_seconds: float = 0.0
+
+metrics = MetricsRegistry()
+_NO_TIMER = contextlib.nullcontext()
+
+def _stage(stage: str) -> Any:
+    """Time one step of the prediction path into ``price_stage_seconds``."""
+    if not METRICS_ENABLED:
+        return _NO_TIMER
+    return Timer(
+        metrics.histogram(
+            "price_stage_seconds",
+            description="Time spent in each step of the prediction path.",
+            stage=stage,
+        )
+    )
+
+def _model_timing_hook(stage: str, seconds: float) -> None:
+    """``PriceRegressionModel.timing_hook`` feeding the same registry."""
+    metrics.histogram(
+        "price_model_stage_seconds",
+        description="Time inside PriceRegressionModel by stage.",
+        stage=stage,
+    ).observe(seconds)
+
+artifacts: Optional[LoadedArtifacts] = None
+load_status: Dict[str, Any] = {"state": "loading"}
+price_surface: Optional[Tuple[PriceSurface, bytes]] = None
+
+def _memory_snapshot() -> Dict[str, float]:
+    """Resident memory of this worker; USS excludes pages shared via mmap."""
+    try:
+        import psutil
+    except ImportError:  # pragma: no cover - optional dependency
+        import resource
+
+        max_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return {"max_rss_mb": round(max_rss_kb / 1024, 1)}
+    info = psutil.Process().memory_full_info()
+    return {
+        "rss_mb": round(info.rss / 2**20, 1),
+        "uss_mb": round(info.uss / 2**20, 1),
+    }
+
+def _load_regression_model(path: Path) -> Any:
+    """Serve a ``PriceRegressionModel`` instead of the forest.
+
+    ``.prm`` and ``.npy`` files are memory-mapped, so the weights are shared
+    through the page cache by every worker instead of being unpickled into
+    each one.
+    """
+    scripts_dir = str(BASE_DIR / "scripts")
+    if scripts_dir not in sys.path:
+        sys.path.append(scripts_dir)
+    from Price import PriceRegressionModel
+
+    mmap_mode = "r" if path.suffix in (".prm", ".npy") else None
+    model = PriceRegressionModel.load(path, mmap_mode=mmap_mode)
+    names = model.feature_names_
+    if (names is not None and names != FEATURE_COLUMNS) or (
+        model._n_raw_features_ != len(FEATURE_COLUMNS)
+    ):
+        raise ValueError(
+            f"{path.name} was trained on {names or model._n_raw_features_} "
+            f"features, expected {FEATURE_COLUMNS}"
+        )
+    return model
+
+def _check_forest_columns(names: Any, source: Any) -> None:
+    if names is not None and list(names) != FEATURE_COLUMNS:
+        raise ValueError(
+            f"{source} was trained on {list(names)}, "
+            f"expected {FEATURE_COLUMNS}"
+        )
+
+def _load_forest(bundle: ArtifactBundle, version: str) -> Tuple[Any, str]:
+    model_path = bundle.model_path
+    if bundle.kind == "price_regression":
+        return _load_regression_model(model_path), model_path.suffix[1:]
+
+    if MODEL_STORE_DIR:
+        # Workers share one read-only store per artifact version; the first
+        # worker to start after a deploy compiles and writes it.
+        store = Path(MODEL_STORE_DIR) / version
+        if not (store / "manifest.json").exists():
+            forest = joblib.load(model_path)
+            _check_forest_columns(
+                getattr(forest, "feature_names_in_", None), model_path
+            )
+            compiled = CompiledForest.from_sklearn(forest)
+            check_parity(forest, compiled)
+            compiled.save(store, metadata={"source": model_path.name})
+            del forest, compiled
+        compiled = CompiledForest.load(store, mmap_mode="r")
+        # Also covers a store another worker (or an older release) wrote.
+        _check_forest_columns(compiled.feature_names, store)
+        return compiled, "mmap"
+
+    forest = joblib.load(model_path)
+    _check_forest_columns(
+        getattr(forest, "feature_names_in_", None), model_path
+    )
+    if COMPILED_FOREST:
+        # The compiled forest replaces model.predict; refuse to serve it
+        # unless it reproduces the scikit-learn predictions.
+        compiled = CompiledForest.from_sklearn(forest)
+        check_parity(forest, compiled)
+        return compiled, "compiled"
+    return forest, "joblib"
+
+def _load_bundle(bundle: ArtifactBundle) -> LoadedArtifacts:
+    """Load one bundle's model, scaler and column list; nothing is served."""
+    started = time.perf_counter()
+    version = bundle.fingerprint()
+    predictor, mode = _load_forest(bundle, version)
+    if METRICS_ENABLED and hasattr(predictor, "timing_hook"):
+        predictor.timing_hook = _model_timing_hook
+    return LoadedArtifacts(
+        predictor=predictor,
+        scaler=joblib.load(bundle.scaler_path),
+        numeric_cols=joblib.load(bundle.numeric_cols_path),
+        version=version,
+        mode=mode,
+        bundle=bundle.name,
+        load_seconds=time.perf_counter() - started,
+    )
+
+def _activate(loaded: LoadedArtifacts) -> None:
+    """Make ``loaded`` the serving set with one reference assignment.
+
+    Requests already running keep the ``LoadedArtifacts`` they started
+    with; the next one picks up the new set.
+    """
+    global artifacts
+    artifacts = loaded
+    if prediction_cache is not None:
+        prediction_cache.set_version(loaded.version)
+    memory = _memory_snapshot()
+    load_status.clear()
+    load_status.update(
+        state="ready",
+        bundle=loaded.bundle,
+        version=loaded.version,
+        mode=loaded.mode,
+        load_seconds=round(loaded.load_seconds, 3),
+        memory=memory,
+    )
+    logger.info(
+        "Price model %s (%s) serving after %.2fs load "
+        "(mode=%s, pid=%d, memory=%s)",
+        loaded.bundle, loaded.version, loaded.load_seconds, loaded.mode,
+        os.getpid(), memory,
+    )
+
+def load_artifacts() -> LoadedArtifacts:
+    """Load the bundle the registry would serve and make it the serving set."""
+    loaded = _load_bundle(registry.target())
+    _activate(loaded)
+    return loaded
+
+def _swap_in(loaded: LoadedArtifacts) -> None:
+    _activate(loaded)
+    refresh_price_surface(loaded)
+
+def refresh_price_surface(loaded: LoadedArtifacts) -> None:
+    """Serve the map's price table for ``loaded``, computing it if stale."""
+    global price_surface
+    try:
+        surface = build_surface(
+            lambda frame: _predict_frame(frame, loaded),
+            loaded.version,
+            FEATURE_COLUMNS,
+            PRICE_SURFACE_DIR,
+        )
+    except Exception:
+        logger.exception("Failed to build the price surface")
+        return
+    price_surface = (surface, surface.to_json())
+
+def _load_in_background() -> None:
+    try:
+        registry.check()
+    except Exception as exc:
+        load_status.update(state="failed", error=repr(exc))
+        logger.exception("Failed to load price model artifacts")
+    # Keep polling after a failure too: a fixed bundle is picked up.
+    if MODEL_REGISTRY_DIR:
+        registry.start()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if BACKGROUND_LOAD:
+        # Start accepting connections immediately; /ready reports when the
+        # model is usable and prediction routes answer 503 until then.
+        threading.Thread(
+            target=_load_in_background, name="price-model-loader", daemon=True
+        ).start()
+    else:
+        registry.check()
+        if MODEL_REGISTRY_DIR:
+            registry.start()
+    yield
+    registry.stop()
+    if batcher is not None:
+        await batcher.close()
+
+app = FastAPI(
+    title="Boston House Price API", version="1.0.0", lifespan=lifespan
+)
+
+if METRICS_ENABLED:
+    app.add_middleware(RequestTimer, registry=metrics)
 
 app.add_middleware(
     CORSMiddleware,
@@ -15,15 +325,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# --- Paths ---
-BASE_DIR = Path(__file__).resolve().parent
-MODEL_DIR = BASE_DIR / "notebooks"
-
-# --- Load artifacts ---
-model = joblib.load(MODEL_DIR / "best_price_model.pkl")
-scaler = joblib.load(MODEL_DIR / "scaler_price_features.pkl")
-numeric_cols = joblib.load(MODEL_DIR / "scaler_numeric_columns.pkl")
-
 class PriceRequest(BaseModel):
     ZIPCODE: int
     GROSS_AREA: float
@@ -38,16 +339,676 @@ class PriceRequest(BaseModel):
     HEAT_TYPE: int
     AC_TYPE: int
 
+    @model_validator(mode="wrap")
+    @classmethod
+    def _time_validation(cls, data: Any, handler: Any) -> Any:
+        with _stage("validate"):
+            return handler(data)
+
 class PriceResponse(BaseModel):
     predicted_price: float
 
+class BatchPriceRequest(BaseModel):
+    """Either row records or a columnar payload (column name -> values)."""
+    records: Optional[List[Dict[str, Any]]] = None
+    columns: Optional[Dict[str, List[Any]]] = None
+
+class RowError(BaseModel):
+    index: int
+    errors: List[str]
+
+class BatchPriceResponse(BaseModel):
+    predictions: List[Optional[float]]
+    errors: List[RowError]
+
+class SweepAxis(BaseModel):
+    """A feature to vary: ``num`` evenly spaced values or explicit ``values``.
+
+    Integer features are rounded and duplicates dropped, so a BED_RMS range
+    of 1-5 with ``num=20`` still yields five points.
+    """
+    feature: str
+    start: Optional[float] = None
+    stop: Optional[float] = None
+    num: int = 20
+    values: Optional[List[float]] = None
+
+class SweepRequest(BaseModel):
+    base: PriceRequest
+    vary: List[SweepAxis]
+
+class SweepResponse(BaseModel):
+    """``predictions`` is a curve for one axis, a grid (first x second) for two."""
+    features: List[str]
+    values: List[List[float]]
+    predictions: List[Any]
+    cached_points: int
+
+class CrimeCubeResponse(BaseModel):
+    """Counts nested along ``dimensions``; a bare total when ungrouped."""
+    dimensions: List[str]
+    labels: Dict[str, List[Any]]
+    counts: Any
+    total: int
+    version: str
+
+class CrimeNearbyResponse(BaseModel):
+    """Incidents within ``radius_m`` of a point, by offense group."""
+    lat: float
+    lon: float
+    radius_m: float
+    start: Optional[str]
+    end: Optional[str]
+    total: int
+    counts: Dict[str, int]
+    version: str
+
+class NearbyIncident(BaseModel):
+    distance_m: float
+    lat: float
+    lon: float
+    occurred_on: str
+    offense_group: str
+
+class CrimeNearestResponse(BaseModel):
+    lat: float
+    lon: float
+    incidents: List[NearbyIncident]
+    version: str
+
+FEATURE_COLUMNS = list(PriceRequest.model_fields)
+INTEGER_FEATURES = {
+    name
+    for name, field in PriceRequest.model_fields.items()
+    if field.annotation is int
+}
+
+def _current_artifacts() -> LoadedArtifacts:
+    loaded = artifacts
+    if loaded is None:
+        raise HTTPException(status_code=503, detail="Model is still loading.")
+    return loaded
+
+def _predict_frame(
+    data: pd.DataFrame, loaded: Optional[LoadedArtifacts] = None
+) -> np.ndarray:
+    """Scale and score PriceRequest rows with one transform and one predict."""
+    loaded = loaded or _current_artifacts()
+    cols = loaded.numeric_cols
+    with _stage("scale"):
+        data[cols] = loaded.scaler.transform(data[cols])
+    with _stage("predict"):
+        return loaded.predictor.predict(data)
+
+def _predict_records(
+    rows: List[Dict[str, Any]], loaded: Optional[LoadedArtifacts] = None
+) -> np.ndarray:
+    with _stage("frame"):
+        data = pd.DataFrame(rows, columns=FEATURE_COLUMNS)
+    return _predict_frame(data, loaded)
+
+def _score_rows(
+    loaded: LoadedArtifacts, rows: List[Dict[str, Any]]
+) -> np.ndarray:
+    """Score rows off the request path (warm-up, shadow): no stage timers."""
+    data = pd.DataFrame(rows, columns=FEATURE_COLUMNS)
+    cols = loaded.numeric_cols
+    data[cols] = loaded.scaler.transform(data[cols])
+    return np.asarray(loaded.predictor.predict(data), dtype=np.float64)
+
+def _warm(loaded: LoadedArtifacts) -> None:
+    """Run a single row and a batch through a new bundle before serving it.
+
+    The first calls pay for lazy imports, allocator growth and page faults
+    on memory-mapped arrays; a model that cannot score the price form's
+    rows is rejected here instead of failing live requests.
+    """
+    base = {"ZIPCODE": WARM_ZIPCODE, **BASE_HOUSE}
+    rows = [
+        {**base, "LIVING_AREA": area, "GROSS_AREA": round(area * 4 / 3)}
+        for area in np.linspace(600, 4000, WARM_BATCH_SIZE)
+    ]
+    for batch in (rows[:1], rows):
+        predictions = _score_rows(loaded, batch)
+        if predictions.shape != (len(batch),) or not np.all(
+            np.isfinite(predictions)
+        ):
+            raise ValueError(
+                f"Bundle {loaded.bundle} returned unusable warm-up "
+                f"predictions: {predictions[:4]}"
+            )
+
+batcher = (
+    MicroBatcher(
+        _predict_records,
+        max_batch_size=BATCHER_MAX_BATCH_SIZE,
+        max_wait_ms=BATCHER_MAX_WAIT_MS,
+    )
+    if BATCHER_ENABLED
+    else None
+)
+
+prediction_cache = (
+    PredictionCache(max_size=CACHE_SIZE, ttl_seconds=CACHE_TTL_SECONDS)
+    if CACHE_SIZE > 0
+    else None
+)
+
+# Shared by every /predict_price/stream upload, so bulk jobs together never
+# use more than PRICE_BULK_WORKERS threads.
+bulk_pool = ThreadPoolExecutor(
+    max_workers=max(BULK_WORKERS, 1), thread_name_prefix="price-bulk"
+)
+
+shadow = (
+    ShadowMonitor(SHADOW_FRACTION, _score_rows) if SHADOW_FRACTION > 0 else None
+)
+registry = ModelRegistry(
+    MODEL_REGISTRY_DIR,
+    _load_bundle,
+    _swap_in,
+    warm=_warm,
+    fallback=LEGACY_BUNDLE,
+    poll_seconds=REGISTRY_POLL_SECONDS,
+    shadow=shadow,
+)
+
+def _collect_service_metrics() -> List[Sample]:
+    samples: List[Sample] = [
+        (
+            "price_model_ready",
+            "gauge",
+            "1 once the price model artifacts are loaded.",
+            {},
+            1.0 if artifacts is not None else 0.0,
+        )
+    ]
+    if prediction_cache is not None:
+        stats = prediction_cache.stats()
+        for name in ("hits", "misses", "evictions", "expirations"):
+            samples.append(
+                (
+                    f"price_cache_{name}_total",
+                    "counter",
+                    f"Prediction cache {name}.",
+                    {},
+                    stats[name],
+                )
+            )
+        samples.append(
+            ("price_cache_entries", "gauge", "", {}, stats["size"])
+        )
+    return samples
+
+metrics.add_collector(_collect_service_metrics)
+if shadow is not None:
+    metrics.add_collector(shadow.samples)
+if batcher is not None:
+    metrics.register(batcher.batch_size_hist)
+    metrics.register(batcher.queue_wait_hist)
+
+crime_cube: Optional[CrimeCube] = None
+crime_cube_stamp: Optional[Tuple[int, int]] = None
+crime_cube_lock = threading.Lock()
+
+def _current_crime_cube() -> CrimeCube:
+    """The cube store, reopened whenever ``crime_cube.py`` rewrites it."""
+    global crime_cube, crime_cube_stamp
+    try:
+        stat = (CRIME_CUBE_DIR / "manifest.json").stat()
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=503, detail="Crime cube has not been built."
+        ) from None
+    stamp = (stat.st_size, stat.st_mtime_ns)
+    with crime_cube_lock:
+        if crime_cube is None or crime_cube_stamp != stamp:
+            crime_cube = CrimeCube.load(CRIME_CUBE_DIR)
+            crime_cube_stamp = stamp
+        return crime_cube
+
+crime_index: Optional[CrimeIndex] = None
+crime_index_stamp: Optional[Tuple[int, int]] = None
+crime_index_lock = threading.Lock()
+
+def _current_crime_index() -> CrimeIndex:
+    """The incident index, reopened whenever ``crime_index.py`` rewrites it."""
+    global crime_index, crime_index_stamp
+    try:
+        stat = (CRIME_INDEX_DIR / "manifest.json").stat()
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=503, detail="Crime index has not been built."
+        ) from None
+    stamp = (stat.st_size, stat.st_mtime_ns)
+    with crime_index_lock:
+        if crime_index is None or crime_index_stamp != stamp:
+            crime_index = CrimeIndex.load(CRIME_INDEX_DIR)
+            crime_index_stamp = stamp
+        return crime_index
+
+def _time_window(
+    start: Optional[str], end: Optional[str]
+) -> Tuple[Optional[int], Optional[int]]:
+    try:
+        return (
+            parse_minute(start) if start is not None else None,
+            parse_minute(end, end=True) if end is not None else None,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from None
+
+def _sweep_values(axis: SweepAxis) -> np.ndarray:
+    if axis.feature not in FEATURE_COLUMNS or axis.feature == "ZIPCODE":
+        raise HTTPException(
+            status_code=422,
+            detail=f"Cannot vary {axis.feature!r}; choose one of "
+            f"{[c for c in FEATURE_COLUMNS if c != 'ZIPCODE']}.",
+        )
+    if axis.values is not None:
+        values = np.asarray(axis.values, dtype=float)
+    elif axis.start is not None and axis.stop is not None and axis.num >= 1:
+        values = np.linspace(axis.start, axis.stop, axis.num)
+    else:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Give {axis.feature} either 'values' or 'start', 'stop' "
+            "and a positive 'num'.",
+        )
+    if not values.size or not np.isfinite(values).all():
+        raise HTTPException(
+            status_code=422,
+            detail=f"{axis.feature} needs at least one finite value.",
+        )
+    if axis.feature in INTEGER_FEATURES:
+        values = np.round(values)
+        _, first = np.unique(values, return_index=True)
+        values = values[np.sort(first)]
+    return values
+
+def _sweep_frame(
+    base: PriceRequest, axes: List[SweepAxis]
+) -> Tuple[List[np.ndarray], pd.DataFrame]:
+    """Every combination of the axis values on top of ``base``, row-major."""
+    values = [_sweep_values(axis) for axis in axes]
+    n_points = int(np.prod([v.size for v in values]))
+    if n_points > MAX_SWEEP_POINTS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Sweep of {n_points} points exceeds the limit of "
+            f"{MAX_SWEEP_POINTS}.",
+        )
+    frame = pd.DataFrame([base.model_dump()] * n_points, columns=FEATURE_COLUMNS)
+    mesh = np.meshgrid(*values, indexing="ij")
+    for axis, grid in zip(axes, mesh):
+        column = grid.ravel()
+        if axis.feature in INTEGER_FEATURES:
+            column = column.astype(np.int64)
+        frame[axis.feature] = column
+    return values, frame
+
+def _batch_records(payload: BatchPriceRequest) -> List[Dict[str, Any]]:
+    if (payload.records is None) == (payload.columns is None):
+        raise HTTPException(
+            status_code=422,
+            detail="Provide exactly one of 'records' or 'columns'.",
+        )
+    if payload.records is not None:
+        return payload.records
+    lengths = {len(values) for values in payload.columns.values()}
+    if len(lengths) > 1:
+        raise HTTPException(
+            status_code=422,
+            detail="All columns must contain the same number of values.",
+        )
+    names = list(payload.columns)
+    return [
+        dict(zip(names, values))
+        for values in zip(*payload.columns.values())
+    ]
+
+class _DuplexStreamingResponse(StreamingResponse):
+    """A streaming response whose body keeps reading the request.
+
+    ``StreamingResponse`` listens for a client disconnect alongside the
+    body on servers speaking ASGI spec < 2.4 (uvicorn reports 2.3), and
+    that listener would swallow upload chunks. Here the body iterator is
+    the only reader and sees the disconnect itself.
+    """
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        await self.stream_response(send)
+
 @app.get("/")
 def root():
     return {"message": "Boston price prediction API is running."}
 
+@app.get("/ready")
+def ready():
+    status_code = 200 if artifacts is not None else 503
+    return JSONResponse(
+        status_code=status_code,
+        content={"ready": artifacts is not None, **load_status},
+    )
+
 @app.post("/predict_price", response_model=PriceResponse)
-def predict_price(req: PriceRequest):
-    data = pd.DataFrame([req.dict()])
-    data[numeric_cols] = scaler.transform(data[numeric_cols])
-    pred = model.predict(data)[0]
+async def predict_price(req: PriceRequest):
+    row = req.dict()
+    loaded = _current_artifacts()
+    version = loaded.version
+    if prediction_cache is not None:
+        with _stage("cache"):
+            key = canonical_key(row, FEATURE_COLUMNS)
+            cached = prediction_cache.get(key, version)
+        if cached is not None:
+            if shadow is not None:
+                shadow.offer(row, cached)
+            return PriceResponse(predicted_price=cached)
+
+    started = time.perf_counter()
+    if batcher is not None:
+        pred = await batcher.submit(row, loaded)
+    else:
+        pred = (await run_in_threadpool(_predict_records, [row], loaded))[0]
+    if prediction_cache is not None:
+        prediction_cache.put(
+            key, pred, version, cost_seconds=time.perf_counter() - started
+        )
+    if shadow is not None:
+        shadow.offer(row, float(pred))
     return PriceResponse(predicted_price=float(pred))
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics_endpoint():
+    return PlainTextResponse(
+        metrics.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+@app.get("/models")
+def models_status():
+    """Registry versions, the served one, and the shadow report if any."""
+    return registry.status()
+
+@app.get("/batcher/stats")
+def batcher_stats():
+    if batcher is None:
+        return {"enabled": False}
+    return {"enabled": True, **batcher.stats()}
+
+@app.get("/cache/stats")
+def cache_stats():
+    if prediction_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **prediction_cache.stats()}
+
+@app.post("/predict_price/sweep", response_model=SweepResponse)
+def predict_price_sweep(payload: SweepRequest):
+    if not 1 <= len(payload.vary) <= 2:
+        raise HTTPException(
+            status_code=422, detail="Vary one or two features."
+        )
+    features = [axis.feature for axis in payload.vary]
+    if len(set(features)) != len(features):
+        raise HTTPException(
+            status_code=422, detail="Vary two different features."
+        )
+    loaded = _current_artifacts()
+    values, frame = _sweep_frame(payload.base, payload.vary)
+
+    predictions = np.empty(len(frame))
+    missing = np.arange(len(frame))
+    keys: List[Any] = []
+    if prediction_cache is not None:
+        keys = [
+            canonical_key(row, FEATURE_COLUMNS)
+            for row in frame.to_dict("records")
+        ]
+        cached = prediction_cache.get_many(keys, loaded.version)
+        hit = np.array([value is not None for value in cached])
+        predictions[hit] = [value for value in cached if value is not None]
+        missing = np.flatnonzero(~hit)
+
+    if missing.size:
+        started = time.perf_counter()
+        # One scaler.transform and one predict for every uncached point.
+        scored = _predict_frame(
+            frame.iloc[missing].reset_index(drop=True), loaded
+        )
+        predictions[missing] = scored
+        if prediction_cache is not None:
+            prediction_cache.put_many(
+                [(keys[i], value) for i, value in zip(missing, scored)],
+                loaded.version,
+                cost_seconds=time.perf_counter() - started,
+            )
+
+    shape = [v.size for v in values]
+    return SweepResponse(
+        features=features,
+        values=[v.tolist() for v in values],
+        predictions=predictions.reshape(shape).tolist(),
+        cached_points=int(len(frame) - missing.size),
+    )
+
+@app.post("/predict_price/batch", response_model=BatchPriceResponse)
+def predict_price_batch(payload: BatchPriceRequest):
+    records = _batch_records(payload)
+    loaded = _current_artifacts()
+    if len(records) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch of {len(records)} rows exceeds the limit of "
+            f"{MAX_BATCH_SIZE}.",
+        )
+
+    valid_rows: List[Dict[str, Any]] = []
+    valid_idx: List[int] = []
+    errors: List[RowError] = []
+    for idx, record in enumerate(records):
+        try:
+            valid_rows.append(PriceRequest.model_validate(record).model_dump())
+        except ValidationError as exc:
+            messages = [
+                f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}"
+                for err in exc.errors()
+            ]
+            errors.append(RowError(index=idx, errors=messages))
+            continue
+        valid_idx.append(idx)
+
+    predictions: List[Optional[float]] = [None] * len(records)
+    if valid_rows:
+        preds = _predict_records(valid_rows, loaded)
+        for idx, pred in zip(valid_idx, preds):
+            predictions[idx] = float(pred)
+    return BatchPriceResponse(predictions=predictions, errors=errors)
+
+@app.post("/predict_price/stream")
+async def predict_price_stream(
+    request: Request,
+    input: Literal["csv", "ndjson"] = "csv",
+    output: Optional[Literal["csv", "ndjson"]] = None,
+):
+    """Score a streamed CSV or NDJSON upload chunk by chunk.
+
+    Scored rows are sent back while the upload is still arriving, so the
+    client has to read the response as it sends (``curl -T file`` does).
+    Each row gets ``predicted_price``, empty or null for invalid rows.
+    """
+    loaded = _current_artifacts()
+    output = output or input
+    parser = ChunkParser(input, BULK_CHUNK_ROWS)
+    upload = request.stream()
+    ready: List[bytes] = []
+    if input == "csv":
+        async for data in upload:
+            ready.extend(parser.feed(data))
+            if parser.header is not None:
+                break
+        else:
+            ready.extend(parser.close())
+        if parser.header is None:
+            raise HTTPException(status_code=422, detail="Empty upload.")
+        missing = missing_columns(parser.columns, FEATURE_COLUMNS)
+        if missing:
+            raise HTTPException(
+                status_code=422, detail=f"Missing column(s): {missing}"
+            )
+
+    def score(chunk: bytes, header: bool) -> str:
+        scored = score_frame(
+            parser.parse(chunk),
+            lambda features: _predict_frame(features, loaded),
+            FEATURE_COLUMNS,
+            INTEGER_FEATURES,
+        )
+        return encode(scored, output, header)
+
+    async def chunks():
+        for chunk in ready:
+            yield chunk
+        async for data in upload:
+            for chunk in parser.feed(data):
+                yield chunk
+        for chunk in parser.close():
+            yield chunk
+
+    async def body():
+        loop = asyncio.get_running_loop()
+        pending: deque = deque()
+        header = True
+        try:
+            async for chunk in chunks():
+                pending.append(
+                    loop.run_in_executor(bulk_pool, score, chunk, header)
+                )
+                header = False
+                while len(pending) >= 2 * BULK_WORKERS or (
+                    pending and pending[0].done()
+                ):
+                    yield await pending.popleft()
+            while pending:
+                yield await pending.popleft()
+        except ClientDisconnect:
+            logger.info("Bulk scoring upload disconnected")
+        except Exception:
+            # Headers are already sent: all that is left is to stop.
+            logger.exception("Bulk scoring stream failed")
+
+    return _DuplexStreamingResponse(body(), media_type=MEDIA_TYPES[output])
+
+@app.get("/price_surface")
+def get_price_surface(request: Request):
+    """Predicted price per ZIP x configuration, precomputed per model."""
+    current = price_surface
+    if current is None:
+        raise HTTPException(
+            status_code=503, detail="Price surface is not ready yet."
+        )
+    surface, body = current
+    headers = {"ETag": surface.etag, "Cache-Control": "no-cache"}
+    match = request.headers.get("if-none-match", "")
+    if surface.etag in {tag.strip() for tag in match.split(",")} or (
+        match.strip() == "*"
+    ):
+        return Response(status_code=304, headers=headers)
+    return Response(
+        content=body, media_type="application/json", headers=headers
+    )
+
+@app.get("/crime/cube", response_model=CrimeCubeResponse)
+def crime_cube_slice(
+    group_by: List[str] = Query(default=[]),
+    district: Optional[List[str]] = Query(default=None),
+    offense_group: Optional[List[str]] = Query(default=None),
+    day_of_week: Optional[List[int]] = Query(default=None),
+    hour: Optional[List[int]] = Query(default=None),
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+):
+    cube = _current_crime_cube()
+    try:
+        group_by = check_group_by(group_by)
+        selection = cube.select(
+            district=district,
+            offense_group=offense_group,
+            day_of_week=day_of_week,
+            hour=hour,
+            start=start,
+            end=end,
+        )
+        n_cells = int(np.prod([selection[d].size for d in group_by]))
+        if n_cells > CRIME_CUBE_MAX_CELLS:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Slice of {n_cells} cells exceeds the limit of "
+                f"{CRIME_CUBE_MAX_CELLS}; group by fewer dimensions or "
+                "filter further.",
+            )
+        labels, counts = cube.aggregate(group_by, selection)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from None
+    return CrimeCubeResponse(
+        dimensions=group_by,
+        labels=labels,
+        counts=counts.tolist(),
+        total=int(counts.sum()),
+        version=cube.version,
+    )
+
+@app.get("/crime/cube/dimensions")
+def crime_cube_dimensions():
+    cube = _current_crime_cube()
+    return {
+        "version": cube.version,
+        "labels": {d: cube.labels(d) for d in DIMENSIONS},
+    }
+
+@app.get("/crime/nearby", response_model=CrimeNearbyResponse)
+def crime_nearby(
+    lat: float = Query(ge=-90, le=90),
+    lon: float = Query(ge=-180, le=180),
+    radius_m: float = Query(default=500.0, gt=0),
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+):
+    if radius_m > CRIME_MAX_RADIUS_M:
+        raise HTTPException(
+            status_code=422,
+            detail=f"radius_m may be at most {CRIME_MAX_RADIUS_M:g}.",
+        )
+    index = _current_crime_index()
+    window = _time_window(start, end)
+    nearby = index.count_within(lat, lon, radius_m, *window)
+    return CrimeNearbyResponse(
+        lat=lat,
+        lon=lon,
+        radius_m=radius_m,
+        start=start,
+        end=end,
+        total=nearby.total,
+        counts=nearby.counts,
+        version=index.version,
+    )
+
+@app.get("/crime/nearest", response_model=CrimeNearestResponse)
+def crime_nearest(
+    lat: float = Query(ge=-90, le=90),
+    lon: float = Query(ge=-180, le=180),
+    k: int = Query(default=10, ge=1),
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+):
+    if k > CRIME_MAX_NEAREST:
+        raise HTTPException(
+            status_code=422, detail=f"k may be at most {CRIME_MAX_NEAREST}."
+        )
+    index = _current_crime_index()
+    window = _time_window(start, end)
+    return CrimeNearestResponse(
+        lat=lat,
+        lon=lon,
+        incidents=index.nearest(lat, lon, k, *window),
+        version=index.version,
+    )
@@ -0,0 +1,265 @@
+"""Small in-process metric primitives shared by the price API helpers.
+
+``MetricsRegistry`` names and labels histograms and renders everything in
+the Prometheus text exposition format for ``GET /metrics``. Observing costs
+one bisect and one uncontended lock, cheap enough to leave on under load.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left
+from threading import Lock
+from typing import (
+    Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+)
+
+import math
+import time
+
+# Upper bounds in seconds, from 50us (cache hits, scaling one row) up to
+# whole-request latencies.
+LATENCY_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+)
+
+# (name, type, description, labels, value)
+Sample = Tuple[str, str, str, Dict[str, str], float]
+
+
+class Histogram:
+    """Fixed-bucket histogram with cumulative counts.
+
+    Buckets are upper bounds (inclusive); an implicit ``+Inf`` bucket
+    catches everything above the last bound.
+    """
+
+    def __init__(
+        self, name: str, buckets: Sequence[float], description: str = ""
+    ) -> None:
+        bounds = sorted(float(b) for b in buckets)
+        if not bounds:
+            raise ValueError("buckets must contain at least one bound")
+        self.name = name
+        self.description = description
+        self._bounds: List[float] = bounds
+        self._counts: List[int] = [0] * (len(bounds) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = Lock()
+
+    def observe(self, value: float) -> None:
+        idx = bisect_left(self._bounds, value)
+        with self._lock:
+            self._counts[idx] += 1
+            self._sum += value
+            self._count += 1
+
+    def state(self) -> Tuple[List[float], List[int], float, int]:
+        """Bounds, per-bucket counts, sum and count, read consistently."""
+        with self._lock:
+            return self._bounds, list(self._counts), self._sum, self._count
+
+    def quantile(self, q: float) -> float:
+        """Approximate quantile using the upper bound of the matching bucket."""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._count
+        if total == 0:
+            return 0.0
+        target = q * total
+        running = 0
+        for bound, count in zip(self._bounds + [math.inf], counts):
+            running += count
+            if running >= target:
+                return bound
+        return math.inf
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = list(self._counts)
+            total_sum = self._sum
+            total = self._count
+        cumulative: Dict[str, int] = {}
+        running = 0
+        for bound, count in zip(self._bounds, counts):
+            running += count
+            cumulative[repr(bound)] = running
+        cumulative["+Inf"] = total
+        return {
+            "count": total,
+            "sum": total_sum,
+            "buckets": cumulative,
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+class Timer:
+    """``with timer:`` observes the elapsed wall time on exit."""
+
+    __slots__ = ("histogram", "_started")
+
+    def __init__(self, histogram: Histogram) -> None:
+        self.histogram = histogram
+
+    def __enter__(self) -> "Timer":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.histogram.observe(time.perf_counter() - self._started)
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    parts = []
+    for key, value in labels.items():
+        escaped = (
+            str(value)
+            .replace("\\", "\\\\")
+            .replace("\n", "\\n")
+            .replace('"', '\\"')
+        )
+        parts.append(f'{key}="{escaped}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+class MetricsRegistry:
+    """Labelled histograms plus collector callbacks, rendered on demand."""
+
+    def __init__(self) -> None:
+        self._families: Dict[str, Tuple[str, Dict[Tuple, Histogram]]] = {}
+        self._collectors: List[Callable[[], Iterable[Sample]]] = []
+        self._lock = Lock()
+
+    def histogram(
+        self,
+        name: str,
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+        description: str = "",
+        **labels: str,
+    ) -> Histogram:
+        """The histogram for ``name`` and ``labels``, created on first use."""
+        key = tuple(sorted(labels.items()))
+        family = self._families.get(name)
+        if family is not None:
+            found = family[1].get(key)
+            if found is not None:
+                return found
+        with self._lock:
+            family = self._families.setdefault(name, (description, {}))
+            found = family[1].get(key)
+            if found is None:
+                found = Histogram(name, buckets, description)
+                family[1][key] = found
+            return found
+
+    def register(self, histogram: Histogram, **labels: str) -> Histogram:
+        """Expose a histogram created elsewhere (e.g. by the batcher)."""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            family = self._families.setdefault(
+                histogram.name, (histogram.description, {})
+            )
+            family[1][key] = histogram
+        return histogram
+
+    def add_collector(self, collect: Callable[[], Iterable[Sample]]) -> None:
+        """``collect`` is called at render time for gauges and counters."""
+        self._collectors.append(collect)
+
+    def render(self) -> str:
+        """Everything in the Prometheus text exposition format (0.0.4)."""
+        lines: List[str] = []
+        with self._lock:
+            families = {
+                name: (description, dict(series))
+                for name, (description, series) in self._families.items()
+            }
+        for name, (description, series) in sorted(families.items()):
+            if description:
+                lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} histogram")
+            for key, histogram in sorted(series.items()):
+                labels = dict(key)
+                bounds, counts, total_sum, total = histogram.state()
+                running = 0
+                for bound, count in zip(bounds, counts):
+                    running += count
+                    bucket_labels = _format_labels(
+                        {**labels, "le": _format_value(bound)}
+                    )
+                    lines.append(f"{name}_bucket{bucket_labels} {running}")
+                inf_labels = _format_labels({**labels, "le": "+Inf"})
+                lines.append(f"{name}_bucket{inf_labels} {total}")
+                lines.append(
+                    f"{name}_sum{_format_labels(labels)} "
+                    f"{_format_value(total_sum)}"
+                )
+                lines.append(f"{name}_count{_format_labels(labels)} {total}")
+
+        seen = set()
+        for collect in self._collectors:
+            for name, kind, description, labels, value in collect():
+                if name not in seen:
+                    seen.add(name)
+                    if description:
+                        lines.append(f"# HELP {name} {description}")
+                    lines.append(f"# TYPE {name} {kind}")
+                lines.append(
+                    f"{name}{_format_labels(labels)} {_format_value(value)}"
+                )
+        return "\n".join(lines) + "\n"
+
+
+class RequestTimer:
+    """ASGI middleware observing each HTTP request's latency per route.
+
+    The route label is the matched path template (``/crime/nearby``, not
+    the query string), or ``unmatched``, so label cardinality stays bounded.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        registry: MetricsRegistry,
+        name: str = "price_http_request_seconds",
+    ) -> None:
+        self.app = app
+        self.registry = registry
+        self.name = name
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message: Dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route: Optional[Any] = scope.get("route")
+            self.registry.histogram(
+                self.name,
+                LATENCY_BUCKETS,
+                "HTTP request latency by route, method and status.",
+                route=getattr(route, "path", "unmatched"),
+                method=scope.get("method", ""),
+                status=str(status),
+            ).observe(time.perf_counter() - started)
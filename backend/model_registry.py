@@ -0,0 +1,612 @@
+"""Versioned price model bundles, loaded and swapped in the background.
+
+A registry directory holds one sub-directory per model version::
+
+    <root>/
+      2026-10-01/                  any name; versions sort by name
+        bundle.json                optional: file names and model kind
+        best_price_model.pkl
+        scaler_price_features.pkl
+        scaler_numeric_columns.pkl
+      CURRENT                      optional: the version to serve
+
+Without ``CURRENT`` the newest version is served. ``ModelRegistry`` polls
+the directory from a daemon thread; when the version to serve changes it
+loads the new bundle and warms it with a few predictions before handing it
+to ``activate``. Requests keep using the old version until then, so a
+retrained model never costs a restart or a cold first request.
+
+In shadow mode a newer version that ``CURRENT`` does not name yet is loaded
+as a candidate instead. ``ShadowMonitor`` scores a sampled fraction of live
+requests on it, off the request path, and reports its latency and how far
+its predictions drift from the served model. Writing its name to
+``CURRENT`` promotes it without loading it again.
+
+``python model_registry.py publish`` copies a bundle in atomically.
+"""
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import hashlib
+import json
+import logging
+import random
+import shutil
+import threading
+import time
+
+from metrics import LATENCY_BUCKETS, Histogram, Sample
+
+logger = logging.getLogger("uvicorn.error")
+
+BUNDLE_FILE = "bundle.json"
+CURRENT_FILE = "CURRENT"
+DEFAULT_FILES = {
+    "model": "best_price_model.pkl",
+    "scaler": "scaler_price_features.pkl",
+    "numeric_columns": "scaler_numeric_columns.pkl",
+}
+# "sklearn": a joblib-pickled estimator; "price_regression": any file
+# ``PriceRegressionModel.load`` reads.
+MODEL_KINDS = ("sklearn", "price_regression")
+
+LoadFn = Callable[["ArtifactBundle"], Any]
+ScoreFn = Callable[[Any, List[Dict[str, Any]]], Sequence[float]]
+
+
+def fingerprint(*paths: Path) -> str:
+    """Identify a set of artifact files by name, size and modification time."""
+    digest = hashlib.sha1()
+    for path in paths:
+        stat = path.stat()
+        token = f"{path.name}:{stat.st_size}:{stat.st_mtime_ns};"
+        digest.update(token.encode())
+    return digest.hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class ArtifactBundle:
+    """Model, scaler and numeric column list that are served together."""
+    name: str
+    model_path: Path
+    scaler_path: Path
+    numeric_cols_path: Path
+    kind: str = "sklearn"
+
+    @classmethod
+    def from_directory(cls, directory: Union[str, Path]) -> "ArtifactBundle":
+        directory = Path(directory)
+        spec: Dict[str, str] = {**DEFAULT_FILES, "kind": "sklearn"}
+        manifest = directory / BUNDLE_FILE
+        if manifest.exists():
+            spec.update(json.loads(manifest.read_text(encoding="utf-8")))
+        if spec["kind"] not in MODEL_KINDS:
+            raise ValueError(
+                f"{manifest}: kind must be one of {', '.join(MODEL_KINDS)}"
+            )
+        return cls(
+            name=directory.name,
+            model_path=directory / spec["model"],
+            scaler_path=directory / spec["scaler"],
+            numeric_cols_path=directory / spec["numeric_columns"],
+            kind=spec["kind"],
+        )
+
+    @property
+    def paths(self) -> Tuple[Path, Path, Path]:
+        return self.model_path, self.scaler_path, self.numeric_cols_path
+
+    def fingerprint(self) -> str:
+        return fingerprint(*self.paths)
+
+
+def discover_bundles(root: Union[str, Path]) -> List[ArtifactBundle]:
+    """Complete bundles under ``root``, oldest first.
+
+    Hidden directories (``publish`` stages into one) and bundles with
+    missing files or an unreadable ``bundle.json`` are skipped.
+    """
+    bundles = []
+    root = Path(root)
+    if not root.is_dir():
+        return bundles
+    for directory in sorted(root.iterdir()):
+        if not directory.is_dir() or directory.name.startswith("."):
+            continue
+        try:
+            bundle = ArtifactBundle.from_directory(directory)
+        except (ValueError, OSError) as exc:
+            logger.warning("Skipping model bundle %s: %s", directory, exc)
+            continue
+        if all(path.is_file() for path in bundle.paths):
+            bundles.append(bundle)
+    return bundles
+
+
+class ShadowMonitor:
+    """Score a sample of live requests on a candidate model.
+
+    ``offer`` is called on the request path after the served prediction is
+    known; sampled rows are scored by ``score`` on one background thread, so
+    the candidate never adds latency. At most ``max_pending`` rows wait to
+    be scored; the rest are dropped and counted.
+
+    Args:
+        fraction: Share of offered rows to score, in ``(0, 1]``.
+        score: Callable taking ``(loaded_candidate, rows)`` and returning
+            one prediction per row.
+        max_pending: Queue bound for rows waiting to be scored.
+    """
+
+    def __init__(
+        self, fraction: float, score: ScoreFn, max_pending: int = 64
+    ) -> None:
+        if not 0.0 < fraction <= 1.0:
+            raise ValueError("fraction must be in (0, 1]")
+        self.fraction = fraction
+        self.max_pending = max_pending
+        self._score = score
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="price-shadow"
+        )
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._candidate: Optional[Tuple[str, Any]] = None
+        self._reset(None)
+
+    def _reset(self, name: Optional[str]) -> None:
+        self._name = name
+        self._latency = Histogram(
+            "price_shadow_seconds",
+            LATENCY_BUCKETS,
+            "Time the shadow candidate took to score one row.",
+        )
+        self._samples = self._dropped = self._errors = 0
+        self._sum_diff = self._sum_abs_diff = self._sum_abs_rel = 0.0
+        self._max_abs_diff = 0.0
+
+    def set_candidate(self, name: Optional[str], loaded: Any = None) -> None:
+        """Start comparing against ``loaded``; ``None`` stops shadowing."""
+        with self._lock:
+            self._candidate = (name, loaded) if name is not None else None
+            self._reset(name)
+
+    def offer(self, row: Dict[str, Any], served: float) -> bool:
+        """Maybe queue ``row`` for the candidate; True if it was queued."""
+        candidate = self._candidate
+        if candidate is None or random.random() >= self.fraction:
+            return False
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._dropped += 1
+                return False
+            self._pending += 1
+        self._executor.submit(self._run, candidate, row, served)
+        return True
+
+    def _run(
+        self, candidate: Tuple[str, Any], row: Dict[str, Any], served: float
+    ) -> None:
+        name, loaded = candidate
+        try:
+            started = time.perf_counter()
+            predicted = float(self._score(loaded, [row])[0])
+            elapsed = time.perf_counter() - started
+        except Exception:
+            logger.exception("Shadow model %s failed to score a row", name)
+            with self._lock:
+                self._pending -= 1
+                if self._name == name:
+                    self._errors += 1
+            return
+        diff = predicted - served
+        with self._lock:
+            self._pending -= 1
+            if self._name != name:
+                return
+            self._latency.observe(elapsed)
+            self._samples += 1
+            self._sum_diff += diff
+            self._sum_abs_diff += abs(diff)
+            self._sum_abs_rel += abs(diff) / max(abs(served), 1.0)
+            self._max_abs_diff = max(self._max_abs_diff, abs(diff))
+
+    def report(self) -> Dict[str, Any]:
+        """Latency and drift of the candidate against the served model.
+
+        ``mean_diff`` is candidate minus served, so a positive value means
+        the candidate prices higher.
+        """
+        with self._lock:
+            n = self._samples
+            drift = {
+                "mean_diff": self._sum_diff / n if n else None,
+                "mean_abs_diff": self._sum_abs_diff / n if n else None,
+                "mean_abs_pct_diff": 100.0 * self._sum_abs_rel / n
+                if n
+                else None,
+                "max_abs_diff": self._max_abs_diff if n else None,
+            }
+            return {
+                "candidate": self._name,
+                "fraction": self.fraction,
+                "samples": n,
+                "dropped": self._dropped,
+                "errors": self._errors,
+                "pending": self._pending,
+                "drift": drift,
+                "latency_seconds": self._latency.snapshot(),
+            }
+
+    def samples(self) -> List[Sample]:
+        """Counters and drift gauges for ``MetricsRegistry.add_collector``."""
+        report = self.report()
+        if report["candidate"] is None:
+            return []
+        labels = {"candidate": report["candidate"]}
+        samples: List[Sample] = [
+            (
+                f"price_shadow_{name}_total",
+                "counter",
+                f"Shadow rows {name}.",
+                labels,
+                report[name],
+            )
+            for name in ("samples", "dropped", "errors")
+        ]
+        for name, value in report["drift"].items():
+            if value is not None:
+                samples.append(
+                    (
+                        f"price_shadow_{name}",
+                        "gauge",
+                        "Candidate minus served prediction.",
+                        labels,
+                        value,
+                    )
+                )
+        return samples
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+class _KnownFailure(RuntimeError):
+    """A bundle that already failed with these exact files."""
+
+
+class ModelRegistry:
+    """Discover artifact bundles and keep the right one served.
+
+    Args:
+        root: Registry directory, or ``None`` to serve only ``fallback``.
+        load: Builds the serving object for a bundle; may be slow.
+        activate: Makes a loaded, warmed bundle the served one. Called from
+            the registry thread; it must only swap a reference.
+        warm: Runs sample predictions on a freshly loaded bundle and raises
+            if they fail, which rejects the bundle.
+        fallback: Served when ``root`` holds no bundle.
+        poll_seconds: Interval between directory checks in ``start``.
+        shadow: Enables shadow mode for versions newer than the served one.
+    """
+
+    def __init__(
+        self,
+        root: Optional[Union[str, Path]],
+        load: LoadFn,
+        activate: Callable[[Any], None],
+        *,
+        warm: Optional[Callable[[Any], None]] = None,
+        fallback: Optional[ArtifactBundle] = None,
+        poll_seconds: float = 30.0,
+        shadow: Optional[ShadowMonitor] = None,
+    ) -> None:
+        self.root = Path(root) if root is not None else None
+        self.poll_seconds = poll_seconds
+        self.shadow = shadow
+        self._load_fn = load
+        self._activate = activate
+        self._warm = warm
+        self._fallback = fallback
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # (bundle, fingerprint) of what is served and shadowed.
+        self._active: Optional[Tuple[ArtifactBundle, str]] = None
+        self._candidate: Optional[Tuple[ArtifactBundle, str, Any]] = None
+        self._failed: Dict[Tuple[str, str], str] = {}
+        self._last_check: Optional[float] = None
+
+    def bundles(self) -> List[ArtifactBundle]:
+        found = discover_bundles(self.root) if self.root is not None else []
+        if not found and self._fallback is not None:
+            return [self._fallback]
+        return found
+
+    def pinned(self) -> Optional[str]:
+        """Version named in ``CURRENT``, if any."""
+        if self.root is None:
+            return None
+        try:
+            name = (self.root / CURRENT_FILE).read_text().strip()
+        except FileNotFoundError:
+            return None
+        return name or None
+
+    def target(self) -> ArtifactBundle:
+        """The bundle that should be served now."""
+        bundles = self.bundles()
+        if not bundles:
+            raise FileNotFoundError(f"No model bundles found in {self.root}")
+        by_name = {bundle.name: bundle for bundle in bundles}
+        pinned = self.pinned()
+        if pinned is not None:
+            if pinned in by_name:
+                return by_name[pinned]
+            logger.warning("%s names unknown version %r", CURRENT_FILE, pinned)
+        if self.shadow is not None and self._active is not None:
+            # New versions only reach traffic through CURRENT.
+            active = by_name.get(self._active[0].name)
+            if active is not None:
+                return active
+        return bundles[-1]
+
+    def check(self) -> None:
+        """Bring the served (and shadowed) versions up to date.
+
+        Raises if nothing is served yet and the target fails to load, so a
+        broken first deploy is reported; later failures are logged, kept
+        in ``status()`` and retried only once the files change.
+        """
+        with self._lock:
+            self._last_check = time.time()
+            target = self.target()
+            self._ensure_active(target)
+            if self.shadow is not None:
+                newest = self.bundles()[-1]
+                active = self._active[0]
+                self._ensure_candidate(
+                    newest if newest.name != active.name else None
+                )
+
+    def _load(self, bundle: ArtifactBundle, version: str) -> Any:
+        key = (bundle.name, version)
+        if key in self._failed:
+            raise _KnownFailure(self._failed[key])
+        started = time.perf_counter()
+        try:
+            loaded = self._load_fn(bundle)
+            if self._warm is not None:
+                self._warm(loaded)
+        except Exception as exc:
+            self._failed[key] = repr(exc)
+            raise
+        logger.info(
+            "Model bundle %s (%s) loaded and warmed in %.2fs",
+            bundle.name, version, time.perf_counter() - started,
+        )
+        return loaded
+
+    def _ensure_active(self, bundle: ArtifactBundle) -> None:
+        version = bundle.fingerprint()
+        active = self._active
+        if active is not None and (
+            active[0].name == bundle.name and active[1] == version
+        ):
+            return
+        candidate = self._candidate
+        if candidate is not None and (
+            candidate[0].name == bundle.name and candidate[1] == version
+        ):
+            loaded = candidate[2]
+            self._set_candidate(None)
+        else:
+            try:
+                loaded = self._load(bundle, version)
+            except Exception as exc:
+                if self._active is None:
+                    raise
+                if isinstance(exc, _KnownFailure):
+                    return
+                logger.exception(
+                    "Keeping model %s; %s failed to load",
+                    self._active[0].name, bundle.name,
+                )
+                return
+        self._activate(loaded)
+        self._active = (bundle, version)
+
+    def _ensure_candidate(self, bundle: Optional[ArtifactBundle]) -> None:
+        if bundle is None:
+            if self._candidate is not None:
+                self._set_candidate(None)
+            return
+        version = bundle.fingerprint()
+        candidate = self._candidate
+        if candidate is not None and (
+            candidate[0].name == bundle.name and candidate[1] == version
+        ):
+            return
+        try:
+            loaded = self._load(bundle, version)
+        except Exception as exc:
+            if not isinstance(exc, _KnownFailure):
+                logger.exception(
+                    "Shadow candidate %s failed to load", bundle.name
+                )
+            self._set_candidate(None)
+            return
+        self._set_candidate((bundle, version, loaded))
+
+    def _set_candidate(
+        self, candidate: Optional[Tuple[ArtifactBundle, str, Any]]
+    ) -> None:
+        self._candidate = candidate
+        if candidate is None:
+            self.shadow.set_candidate(None)
+        else:
+            self.shadow.set_candidate(candidate[0].name, candidate[2])
+
+    def start(self) -> None:
+        """Poll for new versions every ``poll_seconds`` on a daemon thread."""
+        if self._thread is not None or self.poll_seconds <= 0:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._poll, name="price-model-registry", daemon=True
+        )
+        self._thread.start()
+
+    def _poll(self) -> None:
+        while not self._stop.wait(self.poll_seconds):
+            try:
+                self.check()
+            except Exception:
+                logger.exception("Model registry check failed")
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if self.shadow is not None:
+            self.shadow.close()
+
+    def status(self) -> Dict[str, Any]:
+        active, candidate = self._active, self._candidate
+        status: Dict[str, Any] = {
+            "root": str(self.root) if self.root is not None else None,
+            "versions": [
+                {"name": bundle.name, "kind": bundle.kind}
+                for bundle in self.bundles()
+            ],
+            "pinned": self.pinned(),
+            "active": (
+                {"name": active[0].name, "version": active[1]}
+                if active is not None
+                else None
+            ),
+            "candidate": (
+                {"name": candidate[0].name, "version": candidate[1]}
+                if candidate is not None
+                else None
+            ),
+            "failed": [
+                {"name": name, "version": version, "error": error}
+                for (name, version), error in self._failed.items()
+            ],
+            "poll_seconds": self.poll_seconds,
+            "last_check": self._last_check,
+        }
+        if self.shadow is not None:
+            status["shadow"] = self.shadow.report()
+        return status
+
+
+def publish(
+    root: Union[str, Path],
+    name: str,
+    model: Union[str, Path],
+    scaler: Union[str, Path],
+    numeric_columns: Union[str, Path],
+    kind: str = "sklearn",
+    current: bool = False,
+) -> ArtifactBundle:
+    """Copy artifact files into ``root/name`` as one bundle.
+
+    Files are staged in a hidden directory and renamed into place, so a
+    polling registry never sees a half-copied bundle. With ``current`` the
+    new version is also written to ``CURRENT``.
+    """
+    if kind not in MODEL_KINDS:
+        raise ValueError(f"kind must be one of {', '.join(MODEL_KINDS)}")
+    if not name or name.startswith(".") or "/" in name:
+        raise ValueError(f"Invalid version name: {name!r}")
+    root = Path(root)
+    final = root / name
+    if final.exists():
+        raise FileExistsError(f"{final} already exists")
+    staging = root / f".{name}.staging"
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+    files = {
+        "model": model,
+        "scaler": scaler,
+        "numeric_columns": numeric_columns,
+    }
+    manifest: Dict[str, Any] = {"kind": kind, "published": time.time()}
+    for key, source in files.items():
+        source = Path(source)
+        shutil.copy2(source, staging / source.name)
+        manifest[key] = source.name
+    (staging / BUNDLE_FILE).write_text(json.dumps(manifest, indent=2))
+    staging.rename(final)
+    if current:
+        set_current(root, name)
+    return ArtifactBundle.from_directory(final)
+
+
+def set_current(root: Union[str, Path], name: str) -> None:
+    """Point ``CURRENT`` at ``name`` with an atomic rename."""
+    root = Path(root)
+    pointer = root / f".{CURRENT_FILE}.tmp"
+    pointer.write_text(name + "\n")
+    pointer.replace(root / CURRENT_FILE)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("root", type=Path, help="registry directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="show bundles and the served version")
+    add = commands.add_parser("publish", help="copy a bundle in atomically")
+    add.add_argument("name", help="version name, e.g. 2026-10-16")
+    add.add_argument("--model", type=Path, required=True)
+    add.add_argument("--scaler", type=Path, required=True)
+    add.add_argument("--numeric-columns", type=Path, required=True)
+    add.add_argument("--kind", choices=MODEL_KINDS, default="sklearn")
+    add.add_argument(
+        "--current", action="store_true", help="also write it to CURRENT"
+    )
+    promote = commands.add_parser("promote", help="write a version to CURRENT")
+    promote.add_argument("name")
+    args = parser.parse_args(argv)
+
+    if args.command == "publish":
+        bundle = publish(
+            args.root,
+            args.name,
+            args.model,
+            args.scaler,
+            args.numeric_columns,
+            kind=args.kind,
+            current=args.current,
+        )
+        print(
+            f"Published {bundle.name} ({bundle.fingerprint()}) "
+            f"to {args.root}"
+        )
+    elif args.command == "promote":
+        names = {bundle.name for bundle in discover_bundles(args.root)}
+        if args.name not in names:
+            parser.error(f"unknown version {args.name!r}")
+        set_current(args.root, args.name)
+        print(f"{args.name} is now CURRENT in {args.root}")
+    else:
+        pinned = ModelRegistry(args.root, None, None).pinned()
+        for bundle in discover_bundles(args.root):
+            marker = "*" if bundle.name == pinned else " "
+            print(
+                f"{marker} {bundle.name}  {bundle.kind}  "
+                f"{bundle.fingerprint()}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""Bounded LRU + TTL cache for single-house price predictions.
+
+Entries are keyed on the canonicalized ``PriceRequest`` fields and tagged
+with the version of the loaded artifacts; the first lookup made under a new
+version (or a ``set_version`` call when new artifacts are swapped in) drops
+everything cached for the old model/scaler. Requests still running under a
+replaced version neither read nor write entries, so they cannot flip the
+cache back to it.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from threading import Lock
+from typing import (
+    Any, Callable, Dict, Hashable, List, Optional, Sequence, Set, Tuple
+)
+
+import time
+
+
+def canonical_key(
+    row: Dict[str, Any], fields: Sequence[str]
+) -> Tuple[Hashable, ...]:
+    """Build a hashable key with one normalized value per field.
+
+    Integral floats collapse onto ints (``3.0`` and ``3`` share an entry) and
+    ``-0.0`` becomes ``0``, so equivalent requests hit the same slot.
+    """
+    key = []
+    for name in fields:
+        value = row[name]
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        key.append(value)
+    return tuple(key)
+
+
+class PredictionCache:
+    """Thread-safe LRU cache with a per-entry time-to-live.
+
+    Args:
+        max_size: Maximum number of entries; the least recently used entry
+            is evicted once the cache is full.
+        ttl_seconds: Lifetime of an entry. ``None`` or ``0`` disables expiry.
+        clock: Monotonic time source, overridable for tests.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 4096,
+        ttl_seconds: Optional[float] = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds or None
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, float]]" = (
+            OrderedDict()
+        )
+        self._version: Optional[str] = None
+        self._retired: Set[str] = set()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.stale_writes = 0
+        self._miss_cost_total = 0.0
+        self._miss_cost_count = 0
+
+    def _switch(self, version: str) -> None:
+        # Caller holds the lock.
+        if self._version is not None:
+            self._retired.add(self._version)
+        self._retired.discard(version)
+        if self._entries:
+            self.invalidations += 1
+        self._entries.clear()
+        self._version = version
+
+    def _current(self, version: str) -> bool:
+        """Whether a lookup under ``version`` may use the cache.
+
+        A version never seen before replaces the current one; a retired
+        one is bypassed. Caller holds the lock.
+        """
+        if version == self._version:
+            return True
+        if version in self._retired:
+            return False
+        self._switch(version)
+        return True
+
+    def set_version(self, version: str) -> None:
+        """Make ``version`` current, e.g. when artifacts are swapped in.
+
+        Unlike a lookup, this also brings back a retired version (a
+        rollback).
+        """
+        with self._lock:
+            if version != self._version:
+                self._switch(version)
+
+    def get(self, key: Hashable, version: str) -> Optional[float]:
+        now = self._clock()
+        with self._lock:
+            entry = (
+                self._entries.get(key) if self._current(version) else None
+            )
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            if self.ttl_seconds is not None and now >= expires_at:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def get_many(
+        self, keys: Sequence[Hashable], version: str
+    ) -> List[Optional[float]]:
+        """``get`` for many keys under one lock acquisition."""
+        now = self._clock()
+        values: List[Optional[float]] = []
+        with self._lock:
+            current = self._current(version)
+            for key in keys:
+                entry = self._entries.get(key) if current else None
+                if entry is not None and (
+                    self.ttl_seconds is not None and now >= entry[1]
+                ):
+                    del self._entries[key]
+                    self.expirations += 1
+                    entry = None
+                if entry is None:
+                    self.misses += 1
+                    values.append(None)
+                    continue
+                self._entries.move_to_end(key)
+                self.hits += 1
+                values.append(entry[0])
+        return values
+
+    def put(
+        self,
+        key: Hashable,
+        value: float,
+        version: str,
+        cost_seconds: Optional[float] = None,
+    ) -> None:
+        """Store ``value``; ``cost_seconds`` is how long computing it took.
+
+        Dropped unless ``version`` is the current one: a result computed
+        by a model that has since been replaced must not be served.
+        """
+        expires_at = (
+            self._clock() + self.ttl_seconds
+            if self.ttl_seconds is not None
+            else float("inf")
+        )
+        with self._lock:
+            if self._version is None:
+                self._version = version
+            elif version != self._version:
+                self.stale_writes += 1
+                return
+            if cost_seconds is not None:
+                self._miss_cost_total += cost_seconds
+                self._miss_cost_count += 1
+            self._entries[key] = (float(value), expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def put_many(
+        self,
+        items: Sequence[Tuple[Hashable, float]],
+        version: str,
+        cost_seconds: Optional[float] = None,
+    ) -> None:
+        """``put`` for many entries; ``cost_seconds`` covers all of them."""
+        if not items:
+            return
+        expires_at = (
+            self._clock() + self.ttl_seconds
+            if self.ttl_seconds is not None
+            else float("inf")
+        )
+        with self._lock:
+            if self._version is None:
+                self._version = version
+            elif version != self._version:
+                self.stale_writes += len(items)
+                return
+            if cost_seconds is not None:
+                self._miss_cost_total += cost_seconds
+                self._miss_cost_count += len(items)
+            for key, value in items:
+                self._entries[key] = (float(value), expires_at)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            mean_miss_cost = (
+                self._miss_cost_total / self._miss_cost_count
+                if self._miss_cost_count
+                else 0.0
+            )
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "version": self._version,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "stale_writes": self.stale_writes,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "mean_miss_seconds": mean_miss_cost,
+                "estimated_saved_seconds": self.hits * mean_miss_cost,
+            }
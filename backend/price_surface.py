@@ -0,0 +1,228 @@
+"""Predicted prices for every map ZIP across a grid of typical houses.
+
+The map colours each ZIP polygon by a predicted price, which used to take
+one ``/predict_price`` call per ZIP per configuration. ``build_surface``
+instead expands every ZIP x configuration into one frame, scores it with a
+single model call and stores the result as a small whole-dollar table::
+
+    surface.npy     int32, shape (n_zipcodes, *axis sizes)
+    manifest.json   ZIP labels, axis values, base house, model version
+
+The table is keyed on the model artifact version and the grid, so it is
+recomputed only when either changes. ``GET /price_surface`` serves the
+stored table with an ETag and never touches the model.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+import hashlib
+import itertools
+import json
+
+import numpy as np
+import pandas as pd
+
+from array_store import (
+    read_store,
+    save_array,
+    staged_directory,
+    write_manifest,
+)
+from zip_index import GEOJSON_PATH, ZIP_PROPERTY
+
+STORE_FORMAT_VERSION = 1
+SURFACE_DIR = Path(__file__).resolve().parent / "artifacts" / "price_surface"
+
+# The price form's starting values; the axes below vary from here.
+BASE_HOUSE: Dict[str, float] = {
+    "GROSS_AREA": 2000,
+    "LIVING_AREA": 1500,
+    "BED_RMS": 3,
+    "FULL_BTH": 2,
+    "HLF_BTH": 1,
+    "NUM_PARKING": 1,
+    "KITCHENS": 1,
+    "FIREPLACES": 0,
+    "KITCHEN_TYPE": 1,
+    "HEAT_TYPE": 0,
+    "AC_TYPE": -1,
+}
+SURFACE_AXES: Dict[str, List[float]] = {
+    "LIVING_AREA": [800, 1200, 1600, 2000, 2500, 3000],
+    "BED_RMS": [1, 2, 3, 4, 5],
+    "FULL_BTH": [1, 2, 3],
+}
+# GROSS_AREA follows LIVING_AREA at the base house's ratio unless it is an
+# axis itself, so a 3000 sq ft house does not sit on a 2000 sq ft footprint.
+GROSS_TO_LIVING = BASE_HOUSE["GROSS_AREA"] / BASE_HOUSE["LIVING_AREA"]
+
+PredictFrame = Callable[[Any], np.ndarray]
+
+
+def map_zipcodes(path: Union[str, Path] = GEOJSON_PATH) -> List[int]:
+    """Distinct ZIP codes of the map polygons, as the model's integers."""
+    with Path(path).open(encoding="utf-8") as f:
+        features = json.load(f)["features"]
+    return sorted(
+        {int(feature["properties"][ZIP_PROPERTY]) for feature in features}
+    )
+
+
+def grid_key(
+    zipcodes: Sequence[int],
+    axes: Dict[str, Sequence[float]],
+    base: Dict[str, float],
+) -> str:
+    payload = json.dumps([list(zipcodes), axes, base], sort_keys=True)
+    return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+
+def surface_frame(
+    zipcodes: Sequence[int],
+    axes: Dict[str, Sequence[float]],
+    base: Dict[str, float],
+    columns: Sequence[str],
+) -> Any:
+    """One row per ZIP x axis combination, ZIP-major, in ``columns`` order."""
+    names = list(axes)
+    combos = np.array(list(itertools.product(*axes.values())), dtype=float)
+    combos = combos.reshape(-1, len(names))
+    n_combos = combos.shape[0]
+    data: Dict[str, np.ndarray] = {
+        "ZIPCODE": np.repeat(np.asarray(zipcodes, dtype=np.int64), n_combos)
+    }
+    for column in columns:
+        if column == "ZIPCODE":
+            continue
+        if column in names:
+            values = combos[:, names.index(column)]
+        elif column == "GROSS_AREA" and "LIVING_AREA" in names:
+            values = np.round(
+                combos[:, names.index("LIVING_AREA")] * GROSS_TO_LIVING
+            )
+        else:
+            values = np.full(n_combos, base[column], dtype=float)
+        data[column] = np.tile(values, len(zipcodes))
+    return pd.DataFrame(data, columns=list(columns))
+
+
+@dataclass(frozen=True)
+class PriceSurface:
+    manifest: Dict[str, Any]
+    prices: np.ndarray
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.manifest["version"]}"'
+
+    def to_json(self) -> bytes:
+        """The response body; built once per surface and reused."""
+        payload = {
+            key: self.manifest[key]
+            for key in ("version", "model_version", "zipcodes", "axes", "base")
+        }
+        payload["dimensions"] = ["ZIPCODE", *self.manifest["axes"]]
+        payload["prices"] = self.prices.tolist()
+        return json.dumps(payload, separators=(",", ":")).encode()
+
+
+def load_surface(surface_dir: Union[str, Path] = SURFACE_DIR) -> PriceSurface:
+    surface_dir = Path(surface_dir)
+
+    def load(manifest: Dict[str, Any]) -> np.ndarray:
+        if manifest.get("format_version") != STORE_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported price surface format in {surface_dir}"
+            )
+        return np.load(surface_dir / "surface.npy")
+
+    return PriceSurface(*read_store(surface_dir, load))
+
+
+def build_surface(
+    predict_frame: PredictFrame,
+    model_version: str,
+    columns: Sequence[str],
+    surface_dir: Union[str, Path] = SURFACE_DIR,
+    zipcodes: Optional[Sequence[int]] = None,
+    axes: Optional[Dict[str, Sequence[float]]] = None,
+    base: Optional[Dict[str, float]] = None,
+    force: bool = False,
+) -> PriceSurface:
+    """Load the stored surface, recomputing it if the model or grid changed.
+
+    ``predict_frame`` is called once, with every ZIP x configuration row.
+    """
+    surface_dir = Path(surface_dir)
+    zipcodes = list(map_zipcodes() if zipcodes is None else zipcodes)
+    axes = {name: list(values) for name, values in (axes or SURFACE_AXES).items()}
+    base = dict(BASE_HOUSE if base is None else base)
+    unknown = [name for name in axes if name not in columns]
+    if unknown:
+        raise ValueError(f"Unknown surface axes: {unknown}")
+    key = grid_key(zipcodes, axes, base)
+    if not force:
+        try:
+            stored = load_surface(surface_dir)
+        except (FileNotFoundError, ValueError):
+            stored = None
+        if (
+            stored is not None
+            and stored.manifest["model_version"] == model_version
+            and stored.manifest["grid_key"] == key
+        ):
+            return stored
+
+    frame = surface_frame(zipcodes, axes, base, columns)
+    predictions = np.asarray(predict_frame(frame), dtype=np.float64)
+    shape = (len(zipcodes), *(len(values) for values in axes.values()))
+    prices = np.round(predictions).astype(np.int32).reshape(shape)
+
+    manifest = {
+        "format_version": STORE_FORMAT_VERSION,
+        "version": f"{model_version}-{key}",
+        "model_version": model_version,
+        "grid_key": key,
+        "zipcodes": zipcodes,
+        "axes": axes,
+        "base": base,
+    }
+    with staged_directory(surface_dir) as staging:
+        save_array(staging / "surface.npy", prices)
+        write_manifest(staging, manifest)
+    return PriceSurface(manifest, prices)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--surface-dir", type=Path, default=SURFACE_DIR)
+    parser.add_argument(
+        "--force", action="store_true", help="recompute even if up to date"
+    )
+    args = parser.parse_args(argv)
+
+    import main as api
+
+    loaded = api.load_artifacts()
+    surface = build_surface(
+        lambda frame: api._predict_frame(frame, loaded),
+        loaded.version,
+        api.FEATURE_COLUMNS,
+        args.surface_dir,
+        force=args.force,
+    )
+    print(
+        f"Price surface {surface.manifest['version']}: "
+        f"{surface.prices.shape[0]} ZIPs x "
+        f"{int(np.prod(surface.prices.shape[1:]))} configurations "
+        f"in {args.surface_dir}"
+    )
+
+
+if __name__ == "__main__":
+    main()
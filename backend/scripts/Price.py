@@ -1,32 +1,64 @@
 """Custom regression model with manual gradient descent.
 
 This class is intentionally lightweight so it can be imported, trained on any
-processed dataset, and serialized via pickle/joblib/JSON/NPZ/PyTorch/ONNX.
+processed dataset, serialized via pickle/joblib/JSON/NPZ/PyTorch/ONNX and
+loaded back from any of them with ``PriceRegressionModel.load``.
 It implements:
 - parameter initialization (zeros)
 - mean squared error cost function
 - analytical gradients
 - mini-batch gradient descent instead of full-batch
+- SGD, momentum and Adam update rules with step learning-rate decay
+- early stopping on training or held-out loss (``tol``/``patience``)
+- many configurations trained in one vectorized pass (``fit_many``)
+- closed-form normal-equation / Cholesky solves with optional L2 penalty
 - parameter update rule (gradient descent)
 - training loop with per-iteration loss logs
+- out-of-core training from chunked sources (``partial_fit``/``fit_stream``)
+- optional timing hooks for feature expansion, epochs and gradients
+- memory-mappable ``.prm`` and ``.npy`` layouts for near-instant loading
+  when serving
 """
 from __future__ import annotations
 
 from itertools import combinations_with_replacement
 from pathlib import Path
-from typing import Any, ClassVar, Dict, List, Optional, Sequence, Tuple, Union
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 import json
 import importlib
 import numpy as np
 import pickle
+import time
+
+TimingHook = Callable[[str, float], None]
+
+# ``.prm`` layout: magic, little-endian uint64 header length, JSON header,
+# then raw arrays. Every section starts on a PRM_ALIGN-byte boundary so the
+# arrays can be memory-mapped in place.
+PRM_MAGIC = b"PRMODEL\x00"
+PRM_FORMAT_VERSION = 1
+PRM_ALIGN = 64
 
 
 class PriceRegressionModel:
     """Simple regression model trained via mini-batch gradient descent.
 
     This model supports polynomial feature expansion and can be saved
-    in multiple formats including pickle, JSON, NumPy, PyTorch, and ONNX.
+    in multiple formats including pickle, JSON, NumPy, PyTorch, ONNX and
+    the memory-mappable ``.prm`` layout; ``load`` restores any of them.
 
     Attributes
     ----------
@@ -36,8 +68,25 @@ class PriceRegressionModel:
         Learned bias term after fitting.
     history : List[float]
         Training loss history (mean loss per log interval).
+    validation_history : List[float]
+        Held-out loss per epoch when ``fit`` used ``validation_fraction``.
+    n_epochs_ : int
+        Epochs actually run; fewer than ``num_iterations`` after an early
+        stop.
+    fit_seconds_ : float
+        Wall time of the last ``fit``/``fit_stream`` (cumulative for
+        ``partial_fit``).
+    final_loss_ : Optional[float]
+        Last loss monitored for early stopping: held-out if a validation
+        split was used, else the mean training loss of the last epoch.
     is_fitted_ : bool
         Whether the model has been fitted.
+    feature_names_ : Optional[List[str]]
+        Column names of the DataFrame passed to ``fit``, if any.
+    timing_hook : Optional[Callable[[str, float], None]]
+        Called as ``hook(stage, seconds)`` with the time spent in
+        ``"expand"`` (polynomial expansion), ``"epoch"``, ``"gradient"``
+        (per mini-batch) and ``"predict"``. Not pickled.
 
     Example
     -------
@@ -54,18 +103,62 @@ class PriceRegressionModel:
         "npy",
         "pth",
         "onnx",
+        "prm",
     )
+    SUPPORTED_SOLVERS: ClassVar[Tuple[str, ...]] = ("gd", "normal", "cholesky")
+    SUPPORTED_OPTIMIZERS: ClassVar[Tuple[str, ...]] = (
+        "sgd",
+        "momentum",
+        "adam",
+    )
+    ADAM_BETA2: ClassVar[float] = 0.999
+    ADAM_EPSILON: ClassVar[float] = 1e-8
+    # Training parameters that only affect gradient descent, with the
+    # defaults assumed for models saved before they existed.
+    GD_DEFAULTS: ClassVar[Dict[str, Any]] = {
+        "optimizer": "sgd",
+        "momentum": 0.9,
+        "lr_decay": 1.0,
+        "lr_decay_every": 1,
+        "tol": None,
+        "patience": 5,
+        "validation_fraction": 0.0,
+    }
+    STATS_CHUNK_SIZE: ClassVar[int] = 4096
+    # Design matrices up to this size are permuted once per epoch; larger
+    # ones are gathered one mini-batch at a time so each batch is still in
+    # cache when its gradient is computed.
+    EPOCH_BUFFER_MAX_BYTES: ClassVar[int] = 8 * 2**20
 
-    def __init__(self) -> None:
+    def __init__(self, timing_hook: Optional[TimingHook] = None) -> None:
+        self.timing_hook: Optional[TimingHook] = timing_hook
         self.weights_: Optional[np.ndarray] = None
         self.bias_: float = 0.0
         self.history: List[float] = []
+        self.validation_history: List[float] = []
+        self.n_epochs_: int = 0
+        self.fit_seconds_: float = 0.0
+        self.final_loss_: Optional[float] = None
         self.is_fitted_: bool = False
         self._feature_map_: Optional[List[Tuple[int, ...]]] = None
+        self._expansion_runs_: Optional[np.ndarray] = None
         self._n_raw_features_: Optional[int] = None
         self._degree: Optional[int] = None
         self._cost_function: Optional[str] = None
         self._training_params: Dict[str, Any] = {}
+        self._stream_: Optional[Dict[str, Any]] = None
+        self._optimizer_state_: Optional[Dict[str, Any]] = None
+        self.feature_names_: Optional[List[str]] = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Hooks are usually closures over a live metrics registry.
+        state = self.__dict__.copy()
+        state["timing_hook"] = None
+        return state
+
+    def _timing_hook(self) -> Optional[TimingHook]:
+        # Models pickled before hooks existed lack the attribute.
+        return getattr(self, "timing_hook", None)
 
     def _to_numpy_features(self, X: Sequence[Sequence[float]]) -> np.ndarray:
         if hasattr(X, "to_numpy"):
@@ -107,6 +200,25 @@ class PriceRegressionModel:
             return None
         return [list(combo) for combo in self._feature_map_]
 
+    def _feature_map_array(self) -> np.ndarray:
+        """Feature map as ``(n_terms, degree)`` int32, padded with ``-1``."""
+        if self._feature_map_ is None:
+            return np.empty((0, 0), dtype=np.int32)
+        width = max(len(combo) for combo in self._feature_map_)
+        array = np.full((len(self._feature_map_), width), -1, dtype=np.int32)
+        for row, combo in enumerate(self._feature_map_):
+            array[row, :len(combo)] = combo
+        return array
+
+    @staticmethod
+    def _feature_map_from_array(array: Any) -> Optional[List[Tuple[int, ...]]]:
+        """Inverse of ``_feature_map_array``; also reads nested lists and
+        the object arrays older ``.npz``/``.npy`` saves hold."""
+        if array is None or len(array) == 0:
+            return None
+        rows = array.tolist() if isinstance(array, np.ndarray) else array
+        return [tuple(int(i) for i in combo if i >= 0) for combo in rows]
+
     def _export_state_dict(self) -> Dict[str, Any]:
         self._ensure_is_fitted()
         training_params = self._training_params
@@ -117,6 +229,12 @@ class PriceRegressionModel:
             "mini_batch_size": training_params.get("mini_batch_size"),
             "degree": self._degree,
             "cost_function": self._cost_function,
+            "solver": training_params.get("solver", "gd"),
+            "l2_penalty": training_params.get("l2_penalty", 0.0),
+            **{
+                key: training_params.get(key, default)
+                for key, default in self.GD_DEFAULTS.items()
+            },
             "initial_weights": training_params.get("initial_weights"),
             "initial_bias": training_params.get("initial_bias"),
             "weights": self.weights_.astype(float).tolist()
@@ -125,18 +243,19 @@ class PriceRegressionModel:
             "bias": float(self.bias_),
             "feature_map": self._feature_map_as_lists(),
             "n_raw_features": self._n_raw_features_,
+            "feature_names": getattr(self, "feature_names_", None),
             "history": list(self.history),
+            "validation_history": list(
+                getattr(self, "validation_history", [])
+            ),
+            "n_epochs": getattr(self, "n_epochs_", len(self.history)),
+            "fit_seconds": getattr(self, "fit_seconds_", 0.0),
+            "final_loss": getattr(self, "final_loss_", None),
         }
 
     def _export_numpy_payload(self) -> Dict[str, np.ndarray]:
         self._ensure_is_fitted()
-        feature_map_lists = self._feature_map_as_lists()
-        feature_map_array = (
-            np.array(feature_map_lists, dtype=object)
-            if feature_map_lists is not None
-            else np.array([], dtype=object)
-        )
-        return {
+        payload = {
             "weights": self.weights_.astype(np.float64)
             if self.weights_ is not None
             else np.array([], dtype=np.float64),
@@ -145,8 +264,14 @@ class PriceRegressionModel:
             "n_raw_features": np.array(
                 [self._n_raw_features_ or 0], dtype=np.int64
             ),
-            "feature_map": feature_map_array,
+            "feature_map": self._feature_map_array(),
+            "cost_function": np.array([self._cost_function]),
+            "history": np.asarray(self.history, dtype=np.float64),
         }
+        feature_names = getattr(self, "feature_names_", None)
+        if feature_names is not None:
+            payload["feature_names"] = np.array(feature_names)
+        return payload
 
     def _build_feature_map(self, n_features: int) -> None:
         if self._degree is None or self._degree < 1:
@@ -158,20 +283,85 @@ class PriceRegressionModel:
             )
         self._feature_map_ = feature_map
         self._n_raw_features_ = n_features
+        self._build_expansion_runs()
+
+    def _build_expansion_runs(self) -> None:
+        """Precompute how each degree-k column derives from degree k-1.
 
-    def _expand_features(self, X: np.ndarray) -> np.ndarray:
+        Every combo ``c + (f,)`` is the product of the existing column for
+        ``c`` and raw feature ``f``. In ``combinations_with_replacement``
+        order the children of one parent are adjacent and their last
+        factors are consecutive, so each parent yields a single run
+        ``(parent_col, first_factor, out_start, out_stop)`` that is filled
+        with one broadcast multiply.
+        """
+        if self._feature_map_ is None:
+            self._expansion_runs_ = None
+            return
+        column_of = {combo: i for i, combo in enumerate(self._feature_map_)}
+        runs: List[List[int]] = []
+        for col, combo in enumerate(self._feature_map_):
+            if len(combo) < 2:
+                continue
+            parent = column_of[combo[:-1]]
+            factor = combo[-1]
+            if runs:
+                last = runs[-1]
+                extends_run = (
+                    last[0] == parent
+                    and last[3] == col
+                    and last[1] + (last[3] - last[2]) == factor
+                )
+                if extends_run:
+                    last[3] = col + 1
+                    continue
+            runs.append([parent, factor, col, col + 1])
+        self._expansion_runs_ = np.asarray(runs, dtype=np.intp).reshape(
+            -1, 4
+        )
+
+    def _expand_features(
+        self,
+        X: np.ndarray,
+        out: Optional[np.ndarray] = None,
+        order: str = "F",
+    ) -> np.ndarray:
+        """Expand ``X`` into polynomial features, optionally into ``out``.
+
+        ``out`` must be a float64 array of shape
+        ``(n_samples, n_expanded_features)``; it is filled and returned so
+        callers can reuse one buffer across chunks. When ``out`` is omitted
+        a new array is allocated in ``order``: column-major (the default)
+        makes every run a contiguous write and is several times faster to
+        fill, while row-major suits callers that gather rows afterwards.
+        """
         if self._feature_map_ is None:
             # degree == 1 and fit not called yet; treat as identity
             return X
         if self._degree == 1:
             return X
-        result = np.empty(
-            (X.shape[0], len(self._feature_map_)),
-            dtype=np.float64,
-        )
-        for i, combo in enumerate(self._feature_map_):
-            result[:, i] = np.prod(X[:, combo], axis=1)
-        return result
+        if getattr(self, "_expansion_runs_", None) is None:
+            # Models pickled before the runs were cached.
+            self._build_expansion_runs()
+        n_columns = len(self._feature_map_)
+        if out is None:
+            out = np.empty(
+                (X.shape[0], n_columns), dtype=np.float64, order=order
+            )
+        elif out.shape != (X.shape[0], n_columns) or out.dtype != np.float64:
+            raise ValueError(
+                "out must be a float64 array of shape "
+                f"({X.shape[0]}, {n_columns}), got {out.dtype} {out.shape}"
+            )
+        n_raw = X.shape[1]
+        out[:, :n_raw] = X
+        for parent, first, start, stop in self._expansion_runs_.tolist():
+            np.multiply(
+                out[:, parent:parent + 1],
+                X[:, first:first + (stop - start)],
+                out=out[:, start:stop],
+            )
+        return out
 
     def _initialize_parameters(
         self,
@@ -190,24 +380,39 @@ class PriceRegressionModel:
             self.weights_ = np.zeros(n_features, dtype=np.float64)
 
         self.bias_ = float(initial_bias) if initial_bias is not None else 0.0
+        self._optimizer_state_ = None
 
     def _predict_raw(self, X: np.ndarray) -> np.ndarray:
         if self.weights_ is None:
             raise RuntimeError("Model parameters have not been initialized")
         return X @ self.weights_ + self.bias_
 
-    def _compute_loss(self, y_true: np.ndarray, y_pred: np.ndarray) -> float:
+    @staticmethod
+    def _residuals(y_true: np.ndarray, y_pred: np.ndarray) -> np.ndarray:
+        # ``fit_many`` trains K models at once: ``y_pred`` is (n, K) there.
+        if y_pred.ndim == 2:
+            return y_pred - y_true[:, None]
+        return y_pred - y_true
+
+    def _compute_loss(
+        self, y_true: np.ndarray, y_pred: np.ndarray
+    ) -> Union[float, np.ndarray]:
+        """Half mean squared error; one per column for stacked models."""
         if self._cost_function != "mse":
             raise ValueError("Only 'mse' cost_function is currently supported")
-        residuals = y_pred - y_true
+        residuals = self._residuals(y_true, y_pred)
+        if residuals.ndim == 2:
+            return np.mean(residuals ** 2, axis=0) / 2.0
         return float(np.mean(residuals ** 2) / 2.0)
 
     def _compute_gradients(
         self, X: np.ndarray, y_true: np.ndarray, y_pred: np.ndarray
-    ) -> Tuple[np.ndarray, float]:
+    ) -> Tuple[np.ndarray, Union[float, np.ndarray]]:
         n_samples = X.shape[0]
-        residuals = y_pred - y_true
+        residuals = self._residuals(y_true, y_pred)
         grad_w = (X.T @ residuals) / n_samples
+        if residuals.ndim == 2:
+            return grad_w, np.sum(residuals, axis=0) / n_samples
         grad_b = float(np.sum(residuals) / n_samples)
         return grad_w, grad_b
 
@@ -219,6 +424,366 @@ class PriceRegressionModel:
         self.weights_ -= learning_rate * grad_w
         self.bias_ -= learning_rate * grad_b
 
+    def _momentum_update(
+        self, grad_w: np.ndarray, grad_b: float, learning_rate: float
+    ) -> None:
+        """Heavy-ball momentum: step along a decaying sum of gradients."""
+        beta = self._training_params["momentum"]
+        state = self._optimizer_state_
+        if state is None:
+            state = self._optimizer_state_ = {
+                "velocity_w": np.zeros_like(self.weights_),
+                "velocity_b": 0.0,
+            }
+        velocity_w = state["velocity_w"]
+        velocity_w *= beta
+        velocity_w += grad_w
+        state["velocity_b"] = beta * state["velocity_b"] + grad_b
+        self._update_parameters(velocity_w, state["velocity_b"], learning_rate)
+
+    def _adam_update(
+        self, grad_w: np.ndarray, grad_b: float, learning_rate: float
+    ) -> None:
+        """Adam with bias-corrected first and second moment estimates."""
+        beta1 = self._training_params["momentum"]
+        beta2, epsilon = self.ADAM_BETA2, self.ADAM_EPSILON
+        state = self._optimizer_state_
+        if state is None:
+            state = self._optimizer_state_ = {
+                "m_w": np.zeros_like(self.weights_),
+                "v_w": np.zeros_like(self.weights_),
+                "m_b": 0.0,
+                "v_b": 0.0,
+                "step": 0,
+            }
+        state["step"] += 1
+        m_w, v_w = state["m_w"], state["v_w"]
+        m_w *= beta1
+        m_w += (1.0 - beta1) * grad_w
+        v_w *= beta2
+        v_w += (1.0 - beta2) * np.square(grad_w)
+        state["m_b"] = beta1 * state["m_b"] + (1.0 - beta1) * grad_b
+        state["v_b"] = beta2 * state["v_b"] + (1.0 - beta2) * grad_b ** 2
+        # Fold both bias corrections into the step size.
+        step = state["step"]
+        step_size = learning_rate * (
+            np.sqrt(1.0 - beta2 ** step) / (1.0 - beta1 ** step)
+        )
+        self.weights_ -= step_size * m_w / (np.sqrt(v_w) + epsilon)
+        self.bias_ -= (
+            step_size * state["m_b"] / (np.sqrt(state["v_b"]) + epsilon)
+        )
+
+    def _epoch_learning_rate(self, epoch: int) -> float:
+        """Step decay: multiply by ``lr_decay`` every ``lr_decay_every``."""
+        params = self._training_params
+        decay = params.get("lr_decay", 1.0)
+        if decay == 1.0:
+            return params["learning_rate"]
+        n_steps = (epoch - 1) // params.get("lr_decay_every", 1)
+        return params["learning_rate"] * decay ** n_steps
+
+    def _accumulate_normal_equations(
+        self,
+        X: np.ndarray,
+        y: np.ndarray,
+        stats: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Add the sufficient statistics of ``(X, y)`` to ``stats``.
+
+        ``X`` holds raw features; it is expanded ``STATS_CHUNK_SIZE`` rows at
+        a time into one reused buffer, so the full design matrix is never
+        materialized.
+        """
+        n_features = (
+            len(self._feature_map_)
+            if self._degree != 1 and self._feature_map_ is not None
+            else X.shape[1]
+        )
+        if stats is None:
+            stats = {
+                "xtx": np.zeros((n_features, n_features), dtype=np.float64),
+                "xty": np.zeros(n_features, dtype=np.float64),
+                "x_sum": np.zeros(n_features, dtype=np.float64),
+                "y_sum": 0.0,
+                "yty": 0.0,
+                "n": 0,
+            }
+        chunk_size = self.STATS_CHUNK_SIZE
+        buffer = (
+            np.empty((chunk_size, n_features), dtype=np.float64, order="F")
+            if n_features != X.shape[1]
+            else None
+        )
+        for start in range(0, X.shape[0], chunk_size):
+            stop = min(start + chunk_size, X.shape[0])
+            chunk = X[start:stop]
+            if buffer is not None:
+                chunk = self._expand_features(
+                    chunk, out=buffer[:stop - start]
+                )
+            chunk_y = y[start:stop]
+            stats["xtx"] += chunk.T @ chunk
+            stats["xty"] += chunk.T @ chunk_y
+            stats["x_sum"] += chunk.sum(axis=0)
+            stats["y_sum"] += float(chunk_y.sum())
+            stats["yty"] += float(chunk_y @ chunk_y)
+            stats["n"] += stop - start
+        return stats
+
+    @staticmethod
+    def _cholesky_solve(gram: np.ndarray, rhs: np.ndarray) -> np.ndarray:
+        try:
+            scipy_linalg = importlib.import_module("scipy.linalg")
+        except ImportError:  # pragma: no cover - optional dependency
+            lower = np.linalg.cholesky(gram)
+            return np.linalg.solve(lower.T, np.linalg.solve(lower, rhs))
+        factor = scipy_linalg.cho_factor(gram, lower=True)
+        return scipy_linalg.cho_solve(factor, rhs)
+
+    def _solve_normal_equations(
+        self, stats: Dict[str, Any], solver: str, l2_penalty: float
+    ) -> None:
+        """Minimize ``mean(r**2) / 2 + l2_penalty / 2 * ||w||**2``.
+
+        The bias is left unpenalized by solving on centered statistics and
+        recovering it from the means afterwards.
+        """
+        n_samples = stats["n"]
+        x_mean = stats["x_sum"] / n_samples
+        y_mean = stats["y_sum"] / n_samples
+        gram = stats["xtx"] - n_samples * np.outer(x_mean, x_mean)
+        rhs = stats["xty"] - n_samples * x_mean * y_mean
+        if l2_penalty:
+            gram[np.diag_indices_from(gram)] += n_samples * l2_penalty
+        try:
+            if solver == "cholesky":
+                weights = self._cholesky_solve(gram, rhs)
+            else:
+                weights = np.linalg.solve(gram, rhs)
+        except np.linalg.LinAlgError as exc:
+            raise ValueError(
+                f"Normal equations are singular for solver='{solver}'; "
+                "use a positive l2_penalty or solver='gd'"
+            ) from exc
+        self.weights_ = np.asarray(weights, dtype=np.float64)
+        self.bias_ = float(y_mean - x_mean @ self.weights_)
+
+    def _loss_from_stats(self, stats: Dict[str, Any]) -> float:
+        """Training loss (mean squared residual / 2) from the statistics."""
+        weights, bias, n_samples = self.weights_, self.bias_, stats["n"]
+        sse = (
+            stats["yty"]
+            - 2.0 * (weights @ stats["xty"] + bias * stats["y_sum"])
+            + weights @ stats["xtx"] @ weights
+            + 2.0 * bias * (weights @ stats["x_sum"])
+            + n_samples * bias * bias
+        )
+        return float(max(sse, 0.0) / n_samples / 2.0)
+
+    def _configure(
+        self,
+        *,
+        degree: int,
+        learning_rate: float,
+        num_iterations: int,
+        log_every: int,
+        mini_batch_size: int,
+        cost_function: str,
+        initial_weights: Optional[Sequence[float]],
+        initial_bias: Optional[float],
+        solver: str,
+        l2_penalty: float,
+        **gd_options: Any,
+    ) -> str:
+        """Validate and record the training configuration; returns solver.
+
+        ``gd_options`` are the ``GD_DEFAULTS`` keys; omitted ones take their
+        defaults.
+        """
+        normalized_cost = self._validate_hyperparameters(
+            learning_rate,
+            num_iterations,
+            log_every,
+            degree,
+            mini_batch_size,
+            cost_function,
+        )
+        normalized_solver = self._validate_solver(solver, l2_penalty)
+        options = {**self.GD_DEFAULTS, **gd_options}
+        options["optimizer"] = self._validate_optimizer(**options)
+
+        stored_initial_weights = None
+        if initial_weights is not None:
+            stored_initial_weights = np.asarray(
+                initial_weights, dtype=np.float64
+            ).reshape(-1).tolist()
+
+        self._degree = degree
+        self._cost_function = normalized_cost
+        self._training_params = {
+            "learning_rate": learning_rate,
+            "num_iterations": num_iterations,
+            "log_every": log_every,
+            "mini_batch_size": mini_batch_size,
+            "cost_function": normalized_cost,
+            "initial_weights": stored_initial_weights,
+            "initial_bias": initial_bias,
+            "solver": normalized_solver,
+            "l2_penalty": l2_penalty,
+            **options,
+        }
+        return normalized_solver
+
+    def _setup_features(self, n_raw_features: int) -> None:
+        if self._degree > 1:
+            self._build_feature_map(n_raw_features)
+        else:
+            self._n_raw_features_ = n_raw_features
+
+    def _design_matrix(self, X: np.ndarray) -> np.ndarray:
+        if self._degree == 1:
+            return X
+        hook = self._timing_hook()
+        started = time.perf_counter() if hook is not None else 0.0
+        # Row-major: the mini-batch loop gathers whole rows.
+        design = self._expand_features(X, order="C")
+        if hook is not None:
+            hook("expand", time.perf_counter() - started)
+        return design
+
+    def _epoch_buffers(
+        self, design_matrix: np.ndarray, y: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Row-major shuffle buffers, reused by every epoch.
+
+        They hold the whole epoch when the design matrix is at most
+        ``EPOCH_BUFFER_MAX_BYTES``, else one mini-batch.
+        """
+        n_samples, n_features = design_matrix.shape
+        n_rows = n_samples
+        if design_matrix.nbytes > self.EPOCH_BUFFER_MAX_BYTES:
+            n_rows = min(self._training_params["mini_batch_size"], n_samples)
+        return (
+            np.empty((n_rows, n_features), dtype=np.float64, order="C"),
+            np.empty(n_rows, dtype=np.float64),
+        )
+
+    def _run_epoch(
+        self,
+        design_matrix: np.ndarray,
+        y: np.ndarray,
+        rng: np.random.Generator,
+        learning_rate: Optional[float] = None,
+        buffers: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+    ) -> List[float]:
+        """One shuffled pass of mini-batch updates; returns batch losses.
+
+        Rows are shuffled into ``buffers`` from ``_epoch_buffers``
+        (allocated here if not given): all at once when they hold the whole
+        epoch, so every mini-batch is a view, else one batch at a time.
+        Either way the loop allocates no new batch arrays.
+        """
+        params = self._training_params
+        if learning_rate is None:
+            learning_rate = params["learning_rate"]
+        l2_penalty = params.get("l2_penalty", 0.0)
+        update = {
+            "sgd": self._update_parameters,
+            "momentum": self._momentum_update,
+            "adam": self._adam_update,
+        }[params.get("optimizer", "sgd")]
+        n_samples = design_matrix.shape[0]
+        batch_size = min(params["mini_batch_size"], n_samples)
+        hook = self._timing_hook()
+        shuffled_X, shuffled_y = buffers or self._epoch_buffers(
+            design_matrix, y
+        )
+        indices = rng.permutation(n_samples)
+        whole_epoch = shuffled_X.shape[0] == n_samples
+        # mode="clip" skips the bounds-check copy np.take makes for ``out``.
+        if whole_epoch:
+            np.take(
+                design_matrix, indices, axis=0, out=shuffled_X, mode="clip"
+            )
+            np.take(y, indices, out=shuffled_y, mode="clip")
+        batch_losses: List[float] = []
+        for start in range(0, n_samples, batch_size):
+            # Last batch may be smaller than batch_size
+            stop = min(start + batch_size, n_samples)
+            if whole_epoch:
+                batch_X = shuffled_X[start:stop]
+                batch_y = shuffled_y[start:stop]
+            else:
+                batch_idx = indices[start:stop]
+                batch_X = np.take(
+                    design_matrix,
+                    batch_idx,
+                    axis=0,
+                    out=shuffled_X[:stop - start],
+                    mode="clip",
+                )
+                batch_y = np.take(
+                    y, batch_idx, out=shuffled_y[:stop - start], mode="clip"
+                )
+            predictions = self._predict_raw(batch_X)
+            loss = self._compute_loss(batch_y, predictions)
+            if hook is not None:
+                grad_started = time.perf_counter()
+            grad_w, grad_b = self._compute_gradients(
+                batch_X, batch_y, predictions
+            )
+            if hook is not None:
+                hook("gradient", time.perf_counter() - grad_started)
+            if np.any(l2_penalty):
+                grad_w = grad_w + l2_penalty * self.weights_
+            update(grad_w, grad_b, learning_rate)
+            batch_losses.append(loss)
+        return batch_losses
+
+    @classmethod
+    def _validate_solver(cls, solver: str, l2_penalty: float) -> str:
+        normalized_solver = solver.lower()
+        if normalized_solver not in cls.SUPPORTED_SOLVERS:
+            raise ValueError(
+                "solver must be one of: " + ", ".join(cls.SUPPORTED_SOLVERS)
+            )
+        if l2_penalty < 0:
+            raise ValueError("l2_penalty must be non-negative")
+        return normalized_solver
+
+    @classmethod
+    def _validate_optimizer(
+        cls,
+        *,
+        optimizer: str,
+        momentum: float,
+        lr_decay: float,
+        lr_decay_every: int,
+        tol: Optional[float],
+        patience: int,
+        validation_fraction: float,
+    ) -> str:
+        normalized_optimizer = optimizer.lower()
+        if normalized_optimizer not in cls.SUPPORTED_OPTIMIZERS:
+            raise ValueError(
+                "optimizer must be one of: "
+                + ", ".join(cls.SUPPORTED_OPTIMIZERS)
+            )
+        if not 0.0 <= momentum < 1.0:
+            raise ValueError("momentum must be in [0, 1)")
+        if not 0.0 < lr_decay <= 1.0:
+            raise ValueError("lr_decay must be in (0, 1]")
+        if lr_decay_every < 1:
+            raise ValueError("lr_decay_every must be at least 1")
+        if tol is not None and tol < 0:
+            raise ValueError("tol must be non-negative or None")
+        if patience < 1:
+            raise ValueError("patience must be at least 1")
+        if not 0.0 <= validation_fraction < 1.0:
+            raise ValueError("validation_fraction must be in [0, 1)")
+        return normalized_optimizer
+
     @staticmethod
     def _validate_hyperparameters(
         learning_rate: float,
@@ -259,8 +824,22 @@ class PriceRegressionModel:
         initial_weights: Optional[Sequence[float]] = None,
         initial_bias: Optional[float] = None,
         random_seed: Optional[int] = None,
+        solver: str = "gd",
+        l2_penalty: float = 0.0,
+        optimizer: str = "sgd",
+        momentum: float = 0.9,
+        lr_decay: float = 1.0,
+        lr_decay_every: int = 1,
+        tol: Optional[float] = None,
+        patience: int = 5,
+        validation_fraction: float = 0.0,
     ) -> "PriceRegressionModel":
-        """Fit the regression model using mini-batch gradient descent.
+        """Fit the regression model.
+
+        The default solver is mini-batch gradient descent. ``"normal"`` and
+        ``"cholesky"`` instead accumulate XᵀX and Xᵀy in one chunked pass
+        and solve the (optionally L2-regularized) normal equations directly;
+        the gradient-descent settings are then unused.
 
         Args:
             X: Training features of shape (n_samples, n_features).
@@ -273,84 +852,439 @@ class PriceRegressionModel:
             cost_function: Loss function, currently only "mse" supported.
             initial_weights: Optional initial weight values.
             initial_bias: Optional initial bias value.
+            random_seed: Seed for mini-batch shuffling.
+            solver: "gd" (default), "normal" (LU solve of the normal
+                equations) or "cholesky" (Cholesky solve of the same).
+            l2_penalty: L2 penalty on the weights, not the bias (default: 0).
+            optimizer: Update rule: "sgd" (default), "momentum" or "adam".
+            momentum: Momentum coefficient, or Adam's beta1 (default: 0.9).
+            lr_decay: Multiply the learning rate by this every
+                ``lr_decay_every`` epochs (default: 1.0, no decay).
+            lr_decay_every: Epochs between decay steps (default: 1).
+            tol: Stop once the monitored loss has failed to drop by more
+                than ``tol`` for ``patience`` epochs in a row (default: None,
+                always run ``num_iterations`` epochs).
+            patience: Epochs without improvement before stopping (default: 5).
+            validation_fraction: Hold out this share of rows, chosen with
+                ``random_seed``, and monitor their loss instead of the
+                training loss; the best weights seen are restored at the end
+                (default: 0.0, monitor the training loss).
         Returns:
             self: The fitted model instance.
 
         Raises:
             ValueError: If hyperparameters are invalid or data shapes mismatch.
         """
-        normalized_cost = self._validate_hyperparameters(
-            learning_rate,
-            num_iterations,
-            log_every,
-            degree,
-            mini_batch_size,
-            cost_function,
+        started = time.perf_counter()
+        normalized_solver = self._configure(
+            degree=degree,
+            learning_rate=learning_rate,
+            num_iterations=num_iterations,
+            log_every=log_every,
+            mini_batch_size=mini_batch_size,
+            cost_function=cost_function,
+            initial_weights=initial_weights,
+            initial_bias=initial_bias,
+            solver=solver,
+            l2_penalty=l2_penalty,
+            optimizer=optimizer,
+            momentum=momentum,
+            lr_decay=lr_decay,
+            lr_decay_every=lr_decay_every,
+            tol=tol,
+            patience=patience,
+            validation_fraction=validation_fraction,
         )
-
-        stored_initial_weights = None
-        if initial_weights is not None:
-            stored_initial_weights = np.asarray(
-                initial_weights, dtype=np.float64
-            ).reshape(-1).tolist()
-
-        self._degree = degree
-        self._cost_function = normalized_cost
-        self._training_params = {
-            "learning_rate": learning_rate,
-            "num_iterations": num_iterations,
-            "log_every": log_every,
-            "mini_batch_size": mini_batch_size,
-            "cost_function": normalized_cost,
-            "initial_weights": stored_initial_weights,
-            "initial_bias": initial_bias,
-        }
+        self._stream_ = None
+        self.validation_history = []
 
         X_array, y_array = self._prepare_data(X, y)
-        _, n_raw_features = X_array.shape
-        if degree > 1:
-            self._build_feature_map(n_raw_features)
-            design_matrix = self._expand_features(X_array)
-        else:
-            self._n_raw_features_ = n_raw_features
-            design_matrix = X_array
+        self.feature_names_ = (
+            [str(name) for name in X.columns]
+            if hasattr(X, "columns")
+            else None
+        )
+        self._setup_features(X_array.shape[1])
+        if normalized_solver != "gd":
+            stats = self._accumulate_normal_equations(X_array, y_array)
+            self._solve_normal_equations(stats, normalized_solver, l2_penalty)
+            self.history = [self._loss_from_stats(stats)]
+            self._record_run(1, started, self.history[-1])
+            return self
+
+        design_matrix = self._design_matrix(X_array)
         n_features = design_matrix.shape[1]
         self._initialize_parameters(
             n_features, initial_weights, initial_bias
         )
         self.history = []
 
-        n_samples = design_matrix.shape[0]
-        batch_size = min(mini_batch_size, n_samples)
-
         rng = np.random.default_rng(random_seed)
-        for iteration in range(1, num_iterations + 1):
-            indices = rng.permutation(n_samples)
-            batch_losses: List[float] = []
-            for start in range(0, n_samples, batch_size):
-                # Last batch may be smaller than batch_size
-                batch_idx = indices[start:start + batch_size]
-                batch_X = design_matrix[batch_idx]
-                batch_y = y_array[batch_idx]
-                predictions = self._predict_raw(batch_X)
-                loss = self._compute_loss(batch_y, predictions)
-                grad_w, grad_b = self._compute_gradients(
-                    batch_X, batch_y, predictions
+        holdout = None
+        if validation_fraction:
+            n_holdout = int(round(validation_fraction * X_array.shape[0]))
+            if not 1 <= n_holdout < X_array.shape[0]:
+                raise ValueError(
+                    "validation_fraction leaves no rows to train or to "
+                    "validate on"
                 )
-                self._update_parameters(grad_w, grad_b, learning_rate)
-                batch_losses.append(loss)
+            order = rng.permutation(X_array.shape[0])
+            holdout = (
+                design_matrix[order[:n_holdout]],
+                y_array[order[:n_holdout]],
+            )
+            design_matrix = design_matrix[order[n_holdout:]]
+            y_array = y_array[order[n_holdout:]]
+        buffers = self._epoch_buffers(design_matrix, y_array)
 
+        hook = self._timing_hook()
+        best_loss, best_params, stale_epochs = np.inf, None, 0
+        for iteration in range(1, num_iterations + 1):
+            epoch_started = time.perf_counter()
+            batch_losses = self._run_epoch(
+                design_matrix,
+                y_array,
+                rng,
+                self._epoch_learning_rate(iteration),
+                buffers,
+            )
+            if hook is not None:
+                hook("epoch", time.perf_counter() - epoch_started)
             if iteration % log_every == 0 and batch_losses:
                 self.history.append(float(np.mean(batch_losses)))
 
+            if holdout is not None:
+                loss = self._compute_loss(
+                    holdout[1], self._predict_raw(holdout[0])
+                )
+                self.validation_history.append(loss)
+            else:
+                loss = float(np.mean(batch_losses))
+            # tol only decides what counts as progress for patience; any
+            # improvement is kept, so the restored weights match best_loss.
+            if loss < best_loss - (tol or 0.0):
+                stale_epochs = 0
+            else:
+                stale_epochs += 1
+            if loss < best_loss:
+                best_loss = loss
+                if holdout is not None:
+                    best_params = (self.weights_.copy(), self.bias_)
+            if tol is not None and stale_epochs >= patience:
+                break
+
+        if best_params is not None:
+            self.weights_, self.bias_ = best_params
+            loss = best_loss
+        self._record_run(iteration, started, loss)
+        return self
+
+    def _record_run(
+        self, n_epochs: int, started: float, final_loss: float
+    ) -> None:
+        """Mark the model fitted and record what the training run did."""
+        self.n_epochs_ = n_epochs
+        self.fit_seconds_ = time.perf_counter() - started
+        self.final_loss_ = float(final_loss)
         self.is_fitted_ = True
+
+    def _consume_chunk(
+        self,
+        X: Sequence[Sequence[float]],
+        y: Sequence[float],
+        initial_weights: Optional[Sequence[float]],
+        initial_bias: Optional[float],
+        learning_rate: Optional[float] = None,
+    ) -> List[float]:
+        """Train on one chunk of the active stream; returns batch losses."""
+        stream = self._stream_
+        X_array, y_array = self._prepare_data(X, y)
+        if not stream["started"]:
+            self._setup_features(X_array.shape[1])
+            if self._training_params["solver"] == "gd":
+                n_features = (
+                    len(self._feature_map_)
+                    if self._degree > 1
+                    else X_array.shape[1]
+                )
+                self._initialize_parameters(
+                    n_features, initial_weights, initial_bias
+                )
+            stream["started"] = True
+        elif X_array.shape[1] != self._n_raw_features_:
+            raise ValueError(
+                "Chunk feature dimension mismatch. Expected "
+                f"{self._n_raw_features_}, got {X_array.shape[1]}"
+            )
+
+        stream["n_samples_seen"] += X_array.shape[0]
+        if self._training_params["solver"] != "gd":
+            stream["stats"] = self._accumulate_normal_equations(
+                X_array, y_array, stream["stats"]
+            )
+            return []
+        design = self._design_matrix(X_array)
+        return self._run_epoch(design, y_array, stream["rng"], learning_rate)
+
+    def _start_stream(
+        self, random_seed: Optional[int], resume: bool = False
+    ) -> None:
+        """Start a stream; with ``resume`` it continues the fitted weights
+        and appends to the existing training record."""
+        self._stream_ = {
+            "rng": np.random.default_rng(random_seed),
+            "stats": None,
+            "started": resume,
+            "n_samples_seen": 0,
+        }
+        if resume:
+            self._optimizer_state_ = None
+            return
+        self.history = []
+        self.validation_history = []
+        self.n_epochs_ = 0
+        self.fit_seconds_ = 0.0
+        self.is_fitted_ = False
+
+    def _check_resumable(
+        self,
+        X: Sequence[Sequence[float]],
+        degree: int,
+        solver: str,
+        initial_weights: Optional[Sequence[float]],
+        initial_bias: Optional[float],
+    ) -> None:
+        """Refuse a ``partial_fit`` that cannot continue the fitted model."""
+        if degree != self._degree:
+            raise ValueError(
+                f"Model was fitted with degree={self._degree}; partial_fit "
+                f"cannot continue it with degree={degree}"
+            )
+        if solver.lower() != "gd":
+            raise ValueError(
+                "partial_fit can only continue a fitted model with "
+                "solver='gd'; its normal-equation totals were not kept"
+            )
+        if initial_weights is not None or initial_bias is not None:
+            raise ValueError(
+                "partial_fit continues from the fitted weights; "
+                "initial_weights and initial_bias cannot be given"
+            )
+        n_features = np.shape(X)[1] if np.ndim(X) == 2 else None
+        if n_features != self._n_raw_features_:
+            raise ValueError(
+                "Chunk feature dimension mismatch. Expected "
+                f"{self._n_raw_features_}, got {n_features}"
+            )
+
+    def partial_fit(
+        self,
+        X: Sequence[Sequence[float]],
+        y: Sequence[float],
+        *,
+        degree: int = 1,
+        learning_rate: float = 0.01,
+        mini_batch_size: int = 25,
+        cost_function: str = "mse",
+        initial_weights: Optional[Sequence[float]] = None,
+        initial_bias: Optional[float] = None,
+        random_seed: Optional[int] = None,
+        solver: str = "gd",
+        l2_penalty: float = 0.0,
+        optimizer: str = "sgd",
+        momentum: float = 0.9,
+    ) -> "PriceRegressionModel":
+        """Update the model with one chunk of data.
+
+        The first call on a fresh model (or after ``fit``) starts a stream
+        and fixes its configuration from the keyword arguments; later calls
+        keep that configuration and ignore them. On a model that is already
+        fitted the stream continues from its weights, which needs the same
+        ``degree`` and ``solver="gd"``; the optimizer state starts afresh,
+        while ``history`` and the other training records are extended. With
+        ``solver="gd"`` each call runs one shuffled pass of mini-batches over
+        the chunk; with a closed-form solver the chunk's statistics are added
+        to the running totals and the normal equations are re-solved. Each
+        call appends one entry to ``history``.
+
+        Args:
+            X: Feature chunk of shape (n_chunk_samples, n_features).
+            y: Target chunk of shape (n_chunk_samples,).
+            Other arguments: as for ``fit``; the optimizer state carries
+                over from one chunk to the next.
+
+        Returns:
+            self: The updated model instance.
+
+        Raises:
+            ValueError: If the model is already fitted and the arguments ask
+                for a different degree, a closed-form solver or new initial
+                parameters, or if the chunk's feature count does not match.
+        """
+        started = time.perf_counter()
+        resume = self._stream_ is None and self.is_fitted_
+        if resume:
+            self._check_resumable(
+                X, degree, solver, initial_weights, initial_bias
+            )
+        if self._stream_ is None:
+            self._configure(
+                degree=degree,
+                learning_rate=learning_rate,
+                num_iterations=1,
+                log_every=1,
+                mini_batch_size=mini_batch_size,
+                cost_function=cost_function,
+                initial_weights=initial_weights,
+                initial_bias=initial_bias,
+                solver=solver,
+                l2_penalty=l2_penalty,
+                optimizer=optimizer,
+                momentum=momentum,
+            )
+            self._start_stream(random_seed, resume)
+
+        batch_losses = self._consume_chunk(X, y, initial_weights, initial_bias)
+        params = self._training_params
+        if params["solver"] != "gd":
+            stats = self._stream_["stats"]
+            self._solve_normal_equations(
+                stats, params["solver"], params["l2_penalty"]
+            )
+            self.history.append(self._loss_from_stats(stats))
+        else:
+            self.history.append(float(np.mean(batch_losses)))
+        fit_seconds = self.fit_seconds_
+        n_epochs = getattr(self, "n_epochs_", 0) + 1
+        self._record_run(n_epochs, started, self.history[-1])
+        self.fit_seconds_ += fit_seconds
+        params["num_iterations"] = self.n_epochs_
         return self
 
-    def predict(self, X: Sequence[Sequence[float]]) -> np.ndarray:
+    def fit_stream(
+        self,
+        chunks: Union[
+            Iterable[Tuple[Any, Any]], Callable[[], Iterable[Tuple[Any, Any]]]
+        ],
+        *,
+        degree: int = 1,
+        learning_rate: float = 0.01,
+        num_iterations: int = 1,
+        log_every: int = 1,
+        mini_batch_size: int = 25,
+        cost_function: str = "mse",
+        initial_weights: Optional[Sequence[float]] = None,
+        initial_bias: Optional[float] = None,
+        random_seed: Optional[int] = None,
+        solver: str = "gd",
+        l2_penalty: float = 0.0,
+        optimizer: str = "sgd",
+        momentum: float = 0.9,
+        lr_decay: float = 1.0,
+        lr_decay_every: int = 1,
+    ) -> "PriceRegressionModel":
+        """Fit from an iterable of ``(X_chunk, y_chunk)`` batches.
+
+        Each chunk is expanded and consumed as it arrives, so peak memory
+        depends on the chunk size, not the dataset size. Mini-batches are
+        shuffled within a chunk only; shuffle the source if row order
+        matters.
+
+        Args:
+            chunks: Iterable of ``(X_chunk, y_chunk)`` pairs, or a callable
+                returning a fresh iterable. A callable (or a re-iterable such
+                as a list) is required when ``num_iterations > 1`` with the
+                gradient-descent solver, e.g.
+                ``lambda: iter_csv_chunks(path, "TOTAL_VALUE")``.
+            num_iterations: Number of epochs over the stream (default: 1).
+                Closed-form solvers always make a single pass.
+            Other arguments: as for ``fit``. Early stopping is not
+                available here, since the stream has no held-out rows.
+
+        Returns:
+            self: The fitted model instance.
+
+        Raises:
+            ValueError: If the stream is empty, chunk shapes are
+                inconsistent, or a one-shot iterator is given for several
+                epochs.
+        """
+        started = time.perf_counter()
+        normalized_solver = self._configure(
+            degree=degree,
+            learning_rate=learning_rate,
+            num_iterations=num_iterations,
+            log_every=log_every,
+            mini_batch_size=mini_batch_size,
+            cost_function=cost_function,
+            initial_weights=initial_weights,
+            initial_bias=initial_bias,
+            solver=solver,
+            l2_penalty=l2_penalty,
+            optimizer=optimizer,
+            momentum=momentum,
+            lr_decay=lr_decay,
+            lr_decay_every=lr_decay_every,
+        )
+        n_epochs = num_iterations if normalized_solver == "gd" else 1
+        if (
+            n_epochs > 1
+            and not callable(chunks)
+            and iter(chunks) is chunks
+        ):
+            raise ValueError(
+                "A one-shot iterator cannot be replayed for several epochs; "
+                "pass a callable that returns a fresh iterable"
+            )
+        self._start_stream(random_seed)
+
+        for epoch in range(1, n_epochs + 1):
+            source = chunks() if callable(chunks) else chunks
+            batch_losses: List[float] = []
+            for X_chunk, y_chunk in source:
+                batch_losses.extend(
+                    self._consume_chunk(
+                        X_chunk,
+                        y_chunk,
+                        initial_weights,
+                        initial_bias,
+                        self._epoch_learning_rate(epoch),
+                    )
+                )
+            if not self._stream_["started"]:
+                raise ValueError(
+                    "Received empty stream; provide at least one chunk"
+                )
+            if epoch % log_every == 0 and batch_losses:
+                self.history.append(float(np.mean(batch_losses)))
+
+        if normalized_solver != "gd":
+            stats = self._stream_["stats"]
+            self._solve_normal_equations(stats, normalized_solver, l2_penalty)
+            self.history = [self._loss_from_stats(stats)]
+            final_loss = self.history[0]
+        else:
+            final_loss = float(np.mean(batch_losses))
+        self._training_params["n_samples_seen"] = self._stream_[
+            "n_samples_seen"
+        ]
+        self._stream_ = None
+        self._record_run(n_epochs, started, final_loss)
+        return self
+
+    def predict(
+        self,
+        X: Sequence[Sequence[float]],
+        *,
+        chunk_size: Optional[int] = None,
+    ) -> np.ndarray:
         """Make predictions on new data.
 
         Args:
             X: Input features of shape (n_samples, n_features).
+            chunk_size: If set, expand and score ``chunk_size`` rows at a
+                time through one reused buffer, so memory stays bounded by
+                the chunk rather than the full expanded matrix.
 
         Returns:
             np.ndarray: Predicted values of shape (n_samples,).
@@ -376,10 +1310,46 @@ class PriceRegressionModel:
                 "Input feature dimension mismatch. Expected "
                 f"{self._n_raw_features_}, got {X_array.shape[1]}"
             )
-        design_matrix = (
-            X_array if self._degree == 1 else self._expand_features(X_array)
+        hook = self._timing_hook()
+        if self._degree == 1:
+            started = time.perf_counter() if hook is not None else 0.0
+            predictions = self._predict_raw(X_array)
+            if hook is not None:
+                hook("predict", time.perf_counter() - started)
+            return predictions
+        if chunk_size is None or chunk_size >= X_array.shape[0]:
+            started = time.perf_counter() if hook is not None else 0.0
+            design = self._expand_features(X_array)
+            if hook is not None:
+                expanded = time.perf_counter()
+                hook("expand", expanded - started)
+            predictions = self._predict_raw(design)
+            if hook is not None:
+                hook("predict", time.perf_counter() - expanded)
+            return predictions
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        n_samples = X_array.shape[0]
+        predictions = np.empty(n_samples, dtype=np.float64)
+        buffer = np.empty(
+            (chunk_size, len(self._feature_map_)), dtype=np.float64, order="F"
         )
-        return self._predict_raw(design_matrix)
+        expand_seconds = predict_seconds = 0.0
+        for start in range(0, n_samples, chunk_size):
+            stop = min(start + chunk_size, n_samples)
+            started = time.perf_counter()
+            design = self._expand_features(
+                X_array[start:stop], out=buffer[:stop - start]
+            )
+            expanded = time.perf_counter()
+            predictions[start:stop] = self._predict_raw(design)
+            expand_seconds += expanded - started
+            predict_seconds += time.perf_counter() - expanded
+        if hook is not None:
+            hook("expand", expand_seconds)
+            hook("predict", predict_seconds)
+        return predictions
 
     def _save_with_pickle(self, path: Path) -> None:
         with path.open("wb") as file_obj:
@@ -404,8 +1374,28 @@ class PriceRegressionModel:
         np.savez_compressed(path, **payload)
 
     def _save_as_npy(self, path: Path) -> None:
+        """One structured record with a field per payload array.
+
+        Every field is a plain fixed-shape array, so the file needs no
+        pickle and ``load(..., mmap_mode="r")`` maps the weights in place.
+        """
         payload = self._export_numpy_payload()
-        np.save(path, payload, allow_pickle=True)
+        if self._degree != 1:
+            if getattr(self, "_expansion_runs_", None) is None:
+                self._build_expansion_runs()
+            payload["expansion_runs"] = np.asarray(
+                self._expansion_runs_, dtype=np.int64
+            )
+        record = np.zeros(
+            1,
+            dtype=[
+                (name, array.dtype, array.shape)
+                for name, array in payload.items()
+            ],
+        )
+        for name, array in payload.items():
+            record[name][0] = array
+        np.save(path, record, allow_pickle=False)
 
     def _save_as_pth(self, path: Path) -> None:
         try:
@@ -433,6 +1423,10 @@ class PriceRegressionModel:
                     "mini_batch_size"
                 ),
                 "cost_function": self._cost_function,
+                "solver": self._training_params.get("solver", "gd"),
+                "l2_penalty": self._training_params.get("l2_penalty", 0.0),
+                "feature_names": getattr(self, "feature_names_", None),
+                "history": list(self.history),
             },
         }
         torch.save(torch_state, path)
@@ -489,17 +1483,73 @@ class PriceRegressionModel:
             initializer=[weight_initializer, bias_initializer],
         )
         model = helper.make_model(graph)
+        # The graph consumes expanded features; keep what ``load`` needs to
+        # rebuild the expansion from raw columns.
+        helper.set_model_props(
+            model,
+            {
+                "degree": str(self._degree),
+                "n_raw_features": str(self._n_raw_features_ or n_features),
+                "cost_function": str(self._cost_function),
+            },
+        )
         onnx.checker.check_model(model)
         onnx.save(model, path)
 
+    def _save_as_prm(self, path: Path) -> None:
+        """Raw little-endian arrays behind a JSON header, 64-byte aligned.
+
+        Nothing is pickled or compressed, so ``load(..., mmap_mode="r")``
+        maps the weights straight from the page cache.
+        """
+        self._ensure_is_fitted()
+        arrays = {
+            "weights": np.ascontiguousarray(self.weights_, dtype="<f8"),
+            "feature_map": np.ascontiguousarray(
+                self._feature_map_array(), dtype="<i4"
+            ),
+        }
+        if self._degree != 1:
+            if getattr(self, "_expansion_runs_", None) is None:
+                self._build_expansion_runs()
+            arrays["expansion_runs"] = np.ascontiguousarray(
+                self._expansion_runs_, dtype="<i8"
+            )
+        state = self._export_state_dict()
+        for key in ("weights", "feature_map", "history"):
+            state.pop(key)
+        header: Dict[str, Any] = {
+            "format_version": PRM_FORMAT_VERSION,
+            "state": state,
+            "history": list(self.history),
+            "arrays": {},
+        }
+        offset = 0
+        for name, array in arrays.items():
+            header["arrays"][name] = {
+                "offset": offset,
+                "dtype": array.dtype.str,
+                "shape": list(array.shape),
+            }
+            offset = _align(offset + array.nbytes)
+        header_bytes = json.dumps(header).encode("utf-8")
+        data_start = _align(len(PRM_MAGIC) + 8 + len(header_bytes))
+        with path.open("wb") as file_obj:
+            file_obj.write(PRM_MAGIC)
+            file_obj.write(len(header_bytes).to_bytes(8, "little"))
+            file_obj.write(header_bytes)
+            for name, array in arrays.items():
+                file_obj.seek(data_start + header["arrays"][name]["offset"])
+                file_obj.write(array.tobytes())
+
     def save(
         self, output_path: Union[str, Path], fmt: Optional[str] = None
     ) -> Path:
         """Save the fitted model to disk in the specified format.
         Args:
             output_path: Path where the model should be saved.
-            fmt: File format (pkl, pickle, joblib, json, npz, npy, pth, onnx).
-                If None, inferred from file extension (default: None).
+            fmt: File format (pkl, pickle, joblib, json, npz, npy, pth, onnx,
+                prm). If None, inferred from file extension (default: None).
 
         Returns:
             Path: The actual path where the model was saved.
@@ -535,10 +1585,576 @@ class PriceRegressionModel:
             "npy": self._save_as_npy,
             "pth": self._save_as_pth,
             "onnx": self._save_as_onnx,
+            "prm": self._save_as_prm,
         }
         handler = handler_map[resolved_fmt]
         handler(path)
         return path
 
+    @classmethod
+    def _restore(
+        cls,
+        *,
+        weights: np.ndarray,
+        bias: float,
+        degree: int,
+        n_raw_features: int,
+        cost_function: Optional[str] = "mse",
+        feature_map: Any = None,
+        expansion_runs: Optional[np.ndarray] = None,
+        training_params: Optional[Dict[str, Any]] = None,
+        history: Optional[Sequence[float]] = None,
+        feature_names: Optional[Sequence[str]] = None,
+    ) -> "PriceRegressionModel":
+        """Build a fitted model from serialized parts.
+
+        ``weights`` is kept as given (float64 stays zero-copy, memory-mapped
+        arrays stay mapped); the feature map and expansion runs are rebuilt
+        when a format does not carry them.
+        """
+        model = cls()
+        model._degree = int(degree)
+        model._cost_function = cost_function or "mse"
+        model._training_params = dict(training_params or {})
+        weights = np.asarray(weights).reshape(-1)
+        model.weights_ = (
+            weights
+            if weights.dtype == np.float64
+            else weights.astype(np.float64)
+        )
+        model.bias_ = float(bias)
+        model.history = (
+            [float(value) for value in history] if history is not None else []
+        )
+        model.feature_names_ = (
+            [str(name) for name in feature_names]
+            if feature_names is not None
+            else None
+        )
+        feature_map = cls._feature_map_from_array(feature_map)
+        if feature_map is None:
+            model._build_feature_map(int(n_raw_features))
+        else:
+            model._feature_map_ = feature_map
+            model._n_raw_features_ = int(n_raw_features)
+            if expansion_runs is not None and len(expansion_runs):
+                model._expansion_runs_ = np.asarray(
+                    expansion_runs, dtype=np.intp
+                ).reshape(-1, 4)
+            else:
+                model._build_expansion_runs()
+        if len(model._feature_map_) != model.weights_.shape[0]:
+            raise ValueError(
+                f"Model has {model.weights_.shape[0]} weights but degree "
+                f"{model._degree} over {model._n_raw_features_} features "
+                f"expands to {len(model._feature_map_)}"
+            )
+        model.is_fitted_ = True
+        return model
+
+    @classmethod
+    def _restore_from_state(
+        cls,
+        state: Dict[str, Any],
+        expansion_runs: Optional[np.ndarray] = None,
+    ) -> "PriceRegressionModel":
+        """Restore from ``_export_state_dict`` output (JSON and ``.prm``)."""
+        training_params = {
+            key: state.get(key)
+            for key in (
+                "learning_rate",
+                "num_iterations",
+                "log_every",
+                "mini_batch_size",
+                "solver",
+                "l2_penalty",
+                "initial_weights",
+                "initial_bias",
+                *cls.GD_DEFAULTS,
+            )
+            if key in state
+        }
+        model = cls._restore(
+            weights=np.asarray(state["weights"], dtype=np.float64),
+            bias=state["bias"],
+            degree=state["degree"],
+            n_raw_features=state["n_raw_features"],
+            cost_function=state.get("cost_function"),
+            feature_map=state.get("feature_map"),
+            expansion_runs=expansion_runs,
+            training_params=training_params,
+            history=state.get("history"),
+            feature_names=state.get("feature_names"),
+        )
+        model.validation_history = list(state.get("validation_history") or [])
+        model.n_epochs_ = int(state.get("n_epochs") or len(model.history))
+        model.fit_seconds_ = float(state.get("fit_seconds") or 0.0)
+        model.final_loss_ = state.get("final_loss")
+        return model
+
+    @classmethod
+    def _load_pickled(cls, path: Path, fmt: str) -> "PriceRegressionModel":
+        if fmt == "joblib":
+            try:
+                joblib = importlib.import_module("joblib")
+            except ImportError as exc:  # pragma: no cover - optional dependency
+                raise ImportError(
+                    "joblib is required to load .joblib files"
+                ) from exc
+            model = joblib.load(path)
+        else:
+            with path.open("rb") as file_obj:
+                model = pickle.load(file_obj)
+        if not isinstance(model, cls):
+            raise ValueError(
+                f"{path} holds a {type(model).__name__}, not a {cls.__name__}"
+            )
+        return model
+
+    @classmethod
+    def _load_json(cls, path: Path) -> "PriceRegressionModel":
+        with path.open("r", encoding="utf-8") as file_obj:
+            return cls._restore_from_state(json.load(file_obj))
+
+    @classmethod
+    def _load_numpy(
+        cls, path: Path, fmt: str, mmap_mode: Optional[str] = None
+    ) -> "PriceRegressionModel":
+        if fmt == "npy":
+            try:
+                record = np.load(path, mmap_mode=mmap_mode, allow_pickle=False)
+            except ValueError:
+                # Saves from before the structured layout hold a pickled
+                # dict; they still load, but cannot be memory-mapped.
+                payload = np.load(path, allow_pickle=True).item()
+            else:
+                payload = {
+                    name: record[name][0] for name in record.dtype.names
+                }
+        else:
+            # Object-dtype feature maps from older saves need pickle too.
+            with np.load(path, allow_pickle=True) as archive:
+                payload = {key: archive[key] for key in archive.files}
+        cost = payload.get("cost_function")
+        names = payload.get("feature_names")
+        return cls._restore(
+            weights=payload["weights"],
+            bias=float(payload["bias"][0]),
+            degree=int(payload["degree"][0]),
+            n_raw_features=int(payload["n_raw_features"][0]),
+            cost_function=str(cost[0]) if cost is not None else None,
+            feature_map=payload.get("feature_map"),
+            expansion_runs=payload.get("expansion_runs"),
+            history=payload.get("history"),
+            feature_names=names.tolist() if names is not None else None,
+        )
+
+    @classmethod
+    def _load_pth(cls, path: Path) -> "PriceRegressionModel":
+        try:
+            torch = importlib.import_module("torch")
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise ImportError(
+                "PyTorch is required to load .pth files"
+            ) from exc
+        state = torch.load(path, map_location="cpu", weights_only=True)
+        metadata = dict(state.get("metadata") or {})
+        cost_function = metadata.pop("cost_function", None)
+        history = metadata.pop("history", None)
+        feature_names = metadata.pop("feature_names", None)
+        return cls._restore(
+            weights=state["weights"].numpy(),
+            bias=float(state["bias"][0]),
+            degree=int(state["degree"]),
+            n_raw_features=int(state["n_raw_features"]),
+            cost_function=cost_function,
+            feature_map=state.get("feature_map"),
+            training_params=metadata,
+            history=history,
+            feature_names=feature_names,
+        )
+
+    @classmethod
+    def _load_onnx(cls, path: Path) -> "PriceRegressionModel":
+        try:
+            onnx = importlib.import_module("onnx")
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise ImportError("onnx is required to load .onnx files") from exc
+        numpy_helper = onnx.numpy_helper
+        model = onnx.load(path)
+        tensors = {
+            tensor.name: numpy_helper.to_array(tensor)
+            for tensor in model.graph.initializer
+        }
+        weights = tensors["weights_const"].reshape(-1)
+        props = {prop.key: prop.value for prop in model.metadata_props}
+        # Graphs exported before the metadata was added carry no degree;
+        # read them as linear over their input columns.
+        return cls._restore(
+            weights=weights,
+            bias=float(tensors["bias_const"].reshape(-1)[0]),
+            degree=int(props.get("degree", 1)),
+            n_raw_features=int(props.get("n_raw_features", weights.shape[0])),
+            cost_function=props.get("cost_function"),
+        )
+
+    @classmethod
+    def _load_prm(
+        cls, path: Path, mmap_mode: Optional[str]
+    ) -> "PriceRegressionModel":
+        with path.open("rb") as file_obj:
+            if file_obj.read(len(PRM_MAGIC)) != PRM_MAGIC:
+                raise ValueError(f"{path} is not a .prm model file")
+            header_size = int.from_bytes(file_obj.read(8), "little")
+            header = json.loads(file_obj.read(header_size))
+            if header.get("format_version") != PRM_FORMAT_VERSION:
+                raise ValueError(f"Unsupported .prm format version in {path}")
+            data_start = _align(len(PRM_MAGIC) + 8 + header_size)
+            arrays: Dict[str, np.ndarray] = {}
+            for name, spec in header["arrays"].items():
+                dtype = np.dtype(spec["dtype"])
+                shape = tuple(spec["shape"])
+                offset = data_start + spec["offset"]
+                if mmap_mode is not None and 0 not in shape:
+                    arrays[name] = np.memmap(
+                        path, dtype=dtype, mode=mmap_mode, offset=offset,
+                        shape=shape,
+                    )
+                else:
+                    file_obj.seek(offset)
+                    count = int(np.prod(shape))
+                    arrays[name] = np.fromfile(
+                        file_obj, dtype=dtype, count=count
+                    ).reshape(shape)
+        state = {
+            **header["state"],
+            "weights": arrays["weights"],
+            "feature_map": arrays["feature_map"],
+            "history": header.get("history"),
+        }
+        return cls._restore_from_state(state, arrays.get("expansion_runs"))
+
+    @classmethod
+    def load(
+        cls,
+        path: Union[str, Path],
+        fmt: Optional[str] = None,
+        *,
+        mmap_mode: Optional[str] = None,
+    ) -> "PriceRegressionModel":
+        """Load a model written by ``save`` in any supported format.
+
+        Args:
+            path: File to read.
+            fmt: File format; if None, inferred from the file extension.
+            mmap_mode: For ``.prm`` and ``.npy`` files, memory-map the
+                arrays instead of reading them (``"r"`` read-only, ``"c"`` copy-on-write).
+                A read-only model predicts but cannot be trained further.
+
+        Returns:
+            PriceRegressionModel: A fitted model ready for ``predict``.
+
+        Raises:
+            ValueError: If the format is unsupported or the file is not a
+                ``PriceRegressionModel``.
+            ImportError: If required library for format is not installed.
+
+        ``.pth`` and ``.onnx`` files store float32 weights, so models loaded
+        from them differ from the original by float32 rounding.
+        """
+        path = Path(path)
+        resolved_fmt = (
+            fmt.lower() if fmt else path.suffix.lstrip(".").lower() or "pkl"
+        )
+        if resolved_fmt not in cls.SUPPORTED_SAVE_FORMATS:
+            supported_display = ", ".join(
+                f".{ext}" for ext in cls.SUPPORTED_SAVE_FORMATS
+            )
+            raise ValueError(
+                f"Unsupported format. Choose one of: {supported_display}"
+            )
+        if mmap_mode is not None and resolved_fmt not in ("prm", "npy"):
+            raise ValueError(
+                "mmap_mode is only supported for .prm and .npy files"
+            )
+        if resolved_fmt in ("pkl", "pickle", "joblib"):
+            return cls._load_pickled(path, resolved_fmt)
+        if resolved_fmt == "json":
+            return cls._load_json(path)
+        if resolved_fmt in ("npz", "npy"):
+            return cls._load_numpy(path, resolved_fmt, mmap_mode)
+        if resolved_fmt == "pth":
+            return cls._load_pth(path)
+        if resolved_fmt == "onnx":
+            return cls._load_onnx(path)
+        return cls._load_prm(path, mmap_mode)
+
     def get_training_history(self) -> List[float]:
         return list(self.history)
+
+    @classmethod
+    def fit_many(
+        cls,
+        X: Sequence[Sequence[float]],
+        y: Sequence[float],
+        configs: Sequence[Dict[str, Any]],
+        *,
+        degree: int = 1,
+        num_iterations: int = 1_000,
+        log_every: int = 1,
+        mini_batch_size: int = 25,
+        cost_function: str = "mse",
+        random_seed: Optional[int] = None,
+        optimizer: str = "sgd",
+        momentum: float = 0.9,
+        lr_decay: float = 1.0,
+        lr_decay_every: int = 1,
+        validation_fraction: float = 0.0,
+    ) -> Tuple[List["PriceRegressionModel"], List[Dict[str, Any]]]:
+        """Train one model per entry of ``configs`` in a single pass.
+
+        The K models share the feature expansion and every mini-batch;
+        their weights are kept as one ``(n_features, K)`` matrix so each
+        batch costs one matrix product for all K predictions and one for
+        all K gradients. With the same ``random_seed``, model ``k`` matches
+        ``fit(X, y, **configs[k], ...)`` up to floating-point rounding.
+
+        Args:
+            X: Training features of shape (n_samples, n_features).
+            y: Target values of shape (n_samples,).
+            configs: One dict per model with any of ``learning_rate``
+                (default 0.01), ``l2_penalty`` (default 0),
+                ``initial_weights`` and ``initial_bias``.
+            validation_fraction: Hold out this share of rows, report each
+                model's loss on them and keep each model's best weights, as
+                ``fit`` does (default: 0.0). There is no early stopping:
+                every model runs ``num_iterations`` epochs.
+            Other arguments: as for ``fit``, shared by all models.
+
+        Returns:
+            The fitted models, in ``configs`` order, and a comparison table
+            with one row per model (``pd.DataFrame(table)`` to tabulate):
+            its config, ``final_loss`` (last epoch's training loss), the
+            best ``validation_loss`` when a split was held out, and
+            ``rank`` by whichever was monitored.
+
+        Raises:
+            ValueError: If ``configs`` is empty, holds unknown keys, or any
+                hyperparameter is invalid.
+        """
+        started = time.perf_counter()
+        if not configs:
+            raise ValueError("configs must contain at least one entry")
+        allowed = {
+            "learning_rate",
+            "l2_penalty",
+            "initial_weights",
+            "initial_bias",
+        }
+        models: List[PriceRegressionModel] = []
+        for index, config in enumerate(configs):
+            unknown = set(config) - allowed
+            if unknown:
+                raise ValueError(
+                    f"configs[{index}] has unsupported keys: {sorted(unknown)}"
+                )
+            model = cls()
+            model._configure(
+                degree=degree,
+                learning_rate=config.get("learning_rate", 0.01),
+                num_iterations=num_iterations,
+                log_every=log_every,
+                mini_batch_size=mini_batch_size,
+                cost_function=cost_function,
+                initial_weights=config.get("initial_weights"),
+                initial_bias=config.get("initial_bias"),
+                solver="gd",
+                l2_penalty=config.get("l2_penalty", 0.0),
+                optimizer=optimizer,
+                momentum=momentum,
+                lr_decay=lr_decay,
+                lr_decay_every=lr_decay_every,
+                validation_fraction=validation_fraction,
+            )
+            models.append(model)
+
+        # One stacked trainer: weights (n_features, K), bias and per-model
+        # hyperparameters (K,), so the element-wise update rules apply to
+        # all columns at once.
+        trainer = cls()
+        trainer._configure(
+            degree=degree,
+            learning_rate=1.0,
+            num_iterations=num_iterations,
+            log_every=log_every,
+            mini_batch_size=mini_batch_size,
+            cost_function=cost_function,
+            initial_weights=None,
+            initial_bias=None,
+            solver="gd",
+            l2_penalty=0.0,
+            optimizer=optimizer,
+            momentum=momentum,
+            lr_decay=lr_decay,
+            lr_decay_every=lr_decay_every,
+        )
+        params = trainer._training_params
+        params["learning_rate"] = np.array(
+            [m._training_params["learning_rate"] for m in models]
+        )
+        params["l2_penalty"] = np.array(
+            [m._training_params["l2_penalty"] for m in models]
+        )
+
+        X_array, y_array = trainer._prepare_data(X, y)
+        trainer._setup_features(X_array.shape[1])
+        design_matrix = trainer._design_matrix(X_array)
+        n_features = design_matrix.shape[1]
+        columns = []
+        for model in models:
+            model._initialize_parameters(
+                n_features,
+                model._training_params["initial_weights"],
+                model._training_params["initial_bias"],
+            )
+            columns.append(model.weights_)
+        trainer.weights_ = np.column_stack(columns)
+        trainer.bias_ = np.array([m.bias_ for m in models])
+        trainer._optimizer_state_ = None
+
+        rng = np.random.default_rng(random_seed)
+        holdout = None
+        if validation_fraction:
+            n_holdout = int(round(validation_fraction * X_array.shape[0]))
+            if not 1 <= n_holdout < X_array.shape[0]:
+                raise ValueError(
+                    "validation_fraction leaves no rows to train or to "
+                    "validate on"
+                )
+            order = rng.permutation(X_array.shape[0])
+            holdout = (
+                design_matrix[order[:n_holdout]],
+                y_array[order[:n_holdout]],
+            )
+            design_matrix = design_matrix[order[n_holdout:]]
+            y_array = y_array[order[n_holdout:]]
+        buffers = trainer._epoch_buffers(design_matrix, y_array)
+
+        histories: List[np.ndarray] = []
+        validation: List[np.ndarray] = []
+        best_loss = np.full(len(models), np.inf)
+        best_weights, best_bias = trainer.weights_.copy(), trainer.bias_.copy()
+        hook = trainer._timing_hook()
+        for iteration in range(1, num_iterations + 1):
+            epoch_started = time.perf_counter()
+            batch_losses = trainer._run_epoch(
+                design_matrix,
+                y_array,
+                rng,
+                trainer._epoch_learning_rate(iteration),
+                buffers,
+            )
+            if hook is not None:
+                hook("epoch", time.perf_counter() - epoch_started)
+            epoch_loss = np.mean(batch_losses, axis=0)
+            if iteration % log_every == 0:
+                histories.append(epoch_loss)
+            if holdout is not None:
+                loss = trainer._compute_loss(
+                    holdout[1], trainer._predict_raw(holdout[0])
+                )
+                validation.append(loss)
+                improved = loss < best_loss
+                best_loss[improved] = loss[improved]
+                best_weights[:, improved] = trainer.weights_[:, improved]
+                best_bias[improved] = trainer.bias_[improved]
+        if holdout is not None:
+            trainer.weights_, trainer.bias_ = best_weights, best_bias
+
+        fit_seconds = time.perf_counter() - started
+        feature_names = (
+            [str(name) for name in X.columns]
+            if hasattr(X, "columns")
+            else None
+        )
+        table: List[Dict[str, Any]] = []
+        for k, model in enumerate(models):
+            model.weights_ = trainer.weights_[:, k].copy()
+            model.bias_ = float(trainer.bias_[k])
+            model._feature_map_ = trainer._feature_map_
+            model._expansion_runs_ = trainer._expansion_runs_
+            model._n_raw_features_ = trainer._n_raw_features_
+            model.feature_names_ = feature_names
+            model.history = [float(losses[k]) for losses in histories]
+            model.validation_history = [
+                float(losses[k]) for losses in validation
+            ]
+            model._record_run(
+                num_iterations,
+                started,
+                best_loss[k] if holdout is not None else epoch_loss[k],
+            )
+            model.fit_seconds_ = fit_seconds
+            row = {
+                "config": k,
+                "learning_rate": model._training_params["learning_rate"],
+                "l2_penalty": model._training_params["l2_penalty"],
+                "initial_bias": model._training_params["initial_bias"],
+                "initial_weights": model._training_params["initial_weights"]
+                is not None,
+                "final_loss": float(epoch_loss[k]),
+            }
+            if holdout is not None:
+                row["validation_loss"] = float(best_loss[k])
+            table.append(row)
+        key = "validation_loss" if holdout is not None else "final_loss"
+        ranked = sorted(
+            range(len(table)),
+            key=lambda k: (np.isnan(table[k][key]), table[k][key]),
+        )
+        for rank, k in enumerate(ranked, start=1):
+            table[k]["rank"] = rank
+        return models, table
+
+
+def _align(offset: int) -> int:
+    return -(-offset // PRM_ALIGN) * PRM_ALIGN
+
+
+def iter_csv_chunks(
+    path: Union[str, Path],
+    target_column: str,
+    *,
+    chunksize: int = 50_000,
+    feature_columns: Optional[Sequence[str]] = None,
+    dropna: bool = True,
+    **read_csv_kwargs: Any,
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Yield ``(X_chunk, y_chunk)`` float arrays from a CSV via pandas.
+
+    Intended as a ``fit_stream`` source, e.g. over
+    ``cleaned_combined_price_data.csv``. Wrap it in a ``lambda`` to train for
+    several epochs. Columns other than ``target_column`` are used as
+    features unless ``feature_columns`` is given; rows with missing values
+    are dropped when ``dropna`` is true.
+    """
+    try:
+        pd = importlib.import_module("pandas")
+    except ImportError as exc:  # pragma: no cover - optional dependency
+        raise ImportError("pandas is required to read CSV chunks") from exc
+    reader = pd.read_csv(path, chunksize=chunksize, **read_csv_kwargs)
+    for frame in reader:
+        columns = (
+            list(feature_columns)
+            if feature_columns is not None
+            else [col for col in frame.columns if col != target_column]
+        )
+        frame = frame[[*columns, target_column]]
+        if dropna:
+            frame = frame.dropna()
+        if frame.empty:
+            continue
+        yield (
+            frame[columns].to_numpy(dtype=np.float64),
+            frame[target_column].to_numpy(dtype=np.float64),
+        )
@@ -0,0 +1,408 @@
+"""Columnar ingestion cache for the assessment CSVs.
+
+Each CSV (one per fiscal year, ``fy2015.csv`` ... ``fy2025.csv``, or a
+derived file such as ``cleaned_combined_price_data.csv``) is parsed once into
+a directory of ``.npy`` columns plus a ``manifest.json``:
+
+- currency columns (``TOTAL_VALUE``, ``GROSS_TAX``, ...) are stripped of
+  ``$``/``,`` at ingestion time;
+- numeric columns are stored in the smallest type that holds every value
+  exactly (``ZIPCODE`` as ``int16``, integral dollar amounts ``int32``,
+  other floats ``float32`` when lossless); integer columns with gaps keep a
+  boolean mask;
+- text columns are stored as categorical codes with a category list.
+
+Entries remember the size and modification time of their source, so a
+refresh only re-parses new or changed files. Loading reads just the
+requested columns, which takes seconds instead of re-parsing hundreds of
+MB of text. Numbers load with the dtypes ``pd.read_csv`` gives (``int64``,
+``float64``, and ``float64`` with NaN for integers with gaps), so
+arithmetic on them cannot overflow a narrow type; ``narrow=True`` keeps
+the stored types instead, memory-mapped and with gaps as pandas nullable
+integers, for callers that only read the values.
+
+Usage::
+
+    df = load_fiscal_years()                          # every fyYYYY.csv
+    df = load_csv_cached(DATA_DIR / "cleaned_combined_price_data.csv")
+
+or ``python scripts/price_ingest.py`` to refresh the cache up front.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import argparse
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BACKEND_DIR / "datasets" / "price_datasets"
+CACHE_DIR = DATA_DIR / "columnar_cache"
+
+FORMAT_VERSION = 1
+FISCAL_YEAR_RE = re.compile(r"^fy(\d{4})\.csv$", re.IGNORECASE)
+CURRENCY_COLUMNS = (
+    "TOTAL_VALUE",
+    "GROSS_TAX",
+    "LAND_VALUE",
+    "BLDG_VALUE",
+    "SFYI_VALUE",
+)
+_INT_TYPES = (np.int8, np.int16, np.int32, np.int64)
+
+PathLike = Union[str, Path]
+
+
+def _source_fingerprint(path: Path) -> Dict[str, Any]:
+    stat = path.stat()
+    return {
+        "path": str(path.resolve()),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+
+
+def _parse_currency(series: pd.Series) -> pd.Series:
+    if pd.api.types.is_numeric_dtype(series):
+        return series
+    cleaned = (
+        series.astype(str)
+        .str.replace(r"[^0-9.-]", "", regex=True)
+        .replace("", np.nan)
+    )
+    return pd.to_numeric(cleaned, errors="coerce")
+
+
+def _encode_numeric(values: np.ndarray) -> Tuple[Dict[str, np.ndarray], str]:
+    """Smallest exact representation of a numeric column."""
+    if values.dtype == np.bool_:
+        return {"values": values}, "numeric"
+    values = values.astype(np.float64, copy=False)
+    missing = np.isnan(values)
+    present = values[~missing]
+    if present.size and np.array_equal(present, np.round(present)):
+        low, high = present.min(), present.max()
+        for dtype in _INT_TYPES:
+            info = np.iinfo(dtype)
+            if info.min <= low and high <= info.max:
+                ints = np.where(missing, 0, values).astype(dtype)
+                if missing.any():
+                    return {"values": ints, "mask": missing}, "masked"
+                return {"values": ints}, "numeric"
+    as_f32 = values.astype(np.float32)
+    if np.array_equal(as_f32.astype(np.float64), values, equal_nan=True):
+        return {"values": as_f32}, "numeric"
+    return {"values": values}, "numeric"
+
+
+def _encode_column(
+    name: str, series: pd.Series
+) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    if name.strip() in CURRENCY_COLUMNS:
+        series = _parse_currency(series)
+    if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(
+        series
+    ):
+        arrays, kind = _encode_numeric(series.to_numpy())
+        return arrays, {"kind": kind}
+    # Text: normalize mixed object columns to str before factorizing.
+    text = series.where(series.isna(), series.astype(str))
+    categorical = pd.Categorical(text)
+    return (
+        {"values": categorical.codes},
+        {"kind": "category", "categories": list(categorical.categories)},
+    )
+
+
+def _entry_dir(name: str, cache_dir: PathLike) -> Path:
+    return Path(cache_dir) / name
+
+
+def read_manifest(
+    name: str, cache_dir: PathLike = CACHE_DIR
+) -> Dict[str, Any]:
+    path = _entry_dir(name, cache_dir) / "manifest.json"
+    with path.open(encoding="utf-8") as f:
+        return json.load(f)
+
+
+def is_fresh(
+    csv_path: PathLike,
+    cache_dir: PathLike = CACHE_DIR,
+    name: Optional[str] = None,
+) -> bool:
+    """Whether the cached entry for ``csv_path`` matches the current file."""
+    csv_path = Path(csv_path)
+    try:
+        manifest = read_manifest(name or csv_path.stem, cache_dir)
+    except (OSError, ValueError):
+        return False
+    return (
+        manifest.get("format_version") == FORMAT_VERSION
+        and manifest.get("source") == _source_fingerprint(csv_path)
+    )
+
+
+def ingest_csv(
+    csv_path: PathLike,
+    cache_dir: PathLike = CACHE_DIR,
+    name: Optional[str] = None,
+    force: bool = False,
+) -> bool:
+    """Parse ``csv_path`` into the cache unless a fresh entry exists.
+
+    Returns ``True`` if the file was (re-)ingested. The entry is written to
+    a temporary directory and swapped in, so readers never see a partial
+    entry.
+    """
+    csv_path = Path(csv_path)
+    name = name or csv_path.stem
+    if not force and is_fresh(csv_path, cache_dir, name):
+        return False
+
+    started = time.perf_counter()
+    source = _source_fingerprint(csv_path)
+    frame = pd.read_csv(csv_path, low_memory=False)
+    target = _entry_dir(name, cache_dir)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=f".{name}-", dir=target.parent))
+    try:
+        columns = []
+        for idx, column in enumerate(frame.columns):
+            arrays, meta = _encode_column(column, frame[column])
+            stem = f"c{idx:03d}"
+            for suffix, array in arrays.items():
+                np.save(staging / f"{stem}.{suffix}.npy", array)
+            columns.append(
+                {
+                    "name": column,
+                    "file": stem,
+                    "dtype": str(arrays["values"].dtype),
+                    **meta,
+                }
+            )
+        manifest = {
+            "format_version": FORMAT_VERSION,
+            "source": source,
+            "rows": int(len(frame)),
+            "columns": columns,
+            "ingest_seconds": round(time.perf_counter() - started, 3),
+        }
+        with (staging / "manifest.json").open("w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+
+        stale = None
+        if target.exists():
+            stale = target.with_name(f".{name}-stale-{os.getpid()}")
+            os.replace(target, stale)
+        os.replace(staging, target)
+        if stale is not None:
+            shutil.rmtree(stale, ignore_errors=True)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return True
+
+
+def _decode_column(
+    entry: Path, meta: Dict[str, Any], mmap_mode: Optional[str]
+) -> Any:
+    values = np.load(entry / f"{meta['file']}.values.npy", mmap_mode=mmap_mode)
+    if meta["kind"] == "masked":
+        mask = np.load(entry / f"{meta['file']}.mask.npy")
+        return pd.arrays.IntegerArray(np.asarray(values), mask)
+    if meta["kind"] == "category":
+        return pd.Categorical.from_codes(
+            np.asarray(values), categories=meta["categories"]
+        )
+    return values
+
+
+def _widen(frame: pd.DataFrame) -> pd.DataFrame:
+    """``frame`` with the numeric dtypes ``pd.read_csv`` would give."""
+    widened = {}
+    for name, column in frame.items():
+        dtype = column.dtype
+        if isinstance(dtype, pd.CategoricalDtype) or dtype == np.bool_:
+            widened[name] = column
+        elif isinstance(dtype, pd.api.extensions.ExtensionDtype):
+            # Integers with gaps: float64 with NaN, or int64 if none here.
+            if column.isna().any():
+                widened[name] = column.to_numpy(np.float64, na_value=np.nan)
+            else:
+                widened[name] = column.to_numpy(np.int64)
+        elif pd.api.types.is_integer_dtype(dtype):
+            widened[name] = column.to_numpy(np.int64)
+        else:
+            widened[name] = column.to_numpy(np.float64)
+    return pd.DataFrame(widened, index=frame.index)
+
+
+def load_cached(
+    name: str,
+    cache_dir: PathLike = CACHE_DIR,
+    columns: Optional[Sequence[str]] = None,
+    mmap_mode: Optional[str] = "r",
+    narrow: bool = False,
+) -> pd.DataFrame:
+    """Load one cached entry; only ``columns`` are read when given.
+
+    Requested columns the entry does not have come back as all-missing, as
+    they would from ``pd.concat`` over files with different schemas. With
+    ``narrow`` the stored (downcast) types are returned as they are.
+    """
+    entry = _entry_dir(name, cache_dir)
+    manifest = read_manifest(name, cache_dir)
+    by_name = {meta["name"]: meta for meta in manifest["columns"]}
+    wanted = list(columns) if columns is not None else list(by_name)
+    data = {}
+    for column in wanted:
+        meta = by_name.get(column)
+        if meta is None:
+            data[column] = np.full(manifest["rows"], np.nan, dtype=np.float32)
+        else:
+            data[column] = _decode_column(entry, meta, mmap_mode)
+    frame = pd.DataFrame(data, index=pd.RangeIndex(manifest["rows"]))
+    return frame if narrow else _widen(frame)
+
+
+def load_csv_cached(
+    csv_path: PathLike,
+    cache_dir: PathLike = CACHE_DIR,
+    columns: Optional[Sequence[str]] = None,
+    narrow: bool = False,
+) -> pd.DataFrame:
+    """``pd.read_csv`` replacement backed by the columnar cache."""
+    csv_path = Path(csv_path)
+    ingest_csv(csv_path, cache_dir)
+    return load_cached(csv_path.stem, cache_dir, columns, narrow=narrow)
+
+
+def fiscal_year_sources(source_dir: PathLike = DATA_DIR) -> Dict[int, Path]:
+    """``{year: path}`` for every ``fyYYYY.csv`` in ``source_dir``."""
+    sources = {}
+    for path in Path(source_dir).iterdir():
+        match = FISCAL_YEAR_RE.match(path.name)
+        if match:
+            sources[int(match.group(1))] = path
+    return dict(sorted(sources.items()))
+
+
+def refresh_fiscal_years(
+    source_dir: PathLike = DATA_DIR,
+    cache_dir: PathLike = CACHE_DIR,
+    force: bool = False,
+) -> List[int]:
+    """Ingest new or changed fiscal-year files; returns the years parsed."""
+    return [
+        year
+        for year, path in fiscal_year_sources(source_dir).items()
+        if ingest_csv(path, cache_dir, force=force)
+    ]
+
+
+def _missing_like(template: pd.Series, n_rows: int) -> Any:
+    """All-missing column that keeps ``template``'s kind under concat."""
+    dtype = template.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        return pd.Categorical([np.nan] * n_rows)
+    if pd.api.types.is_integer_dtype(dtype):
+        values = np.zeros(n_rows, dtype=getattr(dtype, "numpy_dtype", dtype))
+        return pd.arrays.IntegerArray(values, np.ones(n_rows, dtype=bool))
+    return np.full(n_rows, np.nan, dtype=np.float32)
+
+
+def _concat_columns(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    names: Dict[str, None] = {}
+    for frame in frames:
+        names.update(dict.fromkeys(frame.columns))
+    combined = {}
+    for name in names:
+        template = next(frame[name] for frame in frames if name in frame)
+        parts = [
+            frame[name]
+            if name in frame
+            else pd.Series(_missing_like(template, len(frame)))
+            for frame in frames
+        ]
+        if all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+            combined[name] = union_categoricals(
+                [part.array for part in parts], ignore_order=True
+            )
+        else:
+            combined[name] = pd.concat(parts, ignore_index=True)
+    return pd.DataFrame(combined)
+
+
+def load_fiscal_years(
+    years: Optional[Sequence[int]] = None,
+    source_dir: PathLike = DATA_DIR,
+    cache_dir: PathLike = CACHE_DIR,
+    columns: Optional[Sequence[str]] = None,
+    year_column: Optional[str] = None,
+    narrow: bool = False,
+) -> pd.DataFrame:
+    """Concatenate cached fiscal years (refreshing stale ones first).
+
+    Equivalent to reading and ``pd.concat``-ing the ``fyYYYY.csv`` files,
+    with currency columns already numeric. ``year_column`` optionally adds
+    the fiscal year of each row; ``narrow`` is as for ``load_cached``.
+    """
+    sources = fiscal_year_sources(source_dir)
+    selected = sorted(sources) if years is None else list(years)
+    missing = [year for year in selected if year not in sources]
+    if missing:
+        raise FileNotFoundError(
+            f"No fiscal-year CSV for {missing} in {source_dir}"
+        )
+    frames = []
+    for year in selected:
+        ingest_csv(sources[year], cache_dir)
+        frame = load_cached(
+            sources[year].stem, cache_dir, columns, narrow=True
+        )
+        if year_column is not None:
+            frame[year_column] = np.int16(year)
+        frames.append(frame)
+    if not frames:
+        raise ValueError("No fiscal years selected")
+    combined = _concat_columns(frames)
+    return combined if narrow else _widen(combined)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source-dir", type=Path, default=DATA_DIR)
+    parser.add_argument("--cache-dir", type=Path, default=CACHE_DIR)
+    parser.add_argument(
+        "--extra",
+        type=Path,
+        nargs="*",
+        default=[],
+        help="other CSVs to cache, e.g. cleaned_combined_price_data.csv",
+    )
+    parser.add_argument("--force", action="store_true")
+    args = parser.parse_args(argv)
+
+    sources = list(fiscal_year_sources(args.source_dir).values()) + args.extra
+    for path in sources:
+        started = time.perf_counter()
+        ingested = ingest_csv(path, args.cache_dir, force=args.force)
+        status = "ingested" if ingested else "fresh"
+        print(
+            f"{path.name}: {status} "
+            f"({time.perf_counter() - started:.2f}s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,711 @@
+"""Nested ridge cross-validation from per-fold sufficient statistics.
+
+``price_model.ipynb`` and ``price_model_linear.ipynb`` score
+``PolynomialFeatures -> StandardScaler -> RidgeCV(cv=5)`` (inside a
+``TransformedTargetRegressor``) on 10 shuffled outer folds, refitting every
+pipeline from scratch. All of those fits only depend on the cross products
+``[1, X_poly, y]^T [1, X_poly, y]`` of the rows involved, so this module:
+
+- streams the rows in chunks and accumulates the cross products of every
+  outer fold and every (outer fold, inner block) pair, for the highest degree
+  only -- lower degrees are leading column subsets of the same expansion;
+- derives each training split as a difference of totals (all rows minus the
+  outer fold, outer training rows minus the inner block), including the
+  standardization the pipeline would fit on it;
+- solves the whole alpha grid with one symmetric eigendecomposition per split.
+
+Fold assignment, alpha selection (highest mean inner R^2) and the reported
+MSEs follow scikit-learn, and ``write_artifacts`` writes the same
+``ridge_poly_*`` files as the notebooks. From a notebook::
+
+    report = run_ridge_cv(X, y)
+    write_artifacts(report, OUTPUT_DIR)
+
+or ``python scripts/ridge_cv.py --data <csv> --output-dir <dir>``.
+
+Memory is about ``2 * n_splits + 3`` matrices of ``(n_poly + 2) ** 2``
+float64 values (~0.6 GB for 20 raw features at degree 3), independent of the
+number of rows.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import argparse
+import pickle
+
+import numpy as np
+import pandas as pd
+from sklearn.compose import TransformedTargetRegressor
+from sklearn.linear_model import RidgeCV
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import PolynomialFeatures, StandardScaler
+
+from price_ingest import CACHE_DIR, load_csv_cached
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+DATA_PATH = (
+    BACKEND_DIR
+    / "datasets"
+    / "price_datasets"
+    / "cleaned_combined_price_data.csv"
+)
+OUTPUT_DIR = BACKEND_DIR / "artifacts" / "price_model"
+TARGET_COL = "TOTAL_VALUE"
+
+DEFAULT_DEGREES = (1, 2, 3)
+DEFAULT_ALPHAS = (0.01, 0.1, 1.0, 10.0, 100.0)
+DEFAULT_CHUNK_ROWS = 8192
+CONDITIONING_SAMPLE_ROWS = 65536
+
+SUMMARY_FILE = "ridge_poly_cv_summary.csv"
+FOLDS_FILE = "ridge_poly_cv_folds.csv"
+BEST_FOLDS_FILE = "ridge_poly_best_folds.csv"
+BEST_JSON_FILE = "ridge_poly_best_model.json"
+BEST_MODEL_FILE = "ridge_poly_best_model.pkl"
+
+
+def kfold_labels(
+    n_samples: int, n_splits: int, seed: Optional[int]
+) -> np.ndarray:
+    """Outer fold of each row, as ``KFold(n_splits, shuffle=True)`` sets it."""
+    if not 2 <= n_splits <= n_samples:
+        raise ValueError(
+            f"n_splits must be between 2 and n_samples ({n_samples}); "
+            f"got {n_splits}"
+        )
+    indices = np.arange(n_samples)
+    np.random.RandomState(seed).shuffle(indices)
+    sizes = np.full(n_splits, n_samples // n_splits)
+    sizes[: n_samples % n_splits] += 1
+    labels = np.empty(n_samples, dtype=np.intp)
+    start = 0
+    for fold, size in enumerate(sizes):
+        labels[indices[start:start + size]] = fold
+        start += size
+    return labels
+
+
+def inner_cut_points(
+    labels: np.ndarray, fold: Optional[int], n_inner: int
+) -> np.ndarray:
+    """Row positions delimiting the unshuffled inner ``KFold`` blocks.
+
+    The training rows of ``fold`` (all rows when ``fold`` is ``None``) keep
+    their original order, so inner block ``j`` is every such row in
+    ``[cuts[j], cuts[j + 1])``.
+    """
+    n_samples = labels.shape[0]
+    if fold is None:
+        rows = np.arange(n_samples)
+    else:
+        rows = np.flatnonzero(labels != fold)
+    if n_inner < 2 or rows.size < n_inner:
+        raise ValueError(
+            f"Cannot split {rows.size} training rows into "
+            f"{n_inner} inner folds"
+        )
+    sizes = np.full(n_inner, rows.size // n_inner)
+    sizes[: rows.size % n_inner] += 1
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    cuts = np.empty(n_inner + 1, dtype=np.intp)
+    cuts[:-1] = rows[starts]
+    cuts[0] = 0
+    cuts[-1] = n_samples
+    return cuts
+
+
+@dataclass(frozen=True)
+class Moments:
+    """Row count, means and centered cross products of ``[X_poly, y]``."""
+
+    n: float
+    mean: np.ndarray
+    cross: np.ndarray
+
+    @classmethod
+    def from_gram(
+        cls, gram: np.ndarray, columns: Optional[np.ndarray] = None
+    ) -> "Moments":
+        """Build from an uncentered ``[1, X_poly, y]`` cross-product matrix."""
+        if columns is not None:
+            gram = gram[np.ix_(columns, columns)]
+        n = gram[0, 0]
+        mean = gram[0, 1:] / n
+        cross = gram[1:, 1:] - n * np.outer(mean, mean)
+        return cls(n=float(n), mean=mean, cross=cross)
+
+
+def standard_scale(
+    moments: Moments, shift: np.ndarray, scale: np.ndarray
+) -> np.ndarray:
+    """Column scales ``StandardScaler`` would fit, in conditioned units.
+
+    ``shift``/``scale`` map raw columns to the conditioned ones the moments
+    were accumulated in; constant columns get a raw scale of 1, like
+    scikit-learn.
+    """
+    var = np.clip(np.diag(moments.cross) / moments.n, 0.0, None)
+    raw_var = var * scale**2
+    raw_mean = moments.mean * scale + shift
+    eps = np.finfo(np.float64).eps
+    constant = raw_var <= (
+        moments.n * eps * raw_var + (moments.n * raw_mean * eps) ** 2
+    )
+    return np.where(constant, 1.0 / scale, np.sqrt(var))
+
+
+def ridge_path(
+    train: Moments, col_scale: np.ndarray, alphas: Sequence[float]
+) -> np.ndarray:
+    """Standardized-ridge slopes for every alpha, shape ``(p, n_alphas)``.
+
+    Solves ``(Z'Z + alpha I) w = Z'y`` on the centered, standardized columns
+    with one eigendecomposition and maps ``w`` back to conditioned units.
+    """
+    sx, sy = col_scale[:-1], col_scale[-1]
+    gram = train.cross[:-1, :-1] / np.outer(sx, sx)
+    rhs = train.cross[:-1, -1] / (sx * sy)
+    eigvals, eigvecs = np.linalg.eigh(gram)
+    shrink = 1.0 / (eigvals[:, None] + np.asarray(alphas)[None, :])
+    coef = eigvecs @ (shrink * (eigvecs.T @ rhs)[:, None])
+    return coef * (sy / sx)[:, None]
+
+
+def residual_sse(
+    evaluated: Moments, fitted: Moments, slopes: np.ndarray
+) -> np.ndarray:
+    """Sum of squared residuals on ``evaluated`` for models fit on ``fitted``.
+
+    The intercept places the fit through ``fitted``'s means, as a ridge fit
+    with ``fit_intercept=True`` does.
+    """
+    cxx = evaluated.cross[:-1, :-1]
+    cxy = evaluated.cross[:-1, -1]
+    cyy = evaluated.cross[-1, -1]
+    offset = (evaluated.mean[-1] - fitted.mean[-1]) - (
+        evaluated.mean[:-1] - fitted.mean[:-1]
+    ) @ slopes
+    return (
+        cyy
+        - 2.0 * (cxy @ slopes)
+        + np.einsum("pa,pa->a", slopes, cxx @ slopes)
+        + evaluated.n * offset**2
+    )
+
+
+def r2_scores(evaluated: Moments, sse: np.ndarray) -> np.ndarray:
+    """``r2_score`` on ``evaluated`` given the residual sums of squares."""
+    sst = evaluated.cross[-1, -1]
+    if sst <= 0:
+        return np.where(sse <= 0, 1.0, 0.0)
+    return 1.0 - sse / sst
+
+
+class PolynomialDesign:
+    """Chunked ``[1, X_poly, y]`` blocks in a well-conditioned basis.
+
+    Columns are shifted and scaled by statistics of a strided row sample so
+    the accumulated cross products stay far from float64 cancellation;
+    every quantity derived from them is invariant to that affine change.
+    """
+
+    def __init__(
+        self,
+        X: np.ndarray,
+        y: np.ndarray,
+        degree: int,
+        sample_rows: int = CONDITIONING_SAMPLE_ROWS,
+    ) -> None:
+        self.X = X
+        self.y = y
+        self.poly = PolynomialFeatures(degree=degree, include_bias=False)
+        self.poly.fit(X[:1])
+        self.n_poly = int(self.poly.n_output_features_)
+        stride = max(1, X.shape[0] // sample_rows)
+        sample = self._raw_block(slice(None, None, stride))
+        self.shift = sample.mean(axis=0)
+        scale = sample.std(axis=0)
+        self.scale = np.where(scale > 0, scale, 1.0)
+
+    def _raw_block(self, rows: slice) -> np.ndarray:
+        X_poly = self.poly.transform(self.X[rows])
+        return np.column_stack([X_poly, self.y[rows]])
+
+    def block(self, start: int, stop: int) -> np.ndarray:
+        out = np.empty((stop - start, self.n_poly + 2))
+        out[:, 0] = 1.0
+        out[:, 1:] = self._raw_block(slice(start, stop))
+        out[:, 1:] -= self.shift
+        out[:, 1:] /= self.scale
+        return out
+
+    def columns(self, degree: int) -> np.ndarray:
+        """Indices of the ``[1, X_poly(degree), y]`` columns."""
+        n_cols = int(
+            PolynomialFeatures(degree=degree, include_bias=False)
+            .fit(self.X[:1])
+            .n_output_features_
+        )
+        return np.r_[0 : n_cols + 1, self.n_poly + 1]
+
+    def train_scale(self, gram: np.ndarray, columns: np.ndarray) -> np.ndarray:
+        """``StandardScaler`` scales fitted on the rows behind ``gram``."""
+        raw = columns[1:] - 1
+        return standard_scale(
+            Moments.from_gram(gram, columns), self.shift[raw], self.scale[raw]
+        )
+
+    def label_grams(
+        self,
+        labels: np.ndarray,
+        n_labels: int,
+        start: int,
+        stop: int,
+    ) -> Iterator[Tuple[int, np.ndarray]]:
+        """Cross products of rows ``[start, stop)`` grouped by label."""
+        block = self.block(start, stop)
+        chunk_labels = labels[start:stop]
+        order = np.argsort(chunk_labels, kind="stable")
+        counts = np.bincount(chunk_labels, minlength=n_labels)
+        block = block[order]
+        offset = 0
+        for label, count in enumerate(counts):
+            if count:
+                part = block[offset:offset + count]
+                yield label, part.T @ part
+            offset += count
+
+
+def _segments(
+    n_samples: int, chunk_rows: int, cuts: Sequence[int] = ()
+) -> List[Tuple[int, int]]:
+    bounds = sorted(
+        set(range(0, n_samples, chunk_rows)) | set(cuts) | {n_samples}
+    )
+    return [(a, b) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+def accumulate_label_grams(
+    design: PolynomialDesign,
+    labels: np.ndarray,
+    n_labels: int,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> np.ndarray:
+    """Cross-product matrix of every row label, shape ``(n_labels, q, q)``."""
+    q = design.n_poly + 2
+    grams = np.zeros((n_labels, q, q))
+    for start, stop in _segments(labels.shape[0], chunk_rows):
+        for label, gram in design.label_grams(labels, n_labels, start, stop):
+            grams[label] += gram
+    return grams
+
+
+def stream_inner_blocks(
+    design: PolynomialDesign,
+    labels: np.ndarray,
+    n_splits: int,
+    n_inner: int,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> Iterator[Tuple[Optional[int], int, np.ndarray]]:
+    """Yield ``(fold, block, gram)`` for every inner validation block.
+
+    ``fold`` is ``None`` for the inner split of the full dataset (the final
+    refit). Each block is yielded as soon as its last row has been read, so
+    only one running matrix per fold is kept.
+    """
+    n_samples = labels.shape[0]
+    events: Dict[int, List[Tuple[Optional[int], int]]] = {}
+    folds: List[Optional[int]] = [*range(n_splits), None]
+    for fold in folds:
+        cuts = inner_cut_points(labels, fold, n_inner)
+        for block, cut in enumerate(cuts[1:]):
+            events.setdefault(int(cut), []).append((fold, block))
+
+    q = design.n_poly + 2
+    running = np.zeros((n_splits, q, q))
+    running_all = np.zeros((q, q))
+    chunk_total = np.empty((q, q))
+    for start, stop in _segments(n_samples, chunk_rows, events):
+        chunk_total.fill(0.0)
+        for label, gram in design.label_grams(labels, n_splits, start, stop):
+            chunk_total += gram
+            running[label] -= gram
+        running += chunk_total
+        running_all += chunk_total
+        for fold, block in events.get(stop, ()):
+            if fold is None:
+                yield fold, block, running_all.copy()
+                running_all.fill(0.0)
+            else:
+                yield fold, block, running[fold].copy()
+                running[fold].fill(0.0)
+
+
+def inner_block_r2(
+    train_gram: np.ndarray,
+    block_gram: np.ndarray,
+    columns: np.ndarray,
+    train_scale: np.ndarray,
+    alphas: np.ndarray,
+) -> np.ndarray:
+    """R^2 per alpha on one inner block, fitting on the rest of the split."""
+    held_out = Moments.from_gram(block_gram, columns)
+    fitted = Moments.from_gram(train_gram - block_gram, columns)
+    slopes = ridge_path(fitted, train_scale, alphas)
+    return r2_scores(held_out, residual_sse(held_out, fitted, slopes))
+
+
+def pick_alpha(block_r2: np.ndarray) -> int:
+    """Best mean inner score; the first on ties, like ``GridSearchCV``."""
+    return int(np.argmax(block_r2.mean(axis=0)))
+
+
+def outer_fold_scores(
+    train_gram: np.ndarray,
+    val_gram: np.ndarray,
+    columns: np.ndarray,
+    train_scale: np.ndarray,
+    alpha: float,
+    y_scale: float,
+) -> Dict[str, float]:
+    """Refit on the outer training rows and report train/validation MSE."""
+    train = Moments.from_gram(train_gram, columns)
+    val = Moments.from_gram(val_gram, columns)
+    slopes = ridge_path(train, train_scale, [alpha])
+    y_unit = y_scale**2
+    return {
+        "train_mse": float(
+            residual_sse(train, train, slopes)[0] * y_unit / train.n
+        ),
+        "val_mse": float(residual_sse(val, train, slopes)[0] * y_unit / val.n),
+        "alpha": float(alpha),
+        "train_size": int(round(train.n)),
+        "val_size": int(round(val.n)),
+    }
+
+
+def log_fold(row: Dict[str, float], n_splits: int) -> None:
+    print(
+        f"Degree {row['degree']} | Fold {row['fold']}/{n_splits} | "
+        f"train MSE: {row['train_mse']:.2f} | val MSE: {row['val_mse']:.2f} | "
+        f"alpha: {row['alpha']}"
+    )
+
+
+def summarize_folds(fold_df: pd.DataFrame) -> pd.DataFrame:
+    """Per-degree means/stds in the ``ridge_poly_cv_summary`` layout."""
+    summary_rows = []
+    for degree, group in fold_df.groupby("degree", sort=True):
+        summary_rows.append(
+            {
+                "degree": int(degree),
+                "val_mse_mean": float(np.mean(group["val_mse"])),
+                "val_mse_std": float(np.std(group["val_mse"])),
+                "train_mse_mean": float(np.mean(group["train_mse"])),
+                "train_mse_std": float(np.std(group["train_mse"])),
+                "alpha_mean": float(np.mean(group["alpha"])),
+                "alpha_mode": float(group["alpha"].mode().iloc[0]),
+            }
+        )
+    return pd.DataFrame(summary_rows)
+
+
+def prepare_inputs(
+    X: Union[pd.DataFrame, np.ndarray],
+    y: Union[pd.Series, np.ndarray],
+    degrees: Sequence[int],
+    alphas: Sequence[float],
+) -> Tuple[np.ndarray, np.ndarray, List[int], Tuple[float, ...]]:
+    X_array = np.asarray(X, dtype=np.float64)
+    y_array = np.asarray(y, dtype=np.float64).reshape(-1)
+    if X_array.ndim != 2 or X_array.shape[0] != y_array.shape[0]:
+        raise ValueError("X must be 2D with one row per target value")
+    degrees = sorted(set(int(d) for d in degrees))
+    if not degrees or degrees[0] < 1:
+        raise ValueError("degrees must contain positive integers")
+    return X_array, y_array, degrees, tuple(float(a) for a in alphas)
+
+
+@dataclass
+class RidgeCVReport:
+    """Outcome of :func:`run_ridge_cv`, mirroring the notebook's frames."""
+
+    summary: pd.DataFrame
+    folds: pd.DataFrame
+    full_data_alphas: Dict[int, float]
+    alphas: Tuple[float, ...]
+    n_splits: int
+    inner_splits: int
+    n_rows: int
+    n_features: int
+
+    @property
+    def best_degree(self) -> int:
+        best_idx = self.summary["val_mse_mean"].idxmin()
+        return int(self.summary.loc[best_idx, "degree"])
+
+    @property
+    def best_alpha(self) -> float:
+        return self.full_data_alphas[self.best_degree]
+
+
+def run_ridge_cv(
+    X: Union[pd.DataFrame, np.ndarray],
+    y: Union[pd.Series, np.ndarray],
+    degrees: Sequence[int] = DEFAULT_DEGREES,
+    n_splits: int = 10,
+    seed: Optional[int] = 42,
+    alphas: Sequence[float] = DEFAULT_ALPHAS,
+    *,
+    inner_splits: int = 5,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    verbose: bool = True,
+) -> RidgeCVReport:
+    """Nested CV equivalent to the notebooks' ``evaluate_degrees``.
+
+    Also selects the alpha that ``RidgeCV`` would pick when refit on all
+    rows (reported as ``best.alpha`` in the JSON artifact).
+    """
+    X_array, y_array, degrees, alphas = prepare_inputs(X, y, degrees, alphas)
+    alpha_grid = np.asarray(alphas)
+
+    labels = kfold_labels(X_array.shape[0], n_splits, seed)
+    design = PolynomialDesign(X_array, y_array, degrees[-1])
+    outer = accumulate_label_grams(design, labels, n_splits, chunk_rows)
+    total = outer.sum(axis=0)
+    columns = {degree: design.columns(degree) for degree in degrees}
+    folds: List[Optional[int]] = [*range(n_splits), None]
+
+    def train_gram(fold: Optional[int]) -> np.ndarray:
+        return total if fold is None else total - outer[fold]
+
+    train_scales = {
+        (fold, degree): design.train_scale(train_gram(fold), cols)
+        for fold in folds
+        for degree, cols in columns.items()
+    }
+    inner_r2 = {
+        key: np.empty((inner_splits, alpha_grid.size)) for key in train_scales
+    }
+    for fold, block, block_gram in stream_inner_blocks(
+        design, labels, n_splits, inner_splits, chunk_rows
+    ):
+        for degree, cols in columns.items():
+            inner_r2[fold, degree][block] = inner_block_r2(
+                train_gram(fold),
+                block_gram,
+                cols,
+                train_scales[fold, degree],
+                alpha_grid,
+            )
+
+    fold_rows = []
+    for degree in degrees:
+        for fold in range(n_splits):
+            row = {"degree": degree, "fold": fold + 1}
+            row.update(
+                outer_fold_scores(
+                    train_gram(fold),
+                    outer[fold],
+                    columns[degree],
+                    train_scales[fold, degree],
+                    alphas[pick_alpha(inner_r2[fold, degree])],
+                    design.scale[-1],
+                )
+            )
+            fold_rows.append(row)
+            if verbose:
+                log_fold(row, n_splits)
+
+    fold_df = pd.DataFrame(fold_rows)
+    return RidgeCVReport(
+        summary=summarize_folds(fold_df),
+        folds=fold_df,
+        full_data_alphas={
+            degree: alphas[pick_alpha(inner_r2[None, degree])]
+            for degree in degrees
+        },
+        alphas=alphas,
+        n_splits=n_splits,
+        inner_splits=inner_splits,
+        n_rows=int(X_array.shape[0]),
+        n_features=int(X_array.shape[1]),
+    )
+
+
+def evaluate_degrees(
+    X: Union[pd.DataFrame, np.ndarray],
+    y: Union[pd.Series, np.ndarray],
+    degrees: Sequence[int] = DEFAULT_DEGREES,
+    n_splits: int = 10,
+    seed: Optional[int] = 42,
+    alphas: Sequence[float] = DEFAULT_ALPHAS,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Drop-in replacement for the notebook function of the same name."""
+    report = run_ridge_cv(X, y, degrees, n_splits, seed, alphas)
+    return report.summary, report.folds
+
+
+def make_regressor(
+    degree: int,
+    alphas: Sequence[float] = DEFAULT_ALPHAS,
+    cv: Optional[int] = 5,
+) -> TransformedTargetRegressor:
+    """The notebooks' pipeline: poly features, scaling, ``RidgeCV``."""
+    feature_pipeline = Pipeline(
+        [
+            ("poly", PolynomialFeatures(degree=degree, include_bias=False)),
+            ("scale", StandardScaler()),
+            ("model", RidgeCV(alphas=alphas, cv=cv, fit_intercept=True)),
+        ]
+    )
+    return TransformedTargetRegressor(
+        regressor=feature_pipeline,
+        transformer=StandardScaler(),
+        check_inverse=False,
+    )
+
+
+def fit_best_regressor(
+    X: Union[pd.DataFrame, np.ndarray],
+    y: Union[pd.Series, np.ndarray],
+    report: RidgeCVReport,
+) -> TransformedTargetRegressor:
+    """Refit the winning pipeline on all rows with its already chosen alpha."""
+    regressor = make_regressor(
+        report.best_degree, alphas=[report.best_alpha], cv=None
+    )
+    return regressor.fit(X, y)
+
+
+def write_artifacts(
+    report: RidgeCVReport,
+    output_dir: Union[str, Path] = OUTPUT_DIR,
+    estimator: Optional[TransformedTargetRegressor] = None,
+) -> Dict[str, Path]:
+    """Write the ``ridge_poly_*`` CSV/JSON files (and the model pickle)."""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    paths = {
+        "summary": output_dir / SUMMARY_FILE,
+        "folds": output_dir / FOLDS_FILE,
+        "best_folds": output_dir / BEST_FOLDS_FILE,
+        "best_json": output_dir / BEST_JSON_FILE,
+    }
+    summary_df, fold_df = report.summary, report.folds
+    summary_df.to_csv(paths["summary"], index=False)
+    fold_df.to_csv(paths["folds"], index=False)
+
+    best_degree = report.best_degree
+    best_row = summary_df.loc[summary_df["val_mse_mean"].idxmin()]
+    best_fold_df = fold_df[fold_df["degree"] == best_degree].reset_index(
+        drop=True
+    )
+    best_fold_df.to_csv(paths["best_folds"], index=False)
+
+    best_payload = {
+        "degrees_tested": sorted(summary_df["degree"].tolist()),
+        "alphas_grid": list(report.alphas),
+        "outer_cv_folds": report.n_splits,
+        "inner_cv_folds": report.inner_splits,
+        "dataset_rows": report.n_rows,
+        "dataset_features": report.n_features,
+        "best": {
+            "degree": best_degree,
+            "alpha": report.best_alpha,
+            "val_mse_mean": float(best_row["val_mse_mean"]),
+            "val_mse_std": float(best_row["val_mse_std"]),
+            "train_mse_mean": float(best_row["train_mse_mean"]),
+            "train_mse_std": float(best_row["train_mse_std"]),
+        },
+        "summary": summary_df.to_dict(orient="records"),
+        "folds_best": best_fold_df.to_dict(orient="records"),
+    }
+    pd.Series(best_payload).to_json(paths["best_json"], indent=2)
+
+    if estimator is not None:
+        paths["best_model"] = output_dir / BEST_MODEL_FILE
+        with paths["best_model"].open("wb") as f:
+            pickle.dump(estimator, f)
+    return paths
+
+
+def load_price_data(
+    path: Union[str, Path] = DATA_PATH,
+    target_col: str = TARGET_COL,
+    cache_dir: Optional[Union[str, Path]] = CACHE_DIR,
+) -> Tuple[pd.DataFrame, pd.Series]:
+    """Load the cleaned price CSV exactly as the notebooks prepare it.
+
+    The CSV is read through the ``price_ingest`` columnar cache (parsed on
+    first use or after it changes); pass ``cache_dir=None`` to bypass it.
+    """
+    if cache_dir is None:
+        df = pd.read_csv(path)
+    else:
+        df = load_csv_cached(path, cache_dir)
+    for col in ["GROSS_TAX"]:
+        if pd.api.types.is_numeric_dtype(df[col]):
+            continue
+        df[col] = (
+            df[col]
+            .astype(str)
+            .str.replace(r"[^0-9.-]", "", regex=True)
+            .replace("", np.nan)
+        )
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+    feature_cols = [col for col in df.columns if col != target_col]
+    clean_df = df.dropna(subset=[target_col, *feature_cols]).reset_index(
+        drop=True
+    )
+    X = clean_df[feature_cols].astype(float)
+    y = clean_df[target_col].astype(float)
+    return X, y
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", type=Path, default=DATA_PATH)
+    parser.add_argument("--output-dir", type=Path, default=OUTPUT_DIR)
+    parser.add_argument(
+        "--degrees", type=int, nargs="+", default=list(DEFAULT_DEGREES)
+    )
+    parser.add_argument(
+        "--alphas", type=float, nargs="+", default=list(DEFAULT_ALPHAS)
+    )
+    parser.add_argument("--folds", type=int, default=10)
+    parser.add_argument("--inner-folds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument(
+        "--no-model",
+        action="store_true",
+        help="skip refitting and pickling the best pipeline",
+    )
+    args = parser.parse_args(argv)
+
+    X, y = load_price_data(args.data)
+    print(f"Dataset after cleaning: {X.shape[0]} rows, {X.shape[1]} features")
+    report = run_ridge_cv(
+        X,
+        y,
+        args.degrees,
+        args.folds,
+        args.seed,
+        args.alphas,
+        inner_splits=args.inner_folds,
+        chunk_rows=args.chunk_rows,
+    )
+    print("Summary metrics by degree:")
+    print(report.summary)
+    estimator = None if args.no_model else fit_best_regressor(X, y, report)
+    paths = write_artifacts(report, args.output_dir, estimator)
+    for name, path in paths.items():
+        print(f"- {name}: {path}")
+
+
+if __name__ == "__main__":
+    main()
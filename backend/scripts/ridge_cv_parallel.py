@@ -0,0 +1,334 @@
+"""Process-pool runner for the nested ridge CV in ``ridge_cv``.
+
+The cleaned ``[X | y]`` matrix is copied once into a
+``multiprocessing.shared_memory`` block; workers attach to it by name, so no
+task ever pickles the dataset. Work is split into one task per
+``(degree, outer fold)`` plus one per degree for the full-data inner split
+that picks the final alpha. Each task streams the shared rows once,
+accumulating the cross products of its inner blocks and held-out fold with
+the ``ridge_cv`` helpers, and returns a single ``ridge_poly_cv_folds.csv``
+row.
+
+Fold labels come from the same seeded ``KFold`` assignment as the serial
+run, so the chosen alphas are identical and the MSEs agree to floating-point
+round-off. Each worker's BLAS pool is capped (1 thread by default) so
+``workers x threads`` stays within the machine's cores.
+
+Usage::
+
+    python scripts/ridge_cv_parallel.py --data <csv> --output-dir <dir> \\
+        --workers 32
+"""
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import contextmanager
+from multiprocessing import get_context, shared_memory
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import argparse
+import csv
+import importlib
+import os
+
+import numpy as np
+import pandas as pd
+
+from ridge_cv import (
+    DEFAULT_ALPHAS,
+    DEFAULT_CHUNK_ROWS,
+    DEFAULT_DEGREES,
+    DATA_PATH,
+    FOLDS_FILE,
+    OUTPUT_DIR,
+    PolynomialDesign,
+    RidgeCVReport,
+    accumulate_label_grams,
+    fit_best_regressor,
+    inner_block_r2,
+    inner_cut_points,
+    kfold_labels,
+    load_price_data,
+    log_fold,
+    outer_fold_scores,
+    pick_alpha,
+    prepare_inputs,
+    summarize_folds,
+    write_artifacts,
+)
+
+FOLD_COLUMNS = (
+    "degree",
+    "fold",
+    "train_mse",
+    "val_mse",
+    "alpha",
+    "train_size",
+    "val_size",
+)
+BLAS_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+)
+
+# Per-worker state set by _init_worker.
+_worker: Dict[str, Any] = {}
+
+
+@contextmanager
+def _blas_env(threads: int) -> Iterator[None]:
+    """Export BLAS thread limits so spawned workers start with them."""
+    saved = {name: os.environ.get(name) for name in BLAS_ENV_VARS}
+    os.environ.update({name: str(threads) for name in BLAS_ENV_VARS})
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    try:
+        # The parent owns (and unlinks) the block; keep workers from
+        # registering it with the resource tracker on Python 3.13+.
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+def _init_worker(
+    shm_name: str,
+    shape: Tuple[int, int],
+    blas_threads: int,
+    n_splits: int,
+    seed: Optional[int],
+) -> None:
+    try:
+        threadpoolctl = importlib.import_module("threadpoolctl")
+    except ImportError:  # pragma: no cover - env vars still apply
+        pass
+    else:
+        # numpy is already imported here, so the env vars alone may be late.
+        _worker["limits"] = threadpoolctl.threadpool_limits(blas_threads)
+    shm = _attach(shm_name)
+    data = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+    _worker.update(
+        shm=shm,
+        X=data[:, :-1],
+        y=data[:, -1],
+        labels=kfold_labels(shape[0], n_splits, seed),
+    )
+
+
+def _run_task(
+    degree: int,
+    fold: Optional[int],
+    n_inner: int,
+    alphas: Tuple[float, ...],
+    chunk_rows: int,
+) -> Dict[str, Any]:
+    """Score one ``(degree, outer fold)``; ``fold=None`` is the full data."""
+    labels = _worker["labels"]
+    design = PolynomialDesign(_worker["X"], _worker["y"], degree)
+    columns = design.columns(degree)
+
+    # Label rows by inner block, with the held-out fold as an extra label.
+    cuts = inner_cut_points(labels, fold, n_inner)
+    task_labels = np.repeat(np.arange(n_inner), np.diff(cuts))
+    if fold is not None:
+        task_labels[labels == fold] = n_inner
+    grams = accumulate_label_grams(
+        design, task_labels, n_inner + 1, chunk_rows
+    )
+    train_gram = grams[:n_inner].sum(axis=0)
+    train_scale = design.train_scale(train_gram, columns)
+    alpha_grid = np.asarray(alphas)
+    block_r2 = np.stack(
+        [
+            inner_block_r2(
+                train_gram, grams[block], columns, train_scale, alpha_grid
+            )
+            for block in range(n_inner)
+        ]
+    )
+    alpha = alphas[pick_alpha(block_r2)]
+    if fold is None:
+        return {"degree": degree, "fold": None, "alpha": alpha}
+    row: Dict[str, Any] = {"degree": degree, "fold": fold + 1}
+    row.update(
+        outer_fold_scores(
+            train_gram,
+            grams[n_inner],
+            columns,
+            train_scale,
+            alpha,
+            design.scale[-1],
+        )
+    )
+    return row
+
+
+def run_parallel_ridge_cv(
+    X: Union[pd.DataFrame, np.ndarray],
+    y: Union[pd.Series, np.ndarray],
+    degrees: Sequence[int] = DEFAULT_DEGREES,
+    n_splits: int = 10,
+    seed: Optional[int] = 42,
+    alphas: Sequence[float] = DEFAULT_ALPHAS,
+    *,
+    inner_splits: int = 5,
+    n_workers: Optional[int] = None,
+    blas_threads: int = 1,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    folds_path: Optional[Union[str, Path]] = None,
+    verbose: bool = True,
+) -> RidgeCVReport:
+    """Parallel equivalent of :func:`ridge_cv.run_ridge_cv`.
+
+    Args:
+        n_workers: Worker processes (default: ``os.cpu_count()``).
+        blas_threads: BLAS threads per worker.
+        folds_path: If given, fold rows are appended to this CSV (in the
+            ``ridge_poly_cv_folds.csv`` layout) as soon as each task
+            finishes; ``write_artifacts`` later rewrites it in fold order.
+    """
+    X_array, y_array, degrees, alphas = prepare_inputs(X, y, degrees, alphas)
+    n_rows, n_features = X_array.shape
+    # Validate the split sizes here rather than inside every worker.
+    labels = kfold_labels(n_rows, n_splits, seed)
+    for fold in [*range(n_splits), None]:
+        inner_cut_points(labels, fold, inner_splits)
+
+    # Highest degrees first: they take longest, so schedule them early.
+    tasks: List[Tuple[int, Optional[int]]] = [
+        (degree, fold)
+        for degree in sorted(degrees, reverse=True)
+        for fold in [*range(n_splits), None]
+    ]
+    n_workers = max(1, min(n_workers or os.cpu_count() or 1, len(tasks)))
+
+    shape = (n_rows, n_features + 1)
+    shm = shared_memory.SharedMemory(
+        create=True, size=int(np.prod(shape)) * np.dtype(np.float64).itemsize
+    )
+    csv_file = None
+    try:
+        data = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        data[:, :-1] = X_array
+        data[:, -1] = y_array
+        del data, X_array, y_array
+
+        writer = None
+        if folds_path is not None:
+            folds_path = Path(folds_path)
+            folds_path.parent.mkdir(parents=True, exist_ok=True)
+            csv_file = folds_path.open("w", newline="", encoding="utf-8")
+            writer = csv.DictWriter(csv_file, fieldnames=FOLD_COLUMNS)
+            writer.writeheader()
+            csv_file.flush()
+
+        fold_rows: List[Dict[str, Any]] = []
+        full_data_alphas: Dict[int, float] = {}
+        with _blas_env(blas_threads), ProcessPoolExecutor(
+            max_workers=n_workers,
+            mp_context=get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(shm.name, shape, blas_threads, n_splits, seed),
+        ) as pool:
+            pending = {
+                pool.submit(
+                    _run_task, degree, fold, inner_splits, alphas, chunk_rows
+                )
+                for degree, fold in tasks
+            }
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    row = future.result()
+                    if row["fold"] is None:
+                        full_data_alphas[row["degree"]] = row["alpha"]
+                        continue
+                    fold_rows.append(row)
+                    if writer is not None:
+                        writer.writerow(row)
+                        csv_file.flush()
+                    if verbose:
+                        log_fold(row, n_splits)
+    finally:
+        if csv_file is not None:
+            csv_file.close()
+        shm.close()
+        shm.unlink()
+
+    fold_df = (
+        pd.DataFrame(fold_rows, columns=list(FOLD_COLUMNS))
+        .sort_values(["degree", "fold"])
+        .reset_index(drop=True)
+    )
+    return RidgeCVReport(
+        summary=summarize_folds(fold_df),
+        folds=fold_df,
+        full_data_alphas=full_data_alphas,
+        alphas=alphas,
+        n_splits=n_splits,
+        inner_splits=inner_splits,
+        n_rows=int(n_rows),
+        n_features=int(n_features),
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", type=Path, default=DATA_PATH)
+    parser.add_argument("--output-dir", type=Path, default=OUTPUT_DIR)
+    parser.add_argument(
+        "--degrees", type=int, nargs="+", default=list(DEFAULT_DEGREES)
+    )
+    parser.add_argument(
+        "--alphas", type=float, nargs="+", default=list(DEFAULT_ALPHAS)
+    )
+    parser.add_argument("--folds", type=int, default=10)
+    parser.add_argument("--inner-folds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--blas-threads", type=int, default=1)
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument(
+        "--no-model",
+        action="store_true",
+        help="skip refitting and pickling the best pipeline",
+    )
+    args = parser.parse_args(argv)
+
+    X, y = load_price_data(args.data)
+    print(f"Dataset after cleaning: {X.shape[0]} rows, {X.shape[1]} features")
+    report = run_parallel_ridge_cv(
+        X,
+        y,
+        args.degrees,
+        args.folds,
+        args.seed,
+        args.alphas,
+        inner_splits=args.inner_folds,
+        n_workers=args.workers,
+        blas_threads=args.blas_threads,
+        chunk_rows=args.chunk_rows,
+        folds_path=args.output_dir / FOLDS_FILE,
+    )
+    print("Summary metrics by degree:")
+    print(report.summary)
+    estimator = None if args.no_model else fit_best_regressor(X, y, report)
+    paths = write_artifacts(report, args.output_dir, estimator)
+    for name, path in paths.items():
+        print(f"- {name}: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+"""Make the backend modules importable the way ``main.py`` imports them."""
+from pathlib import Path
+
+import sys
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+for path in (
+    BACKEND_DIR, BACKEND_DIR / "benchmarks", BACKEND_DIR / "scripts"
+):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
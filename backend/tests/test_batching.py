@@ -0,0 +1,29 @@
+"""Rows queued across a model swap are scored with the model they saw."""
+import asyncio
+
+from batching import MicroBatcher
+
+
+def test_rows_are_scored_with_their_own_context():
+    calls = []
+
+    def predict(rows, offset=0.0):
+        calls.append((len(rows), offset))
+        return [row["x"] + offset for row in rows]
+
+    old, new = 100.0, 200.0
+
+    async def run():
+        batcher = MicroBatcher(predict, max_batch_size=8, max_wait_ms=50)
+        try:
+            return await asyncio.gather(
+                batcher.submit({"x": 1.0}, old),
+                batcher.submit({"x": 2.0}, new),
+                batcher.submit({"x": 3.0}, old),
+                batcher.submit({"x": 4.0}),
+            )
+        finally:
+            await batcher.close()
+
+    assert asyncio.run(run()) == [101.0, 202.0, 103.0, 4.0]
+    assert sorted(calls) == [(1, 0.0), (1, 200.0), (2, 100.0)]
@@ -0,0 +1,96 @@
+"""Malformed lines in a bulk-scoring upload get an empty prediction."""
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from bulk_scoring import ChunkParser, PREDICTION_COLUMN
+from model_registry import ArtifactBundle
+from synthetic import REQUEST_COLUMNS, price_requests, write_serving_artifacts
+
+
+@pytest.fixture(scope="module")
+def client(tmp_path_factory):
+    work_dir = tmp_path_factory.mktemp("bulk")
+    model_dir = write_serving_artifacts(
+        work_dir / "model", n_rows=500, n_estimators=3
+    )
+    os.environ.update(
+        PRICE_MODEL_DIR=str(model_dir),
+        PRICE_BACKGROUND_LOAD="0",
+        PRICE_SURFACE_DIR=str(work_dir / "price_surface"),
+        PRICE_BULK_CHUNK_ROWS="2",
+    )
+    from fastapi.testclient import TestClient
+
+    import main
+
+    main.BULK_CHUNK_ROWS = 2
+    # Another test module may have imported main before the environment
+    # above was set, so load the bundle explicitly.
+    main._activate(
+        main._load_bundle(ArtifactBundle.from_directory(model_dir))
+    )
+    return TestClient(main.app)
+
+
+def _ndjson(rows):
+    return "".join(json.dumps(row) + "\n" for row in rows)
+
+
+def _csv(rows):
+    return pd.DataFrame(rows, columns=REQUEST_COLUMNS).to_csv(index=False)
+
+
+def test_parse_keeps_rows_around_a_broken_ndjson_line():
+    rows = price_requests(3)
+    body = (_ndjson(rows[:2]) + "{not json\n" + _ndjson(rows[2:])).encode()
+    frame = ChunkParser("ndjson").parse(body)
+    assert len(frame) == 4
+    assert frame["ZIPCODE"].isna().tolist() == [False, False, True, False]
+
+
+def test_parse_keeps_rows_around_a_csv_row_with_extra_fields():
+    lines = _csv(price_requests(3)).splitlines()
+    lines.insert(2, lines[2] + ",1,2")
+    frame = ChunkParser("csv").parse("\n".join(lines).encode() + b"\n")
+    assert len(frame) == 4
+    assert frame["ZIPCODE"].isna().tolist() == [False, True, False, False]
+
+
+def test_parse_does_not_let_an_open_quote_swallow_later_rows():
+    lines = _csv(price_requests(3)).splitlines()
+    lines.insert(2, '"2118,1200')
+    frame = ChunkParser("csv").parse("\n".join(lines).encode() + b"\n")
+    assert frame["ZIPCODE"].isna().tolist() == [False, True, False, False]
+
+
+def test_stream_scores_valid_ndjson_rows_around_a_malformed_line(client):
+    rows = price_requests(3)
+    body = _ndjson(rows) + "{not json\n"
+    response = client.post("/predict_price/stream?input=ndjson", content=body)
+    assert response.status_code == 200
+    records = [json.loads(line) for line in response.text.splitlines()]
+    prices = [record[PREDICTION_COLUMN] for record in records]
+    assert len(prices) == 4
+    assert all(price is not None for price in prices[:3])
+    assert prices[3] is None
+
+    expected = client.post(
+        "/predict_price/batch", json={"records": rows}
+    ).json()["predictions"]
+    assert prices[:3] == pytest.approx(expected)
+
+
+def test_stream_scores_valid_csv_rows_around_a_malformed_line(client):
+    lines = _csv(price_requests(4)).splitlines()
+    lines[2] += ",999"
+    body = "\n".join(lines) + "\n"
+    response = client.post("/predict_price/stream", content=body)
+    assert response.status_code == 200
+    scored = pd.read_csv(pd.io.common.StringIO(response.text))
+    assert len(scored) == 4
+    assert scored[PREDICTION_COLUMN].isna().tolist() == [
+        False, True, False, False
+    ]
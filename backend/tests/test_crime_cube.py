@@ -0,0 +1,119 @@
+"""CrimeCube aggregates match a pandas groupby over the raw incidents."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from crime_cube import DAY_NAMES, CrimeCube, build_cube
+
+N_ROWS = 1500
+
+
+def write_year(directory, year, groups, seed):
+    rng = np.random.default_rng(seed)
+    dates = pd.Timestamp(f"{year}-01-01") + pd.to_timedelta(
+        rng.integers(0, 365 * 24 * 60, N_ROWS), unit="min"
+    )
+    text = dates.strftime("%Y-%m-%d %H:%M:%S").to_numpy(dtype=object)
+    text[::5] = [value + "+00" for value in text[::5]]
+    text[3] = "not a date"
+    hours = dates.hour.to_numpy().astype(object)
+    hours[7] = 99  # Out of range: the timestamp's hour is used instead.
+    frame = pd.DataFrame({
+        "DISTRICT": rng.choice(["A1", "B2", "C11", " ", None], N_ROWS),
+        "OCCURRED_ON_DATE": text,
+        "HOUR": hours,
+        "OFFENSE_CODE_GROUP": rng.choice(groups, N_ROWS),
+    })
+    frame.to_csv(directory / f"{year}-crime-boston.csv", index=False)
+
+
+def reference(directory):
+    """The notebook's route: concat every CSV, parse, count."""
+    frame = pd.concat(
+        [pd.read_csv(path) for path in sorted(directory.glob("*.csv"))],
+        ignore_index=True,
+    )
+    dates = pd.to_datetime(
+        frame["OCCURRED_ON_DATE"].str.slice(0, 19), errors="coerce"
+    )
+    frame = frame[dates.notna()].assign(date=dates[dates.notna()])
+    district = frame["DISTRICT"].fillna("").str.strip()
+    return pd.DataFrame({
+        "district": district.where(district != "", "Unknown"),
+        "year_month": frame["date"].dt.strftime("%Y-%m"),
+        "day_of_week": frame["date"].dt.dayofweek.astype("int64"),
+        "hour": frame["date"].dt.hour.astype("int64"),
+        "offense_group": frame["OFFENSE_CODE_GROUP"],
+    })
+
+
+def as_counts(labels, counts, cube):
+    """Cube output as a Series keyed like ``groupby(...).size()``."""
+    names = list(labels)
+    axes = [labels[name] for name in names]
+    for i, name in enumerate(names):
+        if name == "day_of_week":
+            axes[i] = [DAY_NAMES.index(day) for day in axes[i]]
+    if len(names) == 1:
+        index = pd.Index(axes[0], name=names[0])
+    else:
+        index = pd.MultiIndex.from_product(axes, names=names)
+    series = pd.Series(counts.ravel(), index=index)
+    return series[series > 0]
+
+
+def check(cube, incidents, group_by, **filters):
+    labels, counts = cube.aggregate(group_by, cube.select(**filters))
+    rows = incidents
+    for name in ("district", "offense_group", "hour", "day_of_week"):
+        if name in filters:
+            rows = rows[rows[name].isin(filters[name])]
+    if "start" in filters:
+        rows = rows[rows["year_month"] >= filters["start"]]
+    if "end" in filters:
+        rows = rows[rows["year_month"] <= filters["end"]]
+    expected = rows.groupby(group_by).size()
+    actual = as_counts(labels, counts, cube)
+    pd.testing.assert_series_equal(
+        actual.sort_index(), expected.sort_index(), check_names=False,
+        check_dtype=False,
+    )
+    assert counts.sum() == len(rows)
+
+
+@pytest.fixture()
+def source_dir(tmp_path):
+    directory = tmp_path / "crime"
+    directory.mkdir()
+    write_year(directory, 2019, ["Larceny", "Vandalism"], seed=1)
+    write_year(directory, 2020, ["Larceny", "Fraud", "Vandalism"], seed=2)
+    return directory
+
+
+def test_aggregates_match_groupby(source_dir, tmp_path):
+    cube_dir = tmp_path / "cube"
+    build_cube(source_dir, cube_dir)
+    cube = CrimeCube.load(cube_dir)
+    incidents = reference(source_dir)
+    check(cube, incidents, ["district"])
+    check(cube, incidents, ["offense_group", "hour"])
+    check(cube, incidents, ["year_month", "district"])
+    check(
+        cube, incidents, ["day_of_week"],
+        district=["A1", "Unknown"], offense_group=["Fraud"],
+        hour=[0, 7, 23], start="2019-11", end="2020-02",
+    )
+
+
+def test_adding_a_year_recounts_only_that_file(source_dir, tmp_path):
+    cube_dir = tmp_path / "cube"
+    assert build_cube(source_dir, cube_dir) == [
+        "2019-crime-boston.csv", "2020-crime-boston.csv"
+    ]
+    assert build_cube(source_dir, cube_dir) == []
+    write_year(source_dir, 2021, ["Arson", "Larceny"], seed=3)
+    assert build_cube(source_dir, cube_dir) == ["2021-crime-boston.csv"]
+    cube = CrimeCube.load(cube_dir)
+    incidents = reference(source_dir)
+    check(cube, incidents, ["offense_group", "district"])
+    check(cube, incidents, ["year_month"], offense_group=["Arson"])
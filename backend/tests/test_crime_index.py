@@ -0,0 +1,146 @@
+"""CrimeIndex radius and k-NN queries match a scan over every incident."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from crime_index import (
+    CrimeIndex,
+    build_index,
+    parse_minute,
+    project,
+    synthetic_columns,
+    unproject,
+)
+
+GROUPS = [f"group-{i}" for i in range(12)]
+WINDOW = (parse_minute("2018-03-01"), parse_minute("2019-02-28", end=True))
+
+
+def scan(columns, x, y, start=None, end=None):
+    """Squared distance of every incident, ``inf`` outside the window."""
+    dx = columns["x"] - x
+    dy = columns["y"] - y
+    dist2 = (dx * dx + dy * dy).astype(np.float64)
+    if start is not None:
+        dist2[columns["minute"] < start] = np.inf
+    if end is not None:
+        dist2[columns["minute"] > end] = np.inf
+    return dist2
+
+
+@pytest.fixture(scope="module")
+def columns():
+    return synthetic_columns(20_000, len(GROUPS), seed=3)
+
+
+@pytest.fixture(scope="module")
+def index(columns):
+    return CrimeIndex.from_columns(columns, GROUPS, cell_size=150.0)
+
+
+@pytest.fixture(scope="module")
+def queries():
+    rng = np.random.default_rng(0)
+    # Some fall outside the grid entirely.
+    x = rng.uniform(-12_000, 12_000, 60)
+    y = rng.uniform(-12_000, 12_000, 60)
+    return [(float(a), float(b)) for a, b in zip(x, y)]
+
+
+@pytest.mark.parametrize("radius", [40.0, 400.0, 2_500.0])
+@pytest.mark.parametrize("window", [(None, None), WINDOW])
+def test_radius_counts_match_scan(index, columns, queries, radius, window):
+    for x, y in queries:
+        lat, lon = unproject(x, y)
+        x, y = (float(v) for v in project(lat, lon))
+        hit = scan(columns, x, y, *window) <= radius * radius
+        per_group = np.bincount(columns["group"][hit], minlength=len(GROUPS))
+        expected = {
+            GROUPS[code]: int(per_group[code])
+            for code in np.flatnonzero(per_group)
+        }
+        result = index.count_within(float(lat), float(lon), radius, *window)
+        assert result.total == int(hit.sum())
+        assert result.counts == expected
+
+
+@pytest.mark.parametrize("k", [1, 7, 50])
+@pytest.mark.parametrize("window", [(None, None), WINDOW])
+def test_nearest_matches_scan(index, columns, queries, k, window):
+    for x, y in queries:
+        lat, lon = unproject(x, y)
+        x, y = (float(v) for v in project(lat, lon))
+        dist2 = scan(columns, x, y, *window)
+        order = np.argsort(dist2, kind="stable")[:k]
+        order = order[dist2[order] <= 20_000.0 ** 2]
+        hits = index.nearest(float(lat), float(lon), k, *window)
+        assert [hit["distance_m"] for hit in hits] == [
+            round(float(np.sqrt(d2)), 1) for d2 in dist2[order]
+        ]
+        if len(np.unique(dist2[order])) == len(order):
+            assert [hit["offense_group"] for hit in hits] == [
+                GROUPS[code] for code in columns["group"][order]
+            ]
+
+
+def test_nearest_stops_at_max_radius(index):
+    lat, lon = unproject(60_000.0, 0.0)
+    assert index.nearest(float(lat), float(lon), 5) == []
+
+
+def write_year(directory, year, seed):
+    rng = np.random.default_rng(seed)
+    n_rows = 400
+    lat, lon = unproject(
+        rng.uniform(-3_000, 3_000, n_rows), rng.uniform(-3_000, 3_000, n_rows)
+    )
+    dates = pd.Timestamp(f"{year}-01-01") + pd.to_timedelta(
+        rng.integers(0, 365 * 24 * 60, n_rows), unit="min"
+    )
+    frame = pd.DataFrame({
+        "Lat": lat.round(6),
+        "Long": lon.round(6),
+        "OCCURRED_ON_DATE": dates.strftime("%Y-%m-%d %H:%M:%S"),
+        "OFFENSE_CODE_GROUP": rng.choice(["Larceny", "Fraud", ""], n_rows),
+    })
+    # Unknown locations and an unparseable date are dropped.
+    frame.loc[0, ["Lat", "Long"]] = -1.0
+    frame.loc[1, ["Lat", "Long"]] = 0.0
+    frame.loc[2, "OCCURRED_ON_DATE"] = "not a date"
+    frame.to_csv(directory / f"{year}-crime-boston.csv", index=False)
+    return frame.iloc[3:]
+
+
+def test_built_store_matches_csv_rows(tmp_path):
+    source_dir = tmp_path / "crime"
+    source_dir.mkdir()
+    rows = pd.concat(
+        [write_year(source_dir, 2019, 1), write_year(source_dir, 2020, 2)]
+    )
+    index_dir = tmp_path / "index"
+    assert build_index(source_dir, index_dir)
+    assert not build_index(source_dir, index_dir)
+    index = CrimeIndex.load(index_dir)
+    assert len(index) == len(rows)
+
+    x, y = project(rows["Lat"].to_numpy(), rows["Long"].to_numpy())
+    groups = rows["OFFENSE_CODE_GROUP"].fillna("").replace("", "Unknown")
+    minute = pd.to_datetime(rows["OCCURRED_ON_DATE"]).to_numpy(
+        "datetime64[m]"
+    ).astype(np.int64)
+    window = (parse_minute("2019-07-01"), parse_minute("2020-06-30", True))
+    in_window = (minute >= window[0]) & (minute <= window[1])
+    for qx, qy in [(0.0, 0.0), (1_500.0, -800.0), (-2_900.0, 2_900.0)]:
+        lat, lon = unproject(qx, qy)
+        dx = x.astype(np.float32) - qx
+        dy = y.astype(np.float32) - qy
+        near = (dx * dx + dy * dy <= 600.0 ** 2) & in_window
+        result = index.count_within(float(lat), float(lon), 600.0, *window)
+        assert result.counts == groups[near].value_counts().to_dict()
+
+    version = index.version
+    write_year(source_dir, 2021, 3)
+    assert build_index(source_dir, index_dir)
+    index = CrimeIndex.load(index_dir)
+    assert index.version != version
+    assert len(index) == len(rows) + 397
@@ -0,0 +1,92 @@
+"""CompiledForest predicts exactly what the fitted scikit-learn forest does."""
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+from forest_engine import CompiledForest, check_parity
+
+COLUMNS = ["a", "b", "c", "d"]
+
+
+@pytest.fixture(scope="module")
+def forest():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(400, len(COLUMNS))), columns=COLUMNS)
+    y = X["a"] * 3 - X["b"] ** 2 + rng.normal(scale=0.1, size=len(X))
+    return RandomForestRegressor(
+        n_estimators=7, max_depth=9, random_state=0
+    ).fit(X, y)
+
+
+@pytest.fixture(scope="module")
+def rows(forest):
+    return CompiledForest.from_sklearn(forest).probe_rows(1000, seed=1)
+
+
+def test_single_row(forest, rows):
+    compiled = CompiledForest.from_sklearn(forest)
+    frame = pd.DataFrame(rows[:1], columns=COLUMNS)
+    check_parity(forest, compiled, frame, rtol=0.0)
+    assert compiled.predict(rows[0]).shape == (1,)
+    assert compiled.predict(rows[0])[0] == compiled.predict(frame)[0]
+
+
+def test_many_rows_across_chunks(forest, rows):
+    compiled = CompiledForest.from_sklearn(forest)
+    frame = pd.DataFrame(rows, columns=COLUMNS)
+    check_parity(forest, compiled, frame, rtol=0.0)
+    np.testing.assert_array_equal(
+        compiled.predict(frame, chunk_rows=64), forest.predict(frame)
+    )
+    # Columns are matched by name, not position.
+    np.testing.assert_array_equal(
+        compiled.predict(frame[COLUMNS[::-1]]), forest.predict(frame)
+    )
+
+
+def test_save_load_round_trip(forest, rows, tmp_path):
+    compiled = CompiledForest.from_sklearn(forest)
+    store = compiled.save(tmp_path / "forest", metadata={"source": "test"})
+    loaded = CompiledForest.load(store)
+    assert loaded.feature_names == COLUMNS
+    assert loaded.max_depth == compiled.max_depth
+    assert CompiledForest.read_manifest(store)["metadata"] == {
+        "source": "test"
+    }
+    frame = pd.DataFrame(rows, columns=COLUMNS)
+    check_parity(forest, loaded, frame, rtol=0.0)
+    check_parity(forest, loaded)
+    np.testing.assert_array_equal(
+        loaded.predict(frame), compiled.predict(frame)
+    )
+
+
+def test_check_parity_reports_divergence(forest, rows):
+    compiled = CompiledForest.from_sklearn(forest)
+    compiled.value = compiled.value + 1.0
+    with pytest.raises(AssertionError, match="diverges"):
+        check_parity(forest, compiled, pd.DataFrame(rows, columns=COLUMNS))
+
+
+def test_model_store_refuses_a_forest_with_other_columns(
+    forest, tmp_path, monkeypatch
+):
+    import joblib
+
+    import main
+
+    model_path = tmp_path / "forest.pkl"
+    joblib.dump(forest, model_path)
+    bundle = SimpleNamespace(kind="forest", model_path=model_path)
+    monkeypatch.setattr(main, "MODEL_STORE_DIR", str(tmp_path / "store"))
+    with pytest.raises(ValueError, match="was trained on"):
+        main._load_forest(bundle, "v1")
+    assert not (tmp_path / "store" / "v1").exists()
+
+    # A store that is already on disk is checked as well.
+    CompiledForest.from_sklearn(forest).save(tmp_path / "store" / "v2")
+    with pytest.raises(ValueError, match="was trained on"):
+        main._load_forest(bundle, "v2")
@@ -0,0 +1,36 @@
+"""A request finishing under a replaced model version keeps the cache."""
+
+from prediction_cache import PredictionCache
+
+
+def test_put_under_replaced_version_is_dropped():
+    cache = PredictionCache(max_size=10)
+    cache.put("a", 1.0, "v1")
+    assert cache.get("b", "v2") is None
+    cache.put("b", 2.0, "v2")
+    # A request that started under v1 finishes after the swap.
+    cache.put("a", 1.5, "v1")
+    assert cache.get("b", "v2") == 2.0
+    assert cache.get("a", "v2") is None
+    assert cache.stats()["stale_writes"] == 1
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_lookup_under_retired_version_does_not_clear():
+    cache = PredictionCache(max_size=10)
+    cache.set_version("v1")
+    cache.set_version("v2")
+    cache.put("a", 2.0, "v2")
+    assert cache.get("a", "v1") is None
+    assert cache.get_many(["a"], "v1") == [None]
+    assert cache.get("a", "v2") == 2.0
+
+
+def test_set_version_can_roll_back():
+    cache = PredictionCache(max_size=10)
+    cache.set_version("v1")
+    cache.set_version("v2")
+    cache.set_version("v1")
+    cache.put("a", 1.0, "v1")
+    assert cache.get("a", "v1") == 1.0
+    assert cache.get("a", "v2") is None
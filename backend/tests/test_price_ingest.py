@@ -0,0 +1,67 @@
+"""The columnar cache loads the numbers pd.read_csv would give."""
+import numpy as np
+import pandas as pd
+
+from price_ingest import load_csv_cached, load_fiscal_years
+
+
+def write_csv(path, rows, seed):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        "ZIPCODE": rng.integers(2100, 2200, rows),
+        "LAND_VALUE": rng.integers(1_500_000_000, 2_000_000_000, rows),
+        "BLDG_VALUE": rng.integers(1_500_000_000, 2_000_000_000, rows),
+        "YR_BUILT": rng.integers(1850, 2020, rows).astype(float),
+        "LIVING_AREA": rng.uniform(500, 4000, rows).round(1),
+        "CITY": rng.choice(["BOSTON", "DORCHESTER"], rows),
+    })
+    frame.loc[::7, "YR_BUILT"] = np.nan
+    frame["TOTAL_VALUE"] = [f"${value:,}" for value in frame["LAND_VALUE"]]
+    frame.to_csv(path, index=False)
+    return frame
+
+
+def test_numbers_load_as_read_csv_gives_them(tmp_path):
+    path = tmp_path / "fy2024.csv"
+    write_csv(path, 200, seed=0)
+    expected = pd.read_csv(path)
+    loaded = load_csv_cached(path, tmp_path / "cache")
+    for name in ["ZIPCODE", "LAND_VALUE", "YR_BUILT", "LIVING_AREA"]:
+        assert loaded[name].dtype == expected[name].dtype, name
+        pd.testing.assert_series_equal(loaded[name], expected[name])
+    assert loaded["TOTAL_VALUE"].dtype == np.int64
+    np.testing.assert_array_equal(
+        loaded["TOTAL_VALUE"], expected["LAND_VALUE"]
+    )
+    assert list(loaded["CITY"]) == list(expected["CITY"])
+    # Two int32-sized dollar columns must not wrap when added.
+    total = loaded["LAND_VALUE"] + loaded["BLDG_VALUE"]
+    np.testing.assert_array_equal(
+        total, expected["LAND_VALUE"] + expected["BLDG_VALUE"]
+    )
+    assert (total > 0).all()
+
+
+def test_narrow_keeps_the_stored_types(tmp_path):
+    path = tmp_path / "fy2024.csv"
+    write_csv(path, 50, seed=1)
+    narrow = load_csv_cached(path, tmp_path / "cache", narrow=True)
+    assert narrow["ZIPCODE"].dtype == np.int16
+    assert narrow["LAND_VALUE"].dtype == np.int32
+    assert narrow["YR_BUILT"].dtype == "Int16"
+
+
+def test_fiscal_years_concat_as_read_csv(tmp_path):
+    for year, seed in [(2023, 2), (2024, 3)]:
+        write_csv(tmp_path / f"fy{year}.csv", 30, seed)
+    expected = pd.concat(
+        [pd.read_csv(tmp_path / f"fy{year}.csv") for year in (2023, 2024)],
+        ignore_index=True,
+    )
+    loaded = load_fiscal_years(
+        source_dir=tmp_path, cache_dir=tmp_path / "cache", year_column="FY"
+    )
+    for name in ["ZIPCODE", "LAND_VALUE", "YR_BUILT", "LIVING_AREA"]:
+        pd.testing.assert_series_equal(loaded[name], expected[name])
+    assert loaded["FY"].dtype == np.int64
+    assert loaded["FY"].tolist() == [2023] * 30 + [2024] * 30
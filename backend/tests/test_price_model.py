@@ -0,0 +1,82 @@
+"""PriceRegressionModel keeps the weights and records it reports."""
+import numpy as np
+import pytest
+
+from Price import PriceRegressionModel
+from synthetic import price_dataset
+
+
+@pytest.fixture(scope="module")
+def data():
+    X, y = price_dataset(2000, n_features=5, seed=0)
+    return X, y / 1e5
+
+
+def test_partial_fit_continues_a_fitted_model(data):
+    X, y = data
+    model = PriceRegressionModel().fit(
+        X, y, degree=2, solver="normal", num_iterations=1
+    )
+    fitted_loss = model._compute_loss(y, model.predict(X))
+    history = list(model.history)
+    model.partial_fit(X[:500], y[:500], degree=2, learning_rate=1e-4)
+    model.partial_fit(X[500:], y[500:])
+    loss = model._compute_loss(y, model.predict(X))
+    assert loss < fitted_loss * 1.01
+    assert model.history[:len(history)] == history
+    assert len(model.history) == len(history) + 2
+    assert model.n_epochs_ == 3
+    assert model.is_fitted_
+
+
+def test_partial_fit_refuses_a_different_configuration(data):
+    X, y = data
+    model = PriceRegressionModel().fit(X, y, degree=2, num_iterations=2)
+    weights = model.weights_.copy()
+    with pytest.raises(ValueError, match="degree=2"):
+        model.partial_fit(X, y)
+    with pytest.raises(ValueError, match="solver='gd'"):
+        model.partial_fit(X, y, degree=2, solver="normal")
+    with pytest.raises(ValueError, match="initial_weights"):
+        model.partial_fit(X, y, degree=2, initial_bias=0.0)
+    with pytest.raises(ValueError, match="feature dimension"):
+        model.partial_fit(X[:, :4], y, degree=2)
+    np.testing.assert_array_equal(model.weights_, weights)
+    assert model.is_fitted_
+
+
+def test_early_stopping_restores_the_weights_of_the_reported_loss(data):
+    X, y = data
+    seed = 3
+    model = PriceRegressionModel().fit(
+        X, y, degree=2, learning_rate=0.002, num_iterations=60,
+        random_seed=seed, validation_fraction=0.2, tol=0.05, patience=4,
+    )
+    # fit draws the holdout first from the seeded generator.
+    order = np.random.default_rng(seed).permutation(len(X))
+    holdout = order[:int(round(0.2 * len(X)))]
+    loss = model._compute_loss(y[holdout], model.predict(X[holdout]))
+    assert loss == pytest.approx(model.final_loss_, rel=1e-12)
+    assert model.final_loss_ == min(model.validation_history)
+
+
+def test_npy_save_is_pickle_free_and_memory_mapped(data, tmp_path):
+    X, y = data
+    model = PriceRegressionModel().fit(
+        X, y, degree=2, solver="normal", num_iterations=1
+    )
+    path = model.save(tmp_path / "model.npy")
+    np.load(path, allow_pickle=False)
+    loaded = PriceRegressionModel.load(path, mmap_mode="r")
+    # A read-only view of the mapped file, not a copy.
+    assert not loaded.weights_.flags.owndata
+    assert not loaded.weights_.flags.writeable
+    np.testing.assert_array_equal(loaded.predict(X), model.predict(X))
+    assert loaded.history == model.history
+
+    # A save from before the structured layout: a pickled dict.
+    legacy = tmp_path / "legacy.npy"
+    np.save(legacy, model._export_numpy_payload(), allow_pickle=True)
+    np.testing.assert_array_equal(
+        PriceRegressionModel.load(legacy).predict(X), model.predict(X)
+    )
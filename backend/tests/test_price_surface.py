@@ -0,0 +1,112 @@
+"""The price surface is laid out per ZIP and rebuilt only when stale."""
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from price_surface import BASE_HOUSE, GROSS_TO_LIVING, build_surface
+
+COLUMNS = ["ZIPCODE", *BASE_HOUSE]
+ZIPCODES = [2118, 2134, 2215]
+AXES = {"LIVING_AREA": [900, 1800, 2700], "FULL_BTH": [1, 2]}
+
+
+class CountingModel:
+    """A linear stand-in for the price model that counts its calls."""
+
+    def __init__(self, scale=1.0):
+        self.scale = scale
+        self.calls = 0
+
+    def __call__(self, frame):
+        self.calls += 1
+        weights = np.arange(1, len(COLUMNS) + 1) * 10.0 * self.scale
+        return frame[COLUMNS].to_numpy(dtype=float) @ weights
+
+
+def build(surface_dir, model, version, **kwargs):
+    kwargs.setdefault("zipcodes", ZIPCODES)
+    kwargs.setdefault("axes", AXES)
+    return build_surface(model, version, COLUMNS, surface_dir, **kwargs)
+
+
+def test_prices_match_one_house_at_a_time(tmp_path):
+    model = CountingModel()
+    surface = build(tmp_path / "surface", model, "v1")
+    assert model.calls == 1
+    assert surface.prices.shape == (3, 3, 2)
+    for (z, zipcode), (i, living), (j, baths) in itertools.product(
+        enumerate(ZIPCODES), enumerate(AXES["LIVING_AREA"]),
+        enumerate(AXES["FULL_BTH"]),
+    ):
+        house = dict(BASE_HOUSE, ZIPCODE=zipcode, LIVING_AREA=living,
+                     FULL_BTH=baths)
+        house["GROSS_AREA"] = round(living * GROSS_TO_LIVING)
+        price = model(pd.DataFrame([house]))[0]
+        assert surface.prices[z, i, j] == round(price)
+
+
+def test_rebuilds_only_when_model_or_grid_changes(tmp_path):
+    surface_dir = tmp_path / "surface"
+    model = CountingModel()
+    first = build(surface_dir, model, "v1")
+    again = build(surface_dir, model, "v1")
+    assert model.calls == 1
+    assert again.etag == first.etag
+    np.testing.assert_array_equal(again.prices, first.prices)
+
+    retrained = CountingModel(scale=2.0)
+    second = build(surface_dir, retrained, "v2")
+    assert retrained.calls == 1
+    assert second.etag != first.etag
+    np.testing.assert_array_equal(second.prices, first.prices * 2)
+
+    wider = build(surface_dir, retrained, "v2", axes={"BED_RMS": [1, 2, 3]})
+    assert retrained.calls == 2
+    assert wider.etag != second.etag
+    build(surface_dir, retrained, "v2", axes={"BED_RMS": [1, 2, 3]})
+    assert retrained.calls == 2
+    build(surface_dir, retrained, "v2", axes={"BED_RMS": [1, 2, 3]},
+          force=True)
+    assert retrained.calls == 3
+
+
+@pytest.fixture()
+def client(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    import main
+
+    surface = build(tmp_path / "surface", CountingModel(), "v1")
+    monkeypatch.setattr(main, "price_surface", (surface, surface.to_json()))
+    return TestClient(main.app), surface
+
+
+def test_conditional_get_uses_the_etag(client):
+    client, surface = client
+    response = client.get("/price_surface")
+    assert response.status_code == 200
+    assert response.headers["etag"] == surface.etag
+    assert response.json()["prices"] == surface.prices.tolist()
+
+    for match in (surface.etag, f'"stale", {surface.etag}', "*"):
+        response = client.get(
+            "/price_surface", headers={"If-None-Match": match}
+        )
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == surface.etag
+    response = client.get(
+        "/price_surface", headers={"If-None-Match": '"stale"'}
+    )
+    assert response.status_code == 200
+
+
+def test_surface_not_ready_is_503(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    import main
+
+    monkeypatch.setattr(main, "price_surface", None)
+    assert TestClient(main.app).get("/price_surface").status_code == 503
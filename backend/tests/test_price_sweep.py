@@ -0,0 +1,89 @@
+"""A sweep predicts what /predict_price does for each of its points."""
+import itertools
+
+import numpy as np
+import pytest
+
+from model_registry import ArtifactBundle
+from prediction_cache import PredictionCache
+from synthetic import price_requests, write_serving_artifacts
+
+BASE = price_requests(1, seed=5)[0]
+LIVING = {"feature": "LIVING_AREA", "start": 800, "stop": 2400, "num": 5}
+BEDS = {"feature": "BED_RMS", "values": [1, 2, 2.4, 3]}
+
+
+@pytest.fixture(scope="module")
+def main(tmp_path_factory):
+    model_dir = write_serving_artifacts(
+        tmp_path_factory.mktemp("sweep") / "model", n_rows=500,
+        n_estimators=3,
+    )
+    import main
+
+    main._activate(
+        main._load_bundle(ArtifactBundle.from_directory(model_dir))
+    )
+    return main
+
+
+@pytest.fixture()
+def client(main, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    monkeypatch.setattr(main, "batcher", None)
+    monkeypatch.setattr(main, "prediction_cache", None)
+    return TestClient(main.app)
+
+
+def sweep(client, *vary):
+    response = client.post(
+        "/predict_price/sweep", json={"base": BASE, "vary": list(vary)}
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_grid_matches_single_predictions(client):
+    result = sweep(client, LIVING, BEDS)
+    assert result["features"] == ["LIVING_AREA", "BED_RMS"]
+    assert result["values"] == [[800, 1200, 1600, 2000, 2400], [1, 2, 3]]
+    expected = np.empty((5, 3))
+    for (i, living), (j, beds) in itertools.product(
+        enumerate(result["values"][0]), enumerate(result["values"][1])
+    ):
+        house = dict(BASE, LIVING_AREA=living, BED_RMS=beds)
+        response = client.post("/predict_price", json=house)
+        expected[i, j] = response.json()["predicted_price"]
+    np.testing.assert_allclose(result["predictions"], expected, rtol=1e-9)
+
+
+def test_cache_reuses_points_from_earlier_requests(client, main, monkeypatch):
+    monkeypatch.setattr(main, "prediction_cache", PredictionCache(1000))
+    fresh = sweep(client, LIVING)
+    assert fresh["cached_points"] == 0
+    assert sweep(client, LIVING) == dict(fresh, cached_points=5)
+
+    # Nine points over the same range include the five already scored.
+    finer = sweep(client, dict(LIVING, num=9))
+    assert finer["cached_points"] == 5
+    np.testing.assert_allclose(
+        finer["predictions"][::2], fresh["predictions"], rtol=1e-9
+    )
+
+    # A single prediction is a cached point for a later sweep too.
+    house = dict(BASE, LIVING_AREA=1000.0, BED_RMS=BASE["BED_RMS"] + 1)
+    client.post("/predict_price", json=house)
+    beds = {"feature": "BED_RMS", "values": [house["BED_RMS"]]}
+    assert sweep(client, dict(LIVING, num=9), beds)["cached_points"] == 1
+
+@pytest.mark.parametrize("vary", [
+    [{"feature": "ZIPCODE", "values": [2118]}],
+    [LIVING, LIVING],
+    [],
+])
+def test_rejects_invalid_axes(client, vary):
+    response = client.post(
+        "/predict_price/sweep", json={"base": BASE, "vary": vary}
+    )
+    assert response.status_code == 422
@@ -0,0 +1,100 @@
+"""Ridge CV from sufficient statistics matches refitting every pipeline."""
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.metrics import mean_squared_error
+from sklearn.model_selection import KFold
+
+from ridge_cv import FOLDS_FILE, make_regressor, run_ridge_cv
+from ridge_cv_parallel import run_parallel_ridge_cv
+
+ALPHAS = (0.01, 1.0, 30.0, 1000.0)
+DEGREES = (1, 2)
+N_SPLITS = 4
+SEED = 7
+
+
+@pytest.fixture(scope="module")
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(240, 3)) * [1.0, 10.0, 0.1]
+    y = (
+        3 * X[:, 0] - 0.2 * X[:, 1] + 40 * X[:, 2] ** 2
+        + rng.normal(scale=2.0, size=len(X))
+    )
+    return X, y
+
+
+@pytest.fixture(scope="module")
+def reference(data):
+    """The notebooks' nested CV, one scikit-learn fit per outer fold."""
+    X, y = data
+    rows = []
+    for degree in DEGREES:
+        splits = KFold(N_SPLITS, shuffle=True, random_state=SEED).split(X)
+        for fold, (train, val) in enumerate(splits, start=1):
+            regressor = make_regressor(degree, ALPHAS).fit(X[train], y[train])
+            rows.append({
+                "degree": degree,
+                "fold": fold,
+                "train_mse": mean_squared_error(
+                    y[train], regressor.predict(X[train])
+                ),
+                "val_mse": mean_squared_error(
+                    y[val], regressor.predict(X[val])
+                ),
+                "alpha": regressor.regressor_.named_steps["model"].alpha_,
+                "train_size": len(train),
+                "val_size": len(val),
+            })
+    return pd.DataFrame(rows)
+
+
+def test_folds_match_refitting_every_pipeline(data, reference):
+    X, y = data
+    report = run_ridge_cv(
+        X, y, DEGREES, N_SPLITS, SEED, ALPHAS, chunk_rows=37, verbose=False
+    )
+    folds = report.folds[list(reference.columns)]
+    pd.testing.assert_frame_equal(
+        folds, reference, check_dtype=False, rtol=1e-7
+    )
+    assert reference["alpha"].nunique() > 1
+
+
+def test_full_data_alpha_matches_ridge_cv(data):
+    X, y = data
+    report = run_ridge_cv(
+        X, y, DEGREES, N_SPLITS, SEED, ALPHAS, verbose=False
+    )
+    for degree in DEGREES:
+        regressor = make_regressor(degree, ALPHAS).fit(X, y)
+        expected = regressor.regressor_.named_steps["model"].alpha_
+        assert report.full_data_alphas[degree] == expected
+    means = report.summary.set_index("degree")["val_mse_mean"]
+    assert report.best_degree == int(means.idxmin())
+
+
+def test_parallel_runner_matches_refitting_every_pipeline(
+    data, reference, tmp_path
+):
+    X, y = data
+    folds_path = tmp_path / FOLDS_FILE
+    report = run_parallel_ridge_cv(
+        X, y, DEGREES, N_SPLITS, SEED, ALPHAS,
+        n_workers=2, chunk_rows=37, folds_path=folds_path, verbose=False,
+    )
+    folds = report.folds[list(reference.columns)]
+    pd.testing.assert_frame_equal(
+        folds, reference, check_dtype=False, rtol=1e-7
+    )
+    serial = run_ridge_cv(X, y, DEGREES, N_SPLITS, SEED, ALPHAS, verbose=False)
+    assert report.full_data_alphas == serial.full_data_alphas
+    # Rows were streamed to the CSV as tasks finished, in any order.
+    streamed = pd.read_csv(folds_path).sort_values(["degree", "fold"])
+    pd.testing.assert_frame_equal(
+        streamed.reset_index(drop=True)[list(reference.columns)],
+        reference,
+        check_dtype=False,
+        rtol=1e-7,
+    )
@@ -0,0 +1,90 @@
+"""ZipIndex agrees with testing every point against every polygon."""
+import json
+
+import numpy as np
+import pytest
+
+from zip_index import GEOJSON_PATH, NO_ZIP, ZipIndex, _rings
+
+SQUARE = [[0, 0], [4, 0], [4, 4], [0, 4], [0, 0]]
+HOLE = [[1, 1], [1, 3], [3, 3], [3, 1], [1, 1]]
+TRIANGLE = [[5, 0], [9, 0], [7, 3.5], [5, 0]]
+ISLAND = [[1.5, 1.5], [2.5, 1.5], [2, 2.5], [1.5, 1.5]]
+FEATURES = [
+    ("02134", {"type": "Polygon", "coordinates": [SQUARE, HOLE]}),
+    ("02135", {"type": "MultiPolygon",
+               "coordinates": [[TRIANGLE], [ISLAND]]}),
+]
+
+
+def brute_force(collection, zip_property, lon, lat):
+    """Even-odd rule over every ring of every polygon, for every point."""
+    result = np.full(lon.size, NO_ZIP)
+    labels = []
+    for feature in collection["features"]:
+        label = str(feature["properties"][zip_property]).strip()
+        if label not in labels:
+            labels.append(label)
+        for rings in _rings(feature["geometry"]):
+            crossings = np.zeros(lon.size, dtype=np.int64)
+            for ring in rings:
+                (x1, y1), (x2, y2) = ring.T, np.roll(ring, -1, axis=0).T
+                keep = y1 != y2
+                x1, y1, x2, y2 = x1[keep], y1[keep], x2[keep], y2[keep]
+                py, px = lat[:, None], lon[:, None]
+                cross_x = x1 + (py - y1) * (x2 - x1) / (y2 - y1)
+                crossings += (((y1 > py) != (y2 > py)) & (px < cross_x)).sum(
+                    axis=1
+                )
+            result[crossings % 2 == 1] = labels.index(label)
+    return result
+
+
+@pytest.fixture(scope="module")
+def synthetic(tmp_path_factory):
+    collection = {"type": "FeatureCollection", "features": [
+        {"type": "Feature", "properties": {"ZIP5": label},
+         "geometry": geometry}
+        for label, geometry in FEATURES
+    ]}
+    path = tmp_path_factory.mktemp("zips") / "zips.geojson"
+    path.write_text(json.dumps(collection), encoding="utf-8")
+    return path, collection
+
+
+@pytest.mark.parametrize("grid_size", [1, 3, 16, 256])
+def test_synthetic_polygons_match_brute_force(synthetic, grid_size):
+    path, collection = synthetic
+    index = ZipIndex.from_geojson(path, grid_size=grid_size)
+    rng = np.random.default_rng(grid_size)
+    lon = rng.uniform(-1, 10, 5000)
+    lat = rng.uniform(-1, 5, 5000)
+    expected = brute_force(collection, "ZIP5", lon, lat)
+    np.testing.assert_array_equal(index.locate(lon, lat, 777), expected)
+    # Inside the hole, the island in it, the triangle, and outside.
+    codes = index.zipcodes_for([0.5, 1.2, 2, 7, 4.5], [0.5, 1.2, 2, 1, 2])
+    np.testing.assert_array_equal(codes, [2134, NO_ZIP, 2135, 2135, NO_ZIP])
+
+
+def test_missing_coordinates_have_no_zip(synthetic):
+    index = ZipIndex.from_geojson(synthetic[0], grid_size=4)
+    located = index.locate([np.nan, -1.0, np.inf], [2, -1.0, 2])
+    np.testing.assert_array_equal(located, NO_ZIP)
+
+
+@pytest.mark.skipif(
+    not GEOJSON_PATH.exists(), reason="ZIP boundary GeoJSON not present"
+)
+def test_boston_zipcodes_match_brute_force():
+    with GEOJSON_PATH.open(encoding="utf-8") as f:
+        collection = json.load(f)
+    index = ZipIndex.from_geojson(GEOJSON_PATH)
+    x0, y0, x1, y1 = index.bounds
+    rng = np.random.default_rng(0)
+    lon = rng.uniform(x0, x1, 2000)
+    lat = rng.uniform(y0, y1, 2000)
+    expected = brute_force(collection, "ZIP5", lon, lat)
+    assert (expected != NO_ZIP).any()
+    np.testing.assert_array_equal(index.locate(lon, lat), expected)
+    # The crime files use -1 and 0 for unknown locations.
+    np.testing.assert_array_equal(index.locate([-1, 0], [-1, 0]), NO_ZIP)
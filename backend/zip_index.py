@@ -0,0 +1,347 @@
+"""Vectorized ZIP code lookup for Lat/Long points.
+
+``ZipIndex`` loads the ZIP boundary GeoJSON the map uses
+(``frontend/public/boston_zipcodes.geojson``) and lays a uniform grid over
+its bounding box. At build time every grid cell is classified:
+
+- cells no polygon's bounding box touches map straight to "no ZIP";
+- cells no polygon edge passes through, whose centre lies inside a polygon,
+  map straight to that polygon's ZIP;
+- every other cell keeps the short list of polygons whose bounding box
+  overlaps it.
+
+Only points in that last kind of cell are tested, and only against their
+cell's candidate polygons, using the crossing-number rule over the edges
+that overlap the point's grid row. Nothing ever tests every polygon for
+every point, so the whole multi-year crime history resolves in seconds.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+BACKEND_DIR = Path(__file__).resolve().parent
+GEOJSON_PATH = (
+    BACKEND_DIR.parent / "frontend" / "public" / "boston_zipcodes.geojson"
+)
+ZIP_PROPERTY = "ZIP5"
+GRID_SIZE = 256
+CHUNK_SIZE = 250_000
+NO_ZIP = -1
+
+# Cell states below zero; non-negative states are ZIP label indices.
+_EMPTY = -1
+_MIXED = -2
+
+
+def _rings(geometry: Dict[str, Any]) -> List[List[np.ndarray]]:
+    """Polygon parts of a Polygon/MultiPolygon, each a list of rings."""
+    if geometry["type"] == "Polygon":
+        polygons = [geometry["coordinates"]]
+    elif geometry["type"] == "MultiPolygon":
+        polygons = geometry["coordinates"]
+    else:
+        raise ValueError(f"Unsupported geometry type {geometry['type']!r}")
+    return [
+        [np.asarray(ring, dtype=np.float64)[:, :2] for ring in polygon]
+        for polygon in polygons
+    ]
+
+
+def _expand_ranges(
+    starts: np.ndarray, stops: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Owner and value of every element of ``range(start, stop)`` pairs."""
+    lengths = np.maximum(stops - starts, 0)
+    owner = np.repeat(np.arange(lengths.size), lengths)
+    offsets = np.arange(owner.size) - np.repeat(
+        np.cumsum(lengths) - lengths, lengths
+    )
+    return owner, starts[owner] + offsets
+
+
+def _csr(keys: np.ndarray, values: np.ndarray, n_keys: int):
+    order = np.argsort(keys, kind="stable")
+    ptr = np.zeros(n_keys + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=n_keys), out=ptr[1:])
+    return ptr, values[order]
+
+
+class ZipIndex:
+    """Grid index over ZIP polygons; see the module docstring."""
+
+    def __init__(
+        self,
+        zipcodes: Sequence[str],
+        parts: Sequence[Tuple[int, List[np.ndarray]]],
+        grid_size: int = GRID_SIZE,
+    ) -> None:
+        if grid_size < 1:
+            raise ValueError("grid_size must be positive")
+        if not parts:
+            raise ValueError("At least one polygon is required")
+        self.zipcodes: List[str] = list(zipcodes)
+        self.part_zip = np.array([zip_idx for zip_idx, _ in parts])
+        n_parts = len(parts)
+
+        # Edges of every ring, tagged with their polygon part.
+        x1, y1, x2, y2, owner = [], [], [], [], []
+        part_box = np.empty((n_parts, 4))
+        for part, (_, rings) in enumerate(parts):
+            points = np.concatenate(rings)
+            part_box[part] = (*points.min(axis=0), *points.max(axis=0))
+            for ring in rings:
+                start, stop = ring, np.roll(ring, -1, axis=0)
+                x1.append(start[:, 0])
+                y1.append(start[:, 1])
+                x2.append(stop[:, 0])
+                y2.append(stop[:, 1])
+                owner.append(np.full(len(ring), part))
+        x1, y1, x2, y2 = (np.concatenate(a) for a in (x1, y1, x2, y2))
+        owner = np.concatenate(owner)
+
+        x0, y0 = part_box[:, 0].min(), part_box[:, 1].min()
+        span_x = part_box[:, 2].max() - x0
+        span_y = part_box[:, 3].max() - y0
+        self.bounds = (x0, y0, x0 + span_x, y0 + span_y)
+        self.nx = self.ny = int(grid_size)
+        self.dx = span_x / self.nx or 1.0
+        self.dy = span_y / self.ny or 1.0
+        self.n_parts = n_parts
+
+        # A cell no edge's bounding box touches lies wholly inside or
+        # outside each polygon, so its centre decides for all its points.
+        diff = np.zeros((self.ny + 1, self.nx + 1), dtype=np.int64)
+        ec0 = self._col(np.minimum(x1, x2))
+        ec1 = self._col(np.maximum(x1, x2)) + 1
+        row_lo = self._row(np.minimum(y1, y2))
+        row_hi = self._row(np.maximum(y1, y2))
+        np.add.at(diff, (row_lo, ec0), 1)
+        np.add.at(diff, (row_lo, ec1), -1)
+        np.add.at(diff, (row_hi + 1, ec0), -1)
+        np.add.at(diff, (row_hi + 1, ec1), 1)
+        crossed = diff.cumsum(axis=0).cumsum(axis=1)[: self.ny, : self.nx]
+
+        # Edges per (grid row, part): everything a ray from a point in that
+        # row can cross. Horizontal edges never cross a horizontal ray.
+        keep = y1 != y2
+        x1, y1, x2, y2, owner = (a[keep] for a in (x1, y1, x2, y2, owner))
+        row_lo, row_hi = row_lo[keep], row_hi[keep]
+        edge, row = _expand_ranges(row_lo, row_hi + 1)
+        band_key = row * n_parts + owner[edge]
+        self._band_ptr, band_edges = _csr(
+            band_key, edge, self.ny * n_parts
+        )
+        self._edges = np.stack(
+            [x1[band_edges], y1[band_edges], x2[band_edges], y2[band_edges]]
+        )
+
+        # Candidate parts per cell from the part bounding boxes.
+        c0, c1 = self._col(part_box[:, 0]), self._col(part_box[:, 2])
+        r0, r1 = self._row(part_box[:, 1]), self._row(part_box[:, 3])
+        cell_keys, cell_parts = [], []
+        for part in range(n_parts):
+            rows, cols = np.mgrid[r0[part]:r1[part] + 1, c0[part]:c1[part] + 1]
+            cell_keys.append((rows * self.nx + cols).ravel())
+            cell_parts.append(np.full(rows.size, part))
+        self._cell_ptr, self._cell_parts = _csr(
+            np.concatenate(cell_keys),
+            np.concatenate(cell_parts),
+            self.nx * self.ny,
+        )
+
+        n_candidates = np.diff(self._cell_ptr)
+        state = np.full(self.nx * self.ny, _MIXED, dtype=np.int64)
+        state[n_candidates == 0] = _EMPTY
+        clear = np.flatnonzero((crossed.ravel() == 0) & (n_candidates > 0))
+        centre_x = x0 + (clear % self.nx + 0.5) * self.dx
+        centre_y = y0 + (clear // self.nx + 0.5) * self.dy
+        state[clear] = self._test(centre_x, centre_y, clear)
+        self._cell_state = state
+
+    @classmethod
+    def from_geojson(
+        cls,
+        path: Union[str, Path] = GEOJSON_PATH,
+        zip_property: str = ZIP_PROPERTY,
+        grid_size: int = GRID_SIZE,
+    ) -> "ZipIndex":
+        with Path(path).open(encoding="utf-8") as f:
+            collection = json.load(f)
+        zipcodes: List[str] = []
+        lookup: Dict[str, int] = {}
+        parts: List[Tuple[int, List[np.ndarray]]] = []
+        for feature in collection["features"]:
+            label = str(feature["properties"][zip_property]).strip()
+            if label not in lookup:
+                lookup[label] = len(zipcodes)
+                zipcodes.append(label)
+            for rings in _rings(feature["geometry"]):
+                parts.append((lookup[label], rings))
+        return cls(zipcodes, parts, grid_size=grid_size)
+
+    def _col(self, x: np.ndarray) -> np.ndarray:
+        col = np.floor((x - self.bounds[0]) / self.dx).astype(np.int64)
+        return np.clip(col, 0, self.nx - 1)
+
+    def _row(self, y: np.ndarray) -> np.ndarray:
+        row = np.floor((y - self.bounds[1]) / self.dy).astype(np.int64)
+        return np.clip(row, 0, self.ny - 1)
+
+    def _test(
+        self, x: np.ndarray, y: np.ndarray, cell: np.ndarray
+    ) -> np.ndarray:
+        """ZIP index for points in mixed cells, or ``NO_ZIP``."""
+        result = np.full(x.size, NO_ZIP, dtype=np.int64)
+        if not x.size:
+            return result
+        point, slot = _expand_ranges(
+            self._cell_ptr[cell], self._cell_ptr[cell + 1]
+        )
+        part = self._cell_parts[slot]
+        band = (cell[point] // self.nx) * self.n_parts + part
+        pair, edge = _expand_ranges(
+            self._band_ptr[band], self._band_ptr[band + 1]
+        )
+        ex1, ey1, ex2, ey2 = self._edges[:, edge]
+        px, py = x[point[pair]], y[point[pair]]
+        straddles = (ey1 > py) != (ey2 > py)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cross_x = ex1 + (py - ey1) * (ex2 - ex1) / (ey2 - ey1)
+        crossings = np.bincount(
+            pair, weights=straddles & (px < cross_x), minlength=point.size
+        )
+        inside = crossings.astype(np.int64) % 2 == 1
+        # ZIP polygons do not overlap; if rounding makes two claim a point,
+        # the later one in the file wins, which is as good as either.
+        result[point[inside]] = self.part_zip[part[inside]]
+        return result
+
+    def locate(
+        self, lon: Any, lat: Any, chunk_size: int = CHUNK_SIZE
+    ) -> np.ndarray:
+        """Index into ``zipcodes`` for each point, ``NO_ZIP`` outside.
+
+        Missing or non-finite coordinates (the crime files use ``-1`` and
+        ``0`` for unknown locations) come back as ``NO_ZIP``.
+        """
+        lon = np.asarray(lon, dtype=np.float64).ravel()
+        lat = np.asarray(lat, dtype=np.float64).ravel()
+        if lon.shape != lat.shape:
+            raise ValueError("lon and lat must have the same length")
+        result = np.full(lon.size, NO_ZIP, dtype=np.int64)
+        x0, y0, x1, y1 = self.bounds
+        for start in range(0, lon.size, chunk_size):
+            x = lon[start:start + chunk_size]
+            y = lat[start:start + chunk_size]
+            within = np.flatnonzero((x >= x0) & (x <= x1) & (y >= y0) & (y <= y1))
+            if not within.size:
+                continue
+            x, y = x[within], y[within]
+            cell = self._row(y) * self.nx + self._col(x)
+            state = self._cell_state[cell]
+            out = np.where(state >= 0, state, NO_ZIP)
+            mixed = np.flatnonzero(state == _MIXED)
+            out[mixed] = self._test(x[mixed], y[mixed], cell[mixed])
+            result[start + within] = out
+        return result
+
+    def zipcodes_for(
+        self, lon: Any, lat: Any, chunk_size: int = CHUNK_SIZE
+    ) -> np.ndarray:
+        """Integer ZIPCODE (as in the price data, e.g. 2134) or ``NO_ZIP``."""
+        codes = np.array([int(label) for label in self.zipcodes] + [NO_ZIP])
+        return codes[self.locate(lon, lat, chunk_size)]
+
+    def stats(self) -> Dict[str, Any]:
+        state = self._cell_state
+        return {
+            "zipcodes": len(self.zipcodes),
+            "polygons": self.n_parts,
+            "grid": [self.ny, self.nx],
+            "empty_cells": int((state == _EMPTY).sum()),
+            "resolved_cells": int((state >= 0).sum()),
+            "mixed_cells": int((state == _MIXED).sum()),
+            "band_edges": int(self._edges.shape[1]),
+        }
+
+
+def count_incidents(
+    index: ZipIndex,
+    csv_paths: Sequence[Union[str, Path]],
+    chunk_size: int = CHUNK_SIZE,
+) -> Any:
+    """Incident counts per ZIPCODE and year over the crime CSVs.
+
+    Rows whose coordinates fall outside every ZIP polygon are counted
+    under ZIPCODE ``NO_ZIP``.
+    """
+    parts = []
+    for csv_path in csv_paths:
+        for frame in pd.read_csv(
+            csv_path,
+            usecols=["Lat", "Long", "YEAR"],
+            chunksize=chunk_size,
+        ):
+            zipcode = index.zipcodes_for(
+                pd.to_numeric(frame["Long"], errors="coerce"),
+                pd.to_numeric(frame["Lat"], errors="coerce"),
+                chunk_size,
+            )
+            parts.append(
+                pd.DataFrame({"ZIPCODE": zipcode, "YEAR": frame["YEAR"]})
+                .value_counts()
+                .rename("incidents")
+            )
+    if not parts:
+        return pd.DataFrame(columns=["ZIPCODE", "YEAR", "incidents"])
+    counts = pd.concat(parts).groupby(level=["ZIPCODE", "YEAR"]).sum()
+    return counts.reset_index().sort_values(["ZIPCODE", "YEAR"])
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    import argparse
+
+    from crime_cube import SOURCE_DIR, SOURCE_GLOB
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--geojson", type=Path, default=GEOJSON_PATH)
+    parser.add_argument("--source-dir", type=Path, default=SOURCE_DIR)
+    parser.add_argument("--pattern", default=SOURCE_GLOB)
+    parser.add_argument("--grid-size", type=int, default=GRID_SIZE)
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=BACKEND_DIR / "artifacts" / "crime_zip_counts.csv",
+        help="CSV of incident counts per ZIPCODE and YEAR",
+    )
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    index = ZipIndex.from_geojson(args.geojson, grid_size=args.grid_size)
+    print(f"Index built in {time.perf_counter() - started:.2f}s: {index.stats()}")
+
+    started = time.perf_counter()
+    counts = count_incidents(
+        index, sorted(args.source_dir.glob(args.pattern))
+    )
+    elapsed = time.perf_counter() - started
+    total = int(counts["incidents"].sum())
+    located = int(counts.loc[counts["ZIPCODE"] != NO_ZIP, "incidents"].sum())
+    print(
+        f"Assigned {total} incidents in {elapsed:.2f}s "
+        f"({located} inside a ZIP polygon)"
+    )
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    counts.to_csv(args.output, index=False)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()